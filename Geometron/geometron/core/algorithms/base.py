@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+from ..geometry.primitives import GeometryCollection
 
-# Placeholder for geometry data
-class GeometryData:
-    pass
+# Algorithms return their output as a GeometryCollection
+GeometryData = GeometryCollection
+
+# Level-of-detail hints passed when requesting geometry
+LOD_PREVIEW = "preview" # Fast, reduced resolution for interactive editing
+LOD_FULL = "full" # Full resolution for final display and export
 
 class AlgorithmParameter:
     def __init__(self, name: str, param_type: str, default: Any, description: str = "", **kwargs):
@@ -11,7 +15,7 @@ class AlgorithmParameter:
         self.type = param_type # e.g., 'int', 'float', 'bool', 'string', 'color'
         self.default = default
         self.description = description
-        self.options = kwargs # e.g., min, max, step, items (for combo)
+        self.options = kwargs # e.g., min, max, step, items (for combo), lod (see AlgorithmBase.get_lod_limits)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -36,13 +40,73 @@ class AlgorithmBase(ABC):
         """Return a brief description of what the algorithm does."""
         return ""
 
+    @classmethod
+    def get_version(cls) -> str:
+        """Return the algorithm version.
+
+        Bump this whenever the output for a given parameter set changes so
+        that cached geometry from older versions is not reused.
+        """
+        return "1"
+
     @classmethod
     @abstractmethod
     def get_parameters(cls) -> List[AlgorithmParameter]:
         """Return a list defining the parameters this algorithm accepts."""
         pass
 
+    @classmethod
+    def get_lod_limits(cls) -> Dict[str, Dict[str, Any]]:
+        """Return {lod: {parameter_name: max_value}} for resolution-type parameters.
+
+        By default this is built from parameters declared with a ``lod``
+        option, e.g. ``AlgorithmParameter("segments", "int", 32, lod={LOD_PREVIEW: 24})``.
+        """
+        limits: Dict[str, Dict[str, Any]] = {}
+        for param_def in cls.get_parameters():
+            for lod, limit in param_def.options.get("lod", {}).items():
+                limits.setdefault(lod, {})[param_def.name] = limit
+        return limits
+
+    @classmethod
+    def parameters_for_lod(cls, parameters: Dict[str, Any], lod: str = LOD_FULL) -> Dict[str, Any]:
+        """Return the parameters to generate with at the given level of detail.
+
+        Resolution-type parameters are capped at their limit for ``lod``;
+        other parameters pass through. Returns ``parameters`` itself when
+        nothing changes, so full resolution never copies.
+        """
+        limits = cls.get_lod_limits().get(lod)
+        if not limits:
+            return parameters
+        resolved = parameters
+        for name, limit in limits.items():
+            value = parameters.get(name)
+            if value is not None and value > limit:
+                if resolved is parameters:
+                    resolved = dict(parameters)
+                resolved[name] = limit
+        return resolved
+
     @abstractmethod
     def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
         """Generate the geometric output based on the given parameters."""
-        pass 
\ No newline at end of file
+        pass
+
+    def generate_chunks(self, parameters: Dict[str, Any]) -> Iterator[GeometryData]:
+        """Yield the geometric output in chunks as it is produced.
+
+        Streaming algorithms override this to yield e.g. one duplicate ring
+        or one iteration at a time, and implement ``generate_geometry`` as
+        ``GeometryData.merge(self.generate_chunks(parameters))``. The canvas
+        draws chunks as they arrive and exporters write them without holding
+        the whole layer in memory. The default yields the full result once.
+        """
+        geometry = self.generate_geometry(parameters)
+        if geometry is not None:
+            yield geometry
+
+    @classmethod
+    def supports_streaming(cls) -> bool:
+        """Return True if the algorithm overrides ``generate_chunks``."""
+        return cls.generate_chunks is not AlgorithmBase.generate_chunks 
\ No newline at end of file
@@ -1,5 +1,7 @@
-from .base import AlgorithmBase, AlgorithmParameter, GeometryData
+from .base import AlgorithmBase, AlgorithmParameter, GeometryData, LOD_PREVIEW
+from ..geometry.primitives import PathArray
 from typing import List, Dict, Any
+import numpy as np
 
 class DummyCircleAlgo(AlgorithmBase):
     """A simple placeholder algorithm for generating circles."""
@@ -16,14 +18,25 @@ class DummyCircleAlgo(AlgorithmBase):
     def get_parameters(cls) -> List[AlgorithmParameter]:
         return [
             AlgorithmParameter("radius", "float", 50.0, "Radius of the circle", min=1.0, max=500.0, step=1.0),
-            AlgorithmParameter("segments", "int", 32, "Number of segments", min=3, max=100),
+            AlgorithmParameter("segments", "int", 32, "Number of segments", min=3, max=100, lod={LOD_PREVIEW: 24}),
             AlgorithmParameter("dashed", "bool", False, "Use dashed line")
         ]
 
     def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
-        print(f"Generating circle with parameters: {parameters}")
-        # In a real implementation, this would create and return geometry data
-        return None # Placeholder
+        radius = parameters.get("radius", 50.0)
+        segments = int(parameters.get("segments", 32))
+        angles = np.linspace(0.0, 2 * np.pi, segments + 1)
+        ring = radius * np.column_stack([np.cos(angles), np.sin(angles)])
+        
+        geometry = GeometryData()
+        if parameters.get("dashed", False):
+            # Every other segment becomes its own two-point path
+            starts, ends = ring[0:segments:2], ring[1:segments + 1:2]
+            dashes = np.stack([starts, ends], axis=1).reshape(-1, 2)
+            geometry.add(PathArray(dashes, np.arange(0, len(dashes) + 1, 2)))
+        else:
+            geometry.add(PathArray(ring[:-1], closed=True))
+        return geometry
 
 class DummySquareAlgo(AlgorithmBase):
     """A simple placeholder algorithm for generating squares."""
@@ -44,6 +57,10 @@ class DummySquareAlgo(AlgorithmBase):
         ]
 
     def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
-        print(f"Generating square with parameters: {parameters}")
-        # In a real implementation, this would create and return geometry data
-        return None # Placeholder 
\ No newline at end of file
+        size = parameters.get("size", 100.0)
+        corners = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]) * size
+        if parameters.get("centered", True):
+            corners -= size / 2
+        geometry = GeometryData()
+        geometry.add(PathArray(corners, closed=True))
+        return geometry 
\ No newline at end of file
@@ -0,0 +1,228 @@
+from .base import AlgorithmBase, AlgorithmParameter, GeometryData, LOD_PREVIEW
+from ..geometry.cache import GeometryCache
+from ..geometry.primitives import PathArray
+from typing import List, Dict, Any, Iterator, Tuple
+import numpy as np
+
+MAX_BATCH_VERTICES = 1 << 22  # Trajectory vertices held per particle batch (and per yielded chunk)
+MAX_LATTICE_CELLS = 1 << 20  # Coarser spacing is used beyond this (4 MB of float32)
+
+# Lattices are reused across generations with the same seed and noise settings
+_lattice_cache = GeometryCache(max_bytes=64 * 1024 * 1024)
+
+_GRADIENTS = np.array([[1, 1], [-1, 1], [1, -1], [-1, -1], [1, 0], [-1, 0], [0, 1], [0, -1]], dtype=float)
+
+
+def perlin_noise(x: np.ndarray, y: np.ndarray, perm: np.ndarray) -> np.ndarray:
+    """2D gradient (Perlin) noise in about [-1, 1]; ``x`` and ``y`` broadcast against each other.
+
+    Args:
+        x: Sample x coordinates in lattice units
+        y: Sample y coordinates in lattice units
+        perm: Doubled 256-entry permutation table (512 entries)
+    """
+    x0, y0 = np.floor(x), np.floor(y)
+    fx, fy = x - x0, y - y0
+    xi, yi = x0.astype(np.int64) & 255, y0.astype(np.int64) & 255
+    u = fx * fx * fx * (fx * (fx * 6 - 15) + 10)
+    v = fy * fy * fy * (fy * (fy * 6 - 15) + 10)
+
+    def corner(dx: int, dy: int) -> np.ndarray:
+        gradient = _GRADIENTS[perm[perm[xi + dx] + yi + dy] & 7]
+        return gradient[..., 0] * (fx - dx) + gradient[..., 1] * (fy - dy)
+
+    top = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+    bottom = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+    return top + v * (bottom - top)
+
+
+def lattice_spacing(width: float, height: float, spacing: float) -> float:
+    """``spacing``, raised where needed so a lattice over the canvas stays within ``MAX_LATTICE_CELLS``."""
+    # Columns and rows are at most size / spacing + 3; solve (w t + 3)(h t + 3) = MAX for t = 1 / spacing
+    area, perimeter = width * height, 3.0 * (width + height)
+    t = (-perimeter + np.sqrt(perimeter * perimeter - 4.0 * area * (9.0 - MAX_LATTICE_CELLS))) / (2.0 * area)
+    return max(spacing, 1.0 / t)
+
+
+def noise_lattice(seed: int, scale: float, octaves: int, falloff: float,
+                  columns: int, rows: int, spacing: float) -> np.ndarray:
+    """Fractal noise in [0, 1] sampled every ``spacing`` canvas units from the origin.
+
+    Octaves double the frequency and scale the amplitude by ``falloff``, like
+    Processing's ``noise()``. Results are float32, read-only and kept in a
+    byte-bounded LRU, so every generation with the same seed and scale
+    reuses the same lattice.
+
+    Returns:
+        (rows, columns) array; entry [r, c] is the noise at (c * spacing, r * spacing)
+    """
+    key = GeometryCache.make_key("noise_lattice", "1", [seed, scale, octaves, falloff, columns, rows, spacing])
+    field = _lattice_cache.get(key)
+    if field is None:
+        field = _build_lattice(seed, scale, octaves, falloff, columns, rows, spacing)
+        _lattice_cache.put(key, field)
+    return field
+
+
+def _build_lattice(seed: int, scale: float, octaves: int, falloff: float,
+                   columns: int, rows: int, spacing: float) -> np.ndarray:
+    perm = np.random.default_rng(seed).permutation(256)
+    perm = np.concatenate([perm, perm])
+    x = (np.arange(columns) * (spacing * scale))[None, :]
+    y = (np.arange(rows) * (spacing * scale))[:, None]
+    total = np.zeros((rows, columns))
+    amplitude, frequency = 1.0, 1.0
+    for octave in range(max(1, octaves)):
+        # Offset each octave so the lattice zeros of the octaves do not line up
+        shift = 0.5 * octave
+        total += amplitude * perlin_noise(x * frequency + shift, y * frequency + shift, perm)
+        amplitude *= falloff
+        frequency *= 2.0
+    norm = (1.0 - falloff ** max(1, octaves)) / (1.0 - falloff) if falloff != 1.0 else max(1, octaves)
+    field = (0.5 + 0.5 * np.clip(total / norm, -1.0, 1.0)).astype(np.float32)
+    field.flags.writeable = False
+    return field
+
+
+def sample_bilinear(field: np.ndarray, positions: np.ndarray, spacing: float) -> np.ndarray:
+    """Bilinearly interpolate a lattice from ``noise_lattice`` at (N, 2) canvas positions.
+
+    Positions must be non-negative and at least one lattice cell inside the
+    lattice's far edges.
+    """
+    gx, gy = positions[:, 0] / spacing, positions[:, 1] / spacing
+    c, r = gx.astype(np.int64), gy.astype(np.int64)  # Truncation is floor for non-negative positions
+    fx, fy = gx - c, gy - r
+    top = field[r, c] + fx * (field[r, c + 1] - field[r, c])
+    bottom = field[r + 1, c] + fx * (field[r + 1, c + 1] - field[r + 1, c])
+    return top + fy * (bottom - top)
+
+
+class FlowFieldAlgo(AlgorithmBase):
+    """Particles traced through a Perlin noise flow field (port of PerlinNoiseFlow.pde).
+
+    The noise is evaluated once on a lattice (cached per seed and scale,
+    and coarsened for very large fields) and bilinearly sampled. All particles of a batch advance together as
+    one (N, 2) array per step; particles that leave the canvas (without
+    wrapping) drop out of the active index set. Batches are sized to a
+    fixed vertex budget and yielded as separate chunks.
+
+    Unlike the sketch, which discards a particle's path whenever it wraps
+    around an edge, wrapping splits the path and keeps every piece.
+    """
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "Perlin Flow Field"
+
+    @classmethod
+    def get_version(cls) -> str:
+        return "2"  # float32 lattice, capped lattice size
+
+    @classmethod
+    def get_description(cls) -> str:
+        return "Traces particles through a flow field whose direction follows Perlin noise."
+
+    @classmethod
+    def get_parameters(cls) -> List[AlgorithmParameter]:
+        return [
+            AlgorithmParameter("width", "float", 1200.0, "Width of the field", min=1.0, max=10000.0),
+            AlgorithmParameter("height", "float", 800.0, "Height of the field", min=1.0, max=10000.0),
+            AlgorithmParameter("seed", "int", 0, "Noise and particle seed", min=0, max=2 ** 31 - 1),
+            AlgorithmParameter("noise_scale", "float", 0.02, "Noise detail (lower = smoother)",
+                               min=0.0001, max=1.0, step=0.001),
+            AlgorithmParameter("octaves", "int", 4, "Noise octaves", min=1, max=8),
+            AlgorithmParameter("falloff", "float", 0.5, "Amplitude falloff per octave", min=0.0, max=1.0, step=0.05),
+            AlgorithmParameter("field_resolution", "float", 2.0, "Noise lattice spacing (raised for very large fields)", min=0.1, max=100.0,
+                               step=0.5),
+            AlgorithmParameter("particles", "int", 2000, "Number of particles", min=1, max=1000000,
+                               lod={LOD_PREVIEW: 2000}),
+            AlgorithmParameter("steps", "int", 100, "Steps per particle", min=1, max=100000,
+                               lod={LOD_PREVIEW: 1000}),
+            AlgorithmParameter("step_length", "float", 2.0, "Distance moved per step", min=0.01, max=100.0),
+            AlgorithmParameter("flow_strength", "float", 360.0, "Direction range mapped from the noise (degrees)",
+                               min=0.0, max=3600.0, step=15.0),
+            AlgorithmParameter("wrap_edges", "bool", True, "Wrap particles around the edges"),
+        ]
+
+    @staticmethod
+    def trace(positions: np.ndarray, field: np.ndarray, spacing: float, steps: int, step_length: float,
+              strength: float, size: Tuple[float, float], wrap: bool) -> PathArray:
+        """Trace particles from ``positions``; paths are in sketch coordinates (origin top-left, y down).
+
+        Args:
+            positions: (N, 2) start positions
+            field: Noise lattice from ``noise_lattice``
+            spacing: Lattice spacing
+            steps: Steps per particle
+            step_length: Distance moved per step
+            strength: Radians of direction per unit of noise
+            size: Canvas (width, height)
+            wrap: Wrap around the edges instead of stopping there
+        """
+        n = len(positions)
+        trajectory = np.empty((n, steps + 1, 2))  # Particle-major, so a finished batch is already path-ordered
+        trajectory[:, 0] = positions
+        restart = np.zeros((n, steps + 1), dtype=bool)  # Path starts: the first vertex and every wrap
+        restart[:, 0] = True
+        length = np.full(n, steps + 1, dtype=np.int64)
+        bounds = np.asarray(size, dtype=float)
+        active = np.arange(n)
+        current = positions.copy()
+        for step in range(1, steps + 1):
+            angle = sample_bilinear(field, current, spacing)
+            angle *= strength
+            current[:, 0] += step_length * np.cos(angle)
+            current[:, 1] += step_length * np.sin(angle)
+            outside = ((current < 0.0) | (current > bounds)).any(axis=1)
+            if wrap:
+                if outside.any():
+                    current[outside] %= bounds
+                    restart[:, step] = outside
+                trajectory[:, step] = current
+                continue
+            trajectory[active, step] = current
+            if outside.any():
+                # The step leaving the canvas is kept, as in the sketch; then the particle stops
+                length[active[outside]] = step + 1
+                active, current = active[~outside], current[~outside]
+                if not len(active):
+                    break
+
+        if (length == steps + 1).all():
+            coords, starts = trajectory.reshape(-1, 2), np.flatnonzero(restart)
+        else:
+            valid = np.arange(steps + 1)[None, :] < length[:, None]
+            coords, starts = trajectory[valid], np.flatnonzero(restart[valid])
+        paths = PathArray(coords, np.append(starts, len(coords)))
+        drawable = paths.lengths >= 2  # A wrap on the last step leaves a single vertex
+        return paths if drawable.all() else paths.select(drawable)
+
+    def generate_chunks(self, parameters: Dict[str, Any]) -> Iterator[GeometryData]:
+        width, height = parameters.get("width", 1200.0), parameters.get("height", 800.0)
+        seed = int(parameters.get("seed", 0))
+        spacing = lattice_spacing(width, height, float(parameters.get("field_resolution", 2.0)))
+        field = noise_lattice(seed, float(parameters.get("noise_scale", 0.02)), int(parameters.get("octaves", 4)),
+                              float(parameters.get("falloff", 0.5)), int(np.ceil(width / spacing)) + 2,
+                              int(np.ceil(height / spacing)) + 2, float(spacing))
+        steps = max(1, int(parameters.get("steps", 100)))
+        count = max(1, int(parameters.get("particles", 2000)))
+        strength = np.radians(parameters.get("flow_strength", 360.0))
+        wrap = parameters.get("wrap_edges", True)
+
+        rng = np.random.default_rng([seed, 1])  # Independent of the noise permutation stream
+        starts = rng.random((count, 2)) * [width, height]
+        batch = max(1, MAX_BATCH_VERTICES // (steps + 1))
+        for first in range(0, count, batch):
+            paths = self.trace(starts[first:first + batch], field, spacing, steps,
+                               parameters.get("step_length", 2.0), strength, (width, height), wrap)
+            # Sketch coordinates (y down from the top-left) to the canvas, centered with y up
+            paths.coords[:, 0] -= 0.5 * width
+            paths.coords[:, 1] = 0.5 * height - paths.coords[:, 1]
+            geometry = GeometryData()
+            if len(paths):
+                geometry.add(paths)
+            yield geometry
+
+    def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
+        return GeometryData.merge(self.generate_chunks(parameters))
@@ -0,0 +1,122 @@
+from .base import AlgorithmBase, AlgorithmParameter, GeometryData, LOD_PREVIEW
+from ..geometry.primitives import PathArray
+from typing import List, Dict, Any, Tuple
+import numpy as np
+
+MODE_CURVE = "Curve"
+MODE_PERPENDICULAR = "Perpendicular Lines"
+
+class LissajousAlgo(AlgorithmBase):
+    """Lissajous curve with offset-cycle duplicates (port of LissajousCurve.pde).
+
+    The base curve, its wave modulation and its normals are evaluated once
+    for the whole t-array. Every duplicate is the same curve rotated and
+    scaled, so all duplicates come from one broadcast of the base curve
+    against the per-duplicate scale and rotation arrays.
+    """
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "Lissajous Curve"
+
+    @classmethod
+    def get_description(cls) -> str:
+        return ("Lissajous curve x = A sin(a t + delta), y = B sin(b t) with optional wave modulation, "
+                "repeated in shrinking/growing, rotating offset cycles.")
+
+    @classmethod
+    def get_parameters(cls) -> List[AlgorithmParameter]:
+        return [
+            AlgorithmParameter("amplitude_x", "float", 200.0, "Amplitude X (A)", min=0.0, max=5000.0, step=1.0),
+            AlgorithmParameter("amplitude_y", "float", 200.0, "Amplitude Y (B)", min=0.0, max=5000.0, step=1.0),
+            AlgorithmParameter("freq_x", "float", 3.0, "Frequency X (a)", min=0.0, max=100.0, step=1.0),
+            AlgorithmParameter("freq_y", "float", 4.0, "Frequency Y (b)", min=0.0, max=100.0, step=1.0),
+            AlgorithmParameter("phase", "float", 90.0, "Phase shift delta (degrees)", min=-360.0, max=360.0, step=5.0),
+            AlgorithmParameter("t_cycles", "float", 1.0, "Length of t in multiples of 2*pi", min=0.01, max=100.0),
+            AlgorithmParameter("points", "int", 1000, "Points per curve", min=2, max=200000, lod={LOD_PREVIEW: 300}),
+            AlgorithmParameter("scale", "float", 1.0, "Scale of the base curve", min=0.01, max=100.0),
+            AlgorithmParameter("mode", "choice", MODE_CURVE, "Draw the curve or lines perpendicular to it",
+                               items=[MODE_CURVE, MODE_PERPENDICULAR]),
+            AlgorithmParameter("wave_depth", "float", 0.0, "Wave offset along the normal (curve mode)",
+                               min=-500.0, max=500.0, step=1.0),
+            AlgorithmParameter("wave_freq", "float", 5.0, "Wave cycles per 2*pi of t", min=0.0, max=1000.0),
+            AlgorithmParameter("line_density", "int", 500, "Perpendicular lines per curve", min=1, max=100000,
+                               lod={LOD_PREVIEW: 200}),
+            AlgorithmParameter("line_length", "float", 10.0, "Length of perpendicular lines", min=0.0, max=1000.0),
+            AlgorithmParameter("offset_steps", "int", 20, "Duplicates per shrink/grow cycle", min=2, max=1000),
+            AlgorithmParameter("offset_cycles", "int", 1, "Number of offset cycles", min=1, max=100),
+            AlgorithmParameter("initial_offset", "float", 1.1, "Scale of the first step (1.1 = 10% larger)",
+                               min=1.0, max=3.0, step=0.01),
+            AlgorithmParameter("scale_decay", "float", 0.95, "Decay of the step offset per step",
+                               min=0.0, max=2.0, step=0.01),
+            AlgorithmParameter("base_rotation", "float", 0.0, "Rotation of the first curve (degrees)",
+                               min=-360.0, max=360.0, step=5.0),
+            AlgorithmParameter("rotation_step", "float", 5.0, "Rotation between duplicates (degrees)",
+                               min=-360.0, max=360.0, step=1.0),
+        ]
+
+    @staticmethod
+    def duplicate_transforms(parameters: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Scale and rotation (radians) of every duplicate, base curve last."""
+        steps = max(2, int(parameters.get("offset_steps", 20)))
+        cycles = max(1, int(parameters.get("offset_cycles", 1)))
+        scale = parameters.get("scale", 1.0)
+        base_rotation = parameters.get("base_rotation", 0.0)
+        first_offset = max(1e-6, parameters.get("initial_offset", 1.1) - 1.0)
+
+        # Steps shrink towards the middle of a cycle and grow back; every cycle restarts at the base scale
+        step = np.arange(steps)
+        exponent = np.where(step < steps // 2, step, steps - 1 - step)
+        ring_scales = scale * np.cumprod(1.0 + first_offset * parameters.get("scale_decay", 0.95) ** exponent)
+        scales = np.append(np.tile(ring_scales, cycles), scale)
+        rotations = np.append(base_rotation + np.arange(steps * cycles) * parameters.get("rotation_step", 5.0),
+                              base_rotation)
+        keep = scales > 1e-6
+        return scales[keep], np.radians(rotations[keep])
+
+    @staticmethod
+    def _curve(parameters: Dict[str, Any], t: np.ndarray):
+        """Base curve points and unit normals at ``t``; normals are NaN where the tangent vanishes."""
+        A, B = parameters.get("amplitude_x", 200.0), parameters.get("amplitude_y", 200.0)
+        a, b = parameters.get("freq_x", 3.0), parameters.get("freq_y", 4.0)
+        delta = np.radians(parameters.get("phase", 90.0))
+        points = np.column_stack([A * np.sin(a * t + delta), B * np.sin(b * t)])
+        # Normal = tangent (dx/dt, dy/dt) rotated by 90 degrees
+        normals = np.column_stack([-B * b * np.cos(b * t), A * a * np.cos(a * t + delta)])
+        magnitude = np.hypot(normals[:, 0], normals[:, 1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normals /= np.where(magnitude > 1e-6, magnitude, np.nan)[:, None]
+        return points, normals
+
+    def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
+        t_max = 2 * np.pi * parameters.get("t_cycles", 1.0)
+        if parameters.get("mode", MODE_CURVE) == MODE_PERPENDICULAR:
+            count = max(1, int(parameters.get("line_density", 500)))
+            t = np.arange(count) * (t_max / count)
+            centers, normals = self._curve(parameters, t)
+            defined = ~np.isnan(normals[:, 0])
+            half = 0.5 * parameters.get("line_length", 10.0) * normals[defined]
+            centers = centers[defined]
+            base = np.stack([centers + half, centers - half], axis=1).reshape(-1, 2)
+        else:
+            t = np.linspace(0.0, t_max, max(2, int(parameters.get("points", 1000))) + 1)
+            base, normals = self._curve(parameters, t)
+            depth = parameters.get("wave_depth", 0.0)
+            if abs(depth) > 1e-3:
+                offset = depth * np.sin(parameters.get("wave_freq", 5.0) * t)
+                base = base + np.nan_to_num(normals) * offset[:, None]
+
+        # All duplicates at once: (K, 1) scale/rotation arrays against the (P,) base coordinates
+        scales, rotations = self.duplicate_transforms(parameters)
+        cos = (scales * np.cos(rotations))[:, None]
+        sin = (scales * np.sin(rotations))[:, None]
+        x, y = base[:, 0], base[:, 1]
+        coords = np.empty((len(scales), len(base), 2))
+        coords[..., 0] = cos * x - sin * y
+        coords[..., 1] = -(sin * x + cos * y)  # The sketch draws y down; the canvas has y up
+
+        per_path = 2 if parameters.get("mode", MODE_CURVE) == MODE_PERPENDICULAR else len(base)
+        geometry = GeometryData()
+        if coords.size:
+            geometry.add(PathArray(coords.reshape(-1, 2), np.arange(0, coords.shape[0] * len(base) + 1, per_path)))
+        return geometry
@@ -0,0 +1,320 @@
+from .base import AlgorithmBase, AlgorithmParameter, GeometryData, LOD_PREVIEW
+from ..geometry.primitives import PathArray
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple
+import math
+import re
+import numpy as np
+
+CACHE_DRAWS = 4096  # Subtrees drawing at most this many segments are cached as vertex arrays
+CHUNK_VERTICES = 1 << 18  # Vertices per yielded chunk
+
+DRAW_SYMBOLS = "FG"  # Move forward drawing
+MOVE_SYMBOLS = "f"  # Move forward without drawing
+
+PRESET_CUSTOM = "Custom"
+PRESETS = {  # name -> (axiom, rules, angle); the sketch's presets
+    "Quadratic Koch": ("F", "F=F+F-F-F+F", 90.0),
+    "Koch Curve": ("F", "F=F-F++F-F", 60.0),
+    "Sierpinski Triangle": ("F-G-G", "F=F-G+F+G-F; G=GG", 120.0),
+    "Dragon Curve": ("FX", "X=X+YF+; Y=-FX-Y", 90.0),
+}
+
+
+def parse_rules(text: str) -> Dict[str, str]:
+    """Parse rules written as ``F=F+F-F; X=...`` (``;``, ``,`` or newlines between rules).
+
+    Raises:
+        ValueError: If a rule is not ``<symbol>=<replacement>``
+    """
+    rules = {}
+    for rule in re.split(r"[;,\n]", text):
+        rule = rule.strip()
+        if not rule:
+            continue
+        symbol, sep, replacement = rule.replace("->", "=").partition("=")
+        symbol = symbol.strip()
+        if not sep or len(symbol) != 1:
+            raise ValueError(f"Invalid L-system rule '{rule}'; expected e.g. 'F=F+F-F'")
+        rules[symbol] = replacement.strip().replace(" ", "")
+    return rules
+
+
+def _check_brackets(text: str, what: str):
+    depth = 0
+    for symbol in text:
+        depth += (symbol == "[") - (symbol == "]")
+        if depth < 0:
+            break
+    if depth:
+        raise ValueError(f"Unbalanced brackets in {what} '{text}'")
+
+
+class Piece(NamedTuple):
+    """Drawing of one subtree in its local frame (start at the origin, heading +x, unit steps).
+
+    Attributes:
+        coords: (N, 2) vertices
+        moves: (N,) True where a vertex starts a new stroke
+        joins: The first stroke starts at the origin, so it can continue a stroke ending there
+        ends_open: Whether a stroke is still open at the end; None if the subtree never touches the pen
+    """
+    coords: np.ndarray
+    moves: np.ndarray
+    joins: bool
+    ends_open: Optional[bool]
+
+
+_NO_STROKES = (np.zeros((0, 2)), np.zeros(0, dtype=bool))
+
+
+class _Strokes:
+    """Collects transformed pieces as strokes, joining strokes that continue each other."""
+
+    def __init__(self):
+        self.coords: List[np.ndarray] = []
+        self.moves: List[np.ndarray] = []
+        self.size = 0
+        self.open = False  # A stroke is open and ends at the turtle position
+        self.first_joins: Optional[bool] = None  # Whether the first vertex continues an incoming stroke
+        self.ends_open: Optional[bool] = None
+
+    def add(self, piece: Piece, x: float, y: float, heading: float, scale: float):
+        if len(piece.coords):
+            coords, moves = piece.coords, piece.moves
+            if self.first_joins is None:
+                self.first_joins = piece.joins and x == 0.0 and y == 0.0
+            if piece.joins and self.open:
+                coords, moves = coords[1:], moves[1:]
+            if heading or scale != 1.0 or x or y:
+                c, s = scale * math.cos(heading), scale * math.sin(heading)
+                coords = coords @ np.array([[c, s], [-s, c]]) + [x, y]
+            self.coords.append(coords)
+            self.moves.append(moves)
+            self.size += len(coords)
+        if piece.ends_open is not None:
+            self.open = self.ends_open = piece.ends_open
+
+    def piece(self) -> Piece:
+        coords, moves = (np.concatenate(self.coords), np.concatenate(self.moves)) if self.coords else _NO_STROKES
+        return Piece(coords, moves, bool(self.first_joins), self.ends_open)
+
+    def flush(self) -> PathArray:
+        """Take the collected strokes as paths; an open stroke continues from its last vertex."""
+        coords, moves = np.concatenate(self.coords), np.concatenate(self.moves)
+        moves[0] = True
+        self.coords, self.moves, self.size = [], [], 0
+        if self.open:
+            self.coords, self.moves, self.size = [coords[-1:]], [np.ones(1, dtype=bool)], 1
+        starts = np.flatnonzero(moves)
+        paths = PathArray(coords, np.append(starts, len(coords)))
+        drawable = paths.lengths >= 2
+        return paths if drawable.all() else paths.select(drawable)
+
+
+class LSystem:
+    """Lazy L-system expansion with a turtle interpreter.
+
+    The expanded string is never built. ``strokes`` walks the rules
+    depth-first and advances the turtle over whole subtrees at once using
+    each (symbol, depth) pair's net displacement and turn, which are
+    computed once and memoized. Subtrees with up to ``CACHE_DRAWS``
+    segments are also memoized as vertex arrays in their local frame and
+    emitted with one rotation per occurrence, so the Python-level walk only
+    visits the few levels above the cached subtrees.
+
+    '+' turns clockwise and '-' counter-clockwise by ``angle`` degrees, 'F'
+    and 'G' draw a unit step, 'f' moves without drawing, '[' and ']' push
+    and pop the turtle state (ending the current stroke); other symbols
+    only take part in rewriting.
+
+    Args:
+        axiom: Start string
+        rules: Symbol -> replacement
+        angle: Turning angle in degrees
+
+    Raises:
+        ValueError: If brackets do not balance within the axiom or a rule
+    """
+
+    def __init__(self, axiom: str, rules: Dict[str, str], angle: float):
+        for symbol, replacement in rules.items():
+            _check_brackets(replacement, f"rule for '{symbol}'")
+        _check_brackets(axiom, "axiom")
+        self.axiom = axiom
+        self.rules = {s: r for s, r in rules.items() if s not in "[]"}
+        self.angle = math.radians(angle)
+        self._draws: Dict[Tuple[str, int], int] = {}
+        self._nets: Dict[Tuple[str, int], Tuple[float, float, float]] = {}
+        self._pieces: Dict[Tuple[str, int], Piece] = {}
+
+    def _expands(self, symbol: str, depth: int) -> bool:
+        return depth > 0 and symbol in self.rules
+
+    def draws(self, symbol: str, depth: int) -> int:
+        """Segments drawn by ``symbol`` after ``depth`` rewrites."""
+        key = (symbol, depth)
+        if key not in self._draws:
+            if self._expands(symbol, depth):
+                self._draws[key] = sum(self.draws(s, depth - 1) for s in self.rules[symbol])
+            else:
+                self._draws[key] = int(symbol in DRAW_SYMBOLS)
+        return self._draws[key]
+
+    def net(self, symbol: str, depth: int) -> Tuple[float, float, float]:
+        """(dx, dy, turn) of ``symbol`` after ``depth`` rewrites, in its local frame with unit steps."""
+        key = (symbol, depth)
+        if key not in self._nets:
+            if self._expands(symbol, depth):
+                x = y = heading = 0.0
+                stack = []
+                for s in self.rules[symbol]:
+                    if s == "[":
+                        stack.append((x, y, heading))
+                    elif s == "]":
+                        x, y, heading = stack.pop()
+                    else:
+                        x, y, heading = self._advance(x, y, heading, 1.0, self.net(s, depth - 1))
+                self._nets[key] = (x, y, heading)
+            elif symbol in DRAW_SYMBOLS or symbol in MOVE_SYMBOLS:
+                self._nets[key] = (1.0, 0.0, 0.0)
+            else:
+                self._nets[key] = (0.0, 0.0, {"+": -self.angle, "-": self.angle}.get(symbol, 0.0))
+        return self._nets[key]
+
+    @staticmethod
+    def _advance(x: float, y: float, heading: float, scale: float,
+                 net: Tuple[float, float, float]) -> Tuple[float, float, float]:
+        dx, dy, turn = net
+        if dx or dy:
+            c, s = scale * math.cos(heading), scale * math.sin(heading)
+            x, y = x + c * dx - s * dy, y + s * dx + c * dy
+        return x, y, heading + turn
+
+    def piece(self, symbol: str, depth: int) -> Piece:
+        """Memoized drawing of a subtree with at most ``CACHE_DRAWS`` segments."""
+        key = (symbol, depth)
+        if key not in self._pieces:
+            if self._expands(symbol, depth):
+                strokes = _Strokes()
+                for _ in self._walk(self.rules[symbol], depth - 1, strokes, 0.0, 0.0, 0.0, 1.0, None):
+                    pass
+                self._pieces[key] = strokes.piece()
+            elif symbol in DRAW_SYMBOLS:
+                self._pieces[key] = Piece(np.array([[0.0, 0.0], [1.0, 0.0]]), np.array([True, False]), True, True)
+            elif symbol in MOVE_SYMBOLS:
+                self._pieces[key] = Piece(*_NO_STROKES, False, False)
+            else:
+                self._pieces[key] = Piece(*_NO_STROKES, False, None)
+        return self._pieces[key]
+
+    def _walk(self, symbols: str, depth: int, strokes: _Strokes, x: float, y: float, heading: float,
+              scale: float, chunk_vertices: Optional[int]) -> Iterator[PathArray]:
+        """Feed the expansion of ``symbols`` into ``strokes``; yield chunks once ``chunk_vertices`` are held."""
+        stack = []
+        for symbol in symbols:
+            if symbol == "[":
+                stack.append((x, y, heading))
+                continue
+            if symbol == "]":
+                x, y, heading = stack.pop()
+                strokes.add(Piece(*_NO_STROKES, False, False), x, y, heading, scale)
+                continue
+            if self.draws(symbol, depth) > CACHE_DRAWS:
+                yield from self._walk(self.rules[symbol], depth - 1, strokes, x, y, heading, scale, chunk_vertices)
+            else:
+                strokes.add(self.piece(symbol, depth), x, y, heading, scale)
+                if chunk_vertices and strokes.size >= chunk_vertices:
+                    yield strokes.flush()
+            x, y, heading = self._advance(x, y, heading, scale, self.net(symbol, depth))
+
+    def strokes(self, iterations: int, step: float = 1.0, start: Tuple[float, float] = (0.0, 0.0),
+                heading: float = 90.0, chunk_vertices: int = CHUNK_VERTICES) -> Iterator[PathArray]:
+        """Yield the drawing after ``iterations`` rewrites as chunks of about ``chunk_vertices`` vertices.
+
+        Args:
+            iterations: Rewriting iterations
+            step: Length of one step
+            start: Turtle start position
+            heading: Start heading in degrees (90 = up)
+            chunk_vertices: Vertices per chunk
+        """
+        strokes = _Strokes()
+        yield from self._walk(self.axiom, iterations, strokes, start[0], start[1], math.radians(heading), step,
+                              chunk_vertices)
+        if strokes.size:
+            strokes.open = False
+            paths = strokes.flush()
+            if len(paths):
+                yield paths
+
+
+class LSystemAlgo(AlgorithmBase):
+    """L-system fractals (port of LSystemFractal.pde), expanded lazily and streamed in chunks.
+
+    Unlike the sketch, which draws everything as one polyline, ']' lifts
+    the pen, so branches do not draw a line back to their start.
+    """
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "L-System"
+
+    @classmethod
+    def get_description(cls) -> str:
+        return ("Lindenmayer system drawn with turtle graphics: F/G draw, f moves, +/- turn, [ ] branch. "
+                "Pick a preset or enter a custom axiom and rules.")
+
+    @classmethod
+    def get_parameters(cls) -> List[AlgorithmParameter]:
+        return [
+            AlgorithmParameter("preset", "choice", PRESET_CUSTOM, "Preset (overrides axiom, rules and angle)",
+                               items=[PRESET_CUSTOM] + list(PRESETS)),
+            AlgorithmParameter("axiom", "string", "F", "Axiom (start string)"),
+            AlgorithmParameter("rules", "string", "F=F+F-F-F+F", "Rules, e.g. 'X=X+YF+; Y=-FX-Y'"),
+            AlgorithmParameter("angle", "float", 90.0, "Turning angle (degrees)", min=-360.0, max=360.0, step=1.0),
+            AlgorithmParameter("iterations", "int", 3, "Rewriting iterations", min=0, max=40),
+            AlgorithmParameter("initial_length", "float", 400.0, "Step length before scaling", min=0.001,
+                               max=10000.0),
+            AlgorithmParameter("length_factor", "float", 0.4, "Step length factor per iteration",
+                               min=0.01, max=2.0, step=0.01),
+            AlgorithmParameter("start_x", "float", 0.0, "Turtle start x", min=-10000.0, max=10000.0),
+            AlgorithmParameter("start_y", "float", -400.0, "Turtle start y", min=-10000.0, max=10000.0),
+            AlgorithmParameter("heading", "float", 90.0, "Start heading (degrees, 90 = up)",
+                               min=-360.0, max=360.0, step=15.0),
+            AlgorithmParameter("max_segments", "int", 20000000, "Stop after about this many segments",
+                               min=1, max=1000000000, lod={LOD_PREVIEW: 200000}),
+        ]
+
+    @staticmethod
+    def build(parameters: Dict[str, Any]) -> LSystem:
+        """The L-system selected by ``parameters`` (a preset, or the custom axiom/rules/angle)."""
+        preset = PRESETS.get(parameters.get("preset", PRESET_CUSTOM))
+        if preset:
+            axiom, rules, angle = preset
+        else:
+            axiom = str(parameters.get("axiom", "F")).replace(" ", "")
+            rules = str(parameters.get("rules", "F=F+F-F-F+F"))
+            angle = parameters.get("angle", 90.0)
+        return LSystem(axiom, parse_rules(rules), angle)
+
+    def generate_chunks(self, parameters: Dict[str, Any]) -> Iterator[GeometryData]:
+        system = self.build(parameters)
+        iterations = max(0, int(parameters.get("iterations", 3)))
+        step = parameters.get("initial_length", 400.0) * parameters.get("length_factor", 0.4) ** iterations
+        start = (parameters.get("start_x", 0.0), parameters.get("start_y", -400.0))
+        limit = max(1, int(parameters.get("max_segments", 20000000)))
+        total = sum(system.draws(symbol, iterations) for symbol in system.axiom)
+        if total > limit:
+            print(f"Warning: L-system draws {total} segments; stopping after about {limit}.")
+
+        emitted = 0
+        for paths in system.strokes(iterations, step, start, parameters.get("heading", 90.0)):
+            geometry = GeometryData()
+            geometry.add(paths)
+            yield geometry
+            emitted += paths.n_vertices - len(paths)
+            if emitted >= limit:
+                break
+
+    def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
+        return GeometryData.merge(self.generate_chunks(parameters))
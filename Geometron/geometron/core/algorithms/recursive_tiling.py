@@ -0,0 +1,180 @@
+from .base import AlgorithmBase, AlgorithmParameter, GeometryData, LOD_PREVIEW
+from ..geometry.primitives import PathArray
+from typing import List, Dict, Any
+import numpy as np
+
+MODE_SQUARE = "Square (Truchet)"
+MODE_TRIANGLE = "Triangle (Midpoints)"
+
+_QUADRANTS = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+
+def _split_mask(count: int, probability: float, rng: np.random.Generator) -> np.ndarray:
+    """Which of ``count`` tiles to split; one vectorized draw per level."""
+    if probability >= 1.0:
+        return np.ones(count, dtype=bool)
+    return rng.random(count) < probability
+
+
+def subdivide_rects(rects: np.ndarray, depth: int, probability: float, rng: np.random.Generator) -> np.ndarray:
+    """Split (N, 4) ``[x, y, w, h]`` rectangles into quadrants level by level.
+
+    Each level splits every remaining rectangle with ``probability``;
+    unsplit ones become final tiles.
+
+    Returns:
+        (M, 4) final tiles
+    """
+    tiles = []
+    for _ in range(depth):
+        split = _split_mask(len(rects), probability, rng)
+        tiles.append(rects[~split])
+        parents = rects[split]
+        if not len(parents):
+            break
+        rects = np.repeat(parents, 4, axis=0)
+        rects[:, 2:] *= 0.5
+        rects[:, :2] += np.tile(_QUADRANTS, (len(parents), 1)) * rects[:, 2:]
+    else:
+        tiles.append(rects)
+    return np.concatenate(tiles)
+
+
+def subdivide_triangles(triangles: np.ndarray, depth: int, probability: float,
+                        rng: np.random.Generator) -> np.ndarray:
+    """Split (N, 3, 2) triangles into four at their edge midpoints, level by level (see ``subdivide_rects``).
+
+    Returns:
+        (M, 3, 2) final tiles
+    """
+    tiles = []
+    for _ in range(depth):
+        split = _split_mask(len(triangles), probability, rng)
+        tiles.append(triangles[~split])
+        v = triangles[split]
+        if not len(v):
+            break
+        m = 0.5 * (v + v[:, [1, 2, 0]])  # Midpoints of v1-v2, v2-v3 and v3-v1
+        triangles = np.stack([np.stack([v[:, 0], m[:, 0], m[:, 2]], axis=1),
+                              np.stack([m[:, 0], v[:, 1], m[:, 1]], axis=1),
+                              np.stack([m[:, 2], m[:, 1], v[:, 2]], axis=1),
+                              m], axis=1).reshape(-1, 3, 2)
+    else:
+        tiles.append(triangles)
+    return np.concatenate(tiles)
+
+
+def truchet_arcs(tiles: np.ndarray, type_a: np.ndarray, resolution: int) -> np.ndarray:
+    """Quarter arcs joining edge midpoints of every tile, all tiles in one batch.
+
+    Type A tiles get arcs around their top-left and bottom-right corners,
+    type B tiles around their top-right and bottom-left corners.
+
+    Args:
+        tiles: (N, 4) ``[x, y, w, h]`` tiles (y down)
+        type_a: (N,) tile orientation
+        resolution: Segments per arc
+
+    Returns:
+        (2N, resolution + 1, 2) arc vertices, the two arcs of each tile in turn
+    """
+    # Corner offsets (as fractions of the tile) and start angles; each arc sweeps 90 degrees into the tile
+    corners = np.where(type_a[:, None, None], [[[0, 0], [1, 1]]], [[[1, 0], [0, 1]]])  # (N, 2, 2)
+    start = np.where(type_a[:, None], [[0.0, np.pi]], [[0.5 * np.pi, 1.5 * np.pi]])  # (N, 2)
+    centers = tiles[:, None, :2] + corners * tiles[:, None, 2:]
+    radius = 0.5 * tiles[:, 2:].min(axis=1)
+    angles = start[..., None] + np.linspace(0.0, 0.5 * np.pi, resolution + 1)  # (N, 2, R + 1)
+    arcs = np.empty(angles.shape + (2,))
+    arcs[..., 0] = centers[..., 0, None] + radius[:, None, None] * np.cos(angles)
+    arcs[..., 1] = centers[..., 1, None] + radius[:, None, None] * np.sin(angles)
+    return arcs.reshape(-1, resolution + 1, 2)
+
+
+class RecursiveTilingAlgo(AlgorithmBase):
+    """Recursive Truchet / triangle tiling (port of RecursiveTiling.pde).
+
+    Subdivision works on whole levels: each level is an array of rectangles
+    or triangles, split at once (with one vectorized random draw when tiles
+    split only with some probability). The motifs of all final tiles are
+    then generated in one batch, so the cost is linear in the tile count
+    and no Python recursion is involved.
+
+    The sketch's quarter arcs are rotated by 90 degrees and run outside
+    their tile; here they join the tile's edge midpoints as its comments
+    describe.
+    """
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "Recursive Tiling"
+
+    @classmethod
+    def get_description(cls) -> str:
+        return ("Recursively subdivided grid of Truchet arc tiles, or a subdivided triangle "
+                "drawn as midpoint triangles, with optional rotated copies.")
+
+    @classmethod
+    def get_parameters(cls) -> List[AlgorithmParameter]:
+        return [
+            AlgorithmParameter("mode", "choice", MODE_SQUARE, "Tile shape", items=[MODE_SQUARE, MODE_TRIANGLE]),
+            AlgorithmParameter("grid_cols", "int", 4, "Initial columns (square mode)", min=1, max=200),
+            AlgorithmParameter("grid_rows", "int", 4, "Initial rows (square mode)", min=1, max=200),
+            AlgorithmParameter("depth", "int", 3, "Subdivision levels", min=0, max=10, lod={LOD_PREVIEW: 6}),
+            AlgorithmParameter("split_probability", "float", 1.0, "Chance that a tile is split at each level",
+                               min=0.0, max=1.0, step=0.05),
+            AlgorithmParameter("random_orientation", "bool", True, "Random Truchet orientation (else checkerboard)"),
+            AlgorithmParameter("seed", "int", 0, "Random seed", min=0, max=2 ** 31 - 1),
+            AlgorithmParameter("arc_resolution", "int", 10, "Segments per quarter arc", min=2, max=200,
+                               lod={LOD_PREVIEW: 6}),
+            AlgorithmParameter("width", "float", 1000.0, "Width of the tiled area", min=1.0, max=10000.0),
+            AlgorithmParameter("height", "float", 1000.0, "Height of the tiled area", min=1.0, max=10000.0),
+            AlgorithmParameter("copies", "int", 1, "Rotated copies", min=1, max=360),
+            AlgorithmParameter("rotation", "float", 0.0, "Rotation between copies (degrees)",
+                               min=-360.0, max=360.0, step=1.0),
+        ]
+
+    def generate_geometry(self, parameters: Dict[str, Any]) -> GeometryData | None:
+        width, height = parameters.get("width", 1000.0), parameters.get("height", 1000.0)
+        depth = max(0, int(parameters.get("depth", 3)))
+        probability = parameters.get("split_probability", 1.0)
+        rng = np.random.default_rng(int(parameters.get("seed", 0)))
+
+        # Tiles and motifs are built in the sketch's coordinates: origin top-left, y down
+        if parameters.get("mode", MODE_SQUARE) == MODE_TRIANGLE:
+            side = min(width, height) * 0.95
+            tri_height = side * np.sqrt(3.0) / 2.0
+            cx, cy = width / 2.0, height / 2.0 + tri_height * 0.1
+            triangle = np.array([[[cx, cy - tri_height / 2.0],
+                                  [cx - side / 2.0, cy + tri_height / 2.0],
+                                  [cx + side / 2.0, cy + tri_height / 2.0]]])
+            tiles = subdivide_triangles(triangle, depth, probability, rng)
+            motifs = 0.5 * (tiles + tiles[:, [1, 2, 0]])  # Each tile's midpoint triangle
+            closed = True
+        else:
+            cols, rows = max(1, int(parameters.get("grid_cols", 4))), max(1, int(parameters.get("grid_rows", 4)))
+            tile_w, tile_h = width / cols, height / rows
+            r, c = np.divmod(np.arange(rows * cols), cols)
+            grid = np.column_stack([c * tile_w, r * tile_h, np.full(len(c), tile_w), np.full(len(c), tile_h)])
+            tiles = subdivide_rects(grid, depth, probability, rng)
+            if parameters.get("random_orientation", True):
+                type_a = rng.random(len(tiles)) < 0.5
+            else:
+                type_a = np.rint(tiles[:, 0] / tiles[:, 2] + tiles[:, 1] / tiles[:, 3]).astype(np.int64) % 2 == 0
+            motifs = truchet_arcs(tiles, type_a, max(2, int(parameters.get("arc_resolution", 10))))
+            closed = False
+
+        # All copies at once, rotated about the center; then to canvas coordinates (centered, y up)
+        copies = max(1, int(parameters.get("copies", 1)))
+        angles = np.radians(np.arange(copies) * parameters.get("rotation", 0.0))
+        cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+        per_path = motifs.shape[1]
+        x = motifs[..., 0].ravel() - width / 2.0
+        y = motifs[..., 1].ravel() - height / 2.0
+        coords = np.empty((copies, len(x), 2))
+        coords[..., 0] = cos * x - sin * y
+        coords[..., 1] = -(sin * x + cos * y)
+
+        geometry = GeometryData()
+        if coords.size:
+            geometry.add(PathArray(coords.reshape(-1, 2), np.arange(0, coords.size // 2 + 1, per_path), closed))
+        return geometry
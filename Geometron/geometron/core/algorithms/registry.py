@@ -1,6 +1,11 @@
 from typing import Dict, Type, List
 from .base import AlgorithmBase
 from .dummy import DummyCircleAlgo, DummySquareAlgo # Import dummy algorithms
+from .lissajous import LissajousAlgo
+from .reaction_diffusion import ReactionDiffusionAlgo
+from .flow_field import FlowFieldAlgo
+from .lsystem import LSystemAlgo
+from .recursive_tiling import RecursiveTilingAlgo
 
 class AlgorithmRegistry:
     """Manages discovery and access to available algorithms."""
@@ -12,7 +17,8 @@ class AlgorithmRegistry:
     def _register_defaults(self):
         """Register the default set of algorithms."""
         # In a real application, this might scan plugins or specific modules
-        default_algos = [DummyCircleAlgo, DummySquareAlgo]
+        default_algos = [DummyCircleAlgo, DummySquareAlgo, LissajousAlgo, ReactionDiffusionAlgo, FlowFieldAlgo,
+                         LSystemAlgo, RecursiveTilingAlgo]
         for algo_cls in default_algos:
             self.register_algorithm(algo_cls)
 
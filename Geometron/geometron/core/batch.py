@@ -0,0 +1,180 @@
+"""
+Parameter-sweep batch rendering for the Geometron application.
+
+A sweep spec varies layer parameters of a project, either over a full grid
+or by random sampling, and every variant is rendered to its own SVG in a
+process pool. A ``manifest.json`` next to the SVGs records the parameters
+and timings of each variant.
+
+Spec format (JSON)::
+
+    {
+        "grid":   {"segments": [12, 24, 48], "0.radius": [50, 100]},
+        "random": {"Circle.radius": {"min": 10, "max": 200}, "dashed": [true, false]},
+        "samples": 20,
+        "seed": 1
+    }
+
+Parameter keys are ``param`` (every layer that has it), ``<index>.param``
+or ``<layer name>.param``. Grid values are lists. Random values are either
+a ``{"min", "max"}`` range (integers if both bounds are integers) or a list
+of choices. With both sections, each grid point gets ``samples`` random
+variants; with only ``random``, ``samples`` variants are drawn in total.
+"""
+
+import copy
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .io.project import load_project
+from .io.svg import export_svg, open_svg
+from .plotting.pipeline import PlotPipeline
+
+MANIFEST_FILE = "manifest.json"
+
+
+def grid_variants(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Return the cartesian product of a grid as a list of parameter dicts."""
+    if not grid:
+        return [{}]
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def sample_value(rng: random.Random, spec: Any) -> Any:
+    """Draw one value from a range dict or a list of choices."""
+    if isinstance(spec, dict):
+        low, high = spec["min"], spec["max"]
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return rng.uniform(low, high)
+    if isinstance(spec, (list, tuple)):
+        return rng.choice(spec)
+    raise ValueError(f"Invalid random spec: {spec!r}")
+
+
+def expand_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand a sweep spec into a list of parameter overrides, one per variant."""
+    variants = grid_variants(spec.get("grid", {}))
+    ranges = spec.get("random", {})
+    if not ranges:
+        return variants
+    rng = random.Random(spec.get("seed"))
+    samples = int(spec.get("samples", 1))
+    return [{**base, **{key: sample_value(rng, r) for key, r in ranges.items()}}
+            for base in variants for _ in range(samples)]
+
+
+def _target_layers(layers: List[Dict[str, Any]], key: str) -> Tuple[List[Dict[str, Any]], str]:
+    """Resolve a sweep key to the layer dicts it applies to and the parameter name."""
+    selector, _, param = key.rpartition(".")
+    if not selector:
+        return [layer for layer in layers if param in layer.get("parameters", {})], param
+    if selector.isdigit():
+        index = int(selector)
+        return ([layers[index]] if index < len(layers) else []), param
+    return [layer for layer in layers if layer.get("name") == selector], param
+
+
+def apply_variant(project: Dict[str, Any], variant: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of project data with a variant's parameter overrides applied."""
+    data = copy.deepcopy(project)
+    layers = data.get("layers", [])
+    for key, value in variant.items():
+        targets, param = _target_layers(layers, key)
+        if not targets:
+            raise ValueError(f"Sweep key '{key}' does not match any layer")
+        for layer in targets:
+            layer.setdefault("parameters", {})[param] = value
+    return data
+
+
+def render_variant(project: Dict[str, Any], output_path: str, width: float, height: float,
+                   precision: int = 3, pipeline: Optional[PlotPipeline] = None) -> Dict[str, Any]:
+    """Render one project variant to SVG. Worker entry point for the process pool."""
+    start = time.perf_counter()
+    layer_manager = load_project(project)
+    loaded = time.perf_counter()
+    try:
+        with open_svg(output_path) as fh:
+            count = export_svg(layer_manager.layers, fh, width, height, precision, pipeline)
+    finally:
+        layer_manager.scheduler.shutdown()
+    end = time.perf_counter()
+    entry = {
+        "paths": count,
+        "load_s": round(loaded - start, 6),
+        "render_s": round(end - loaded, 6),
+        "elapsed_s": round(end - start, 6),
+        "pid": os.getpid()
+    }
+    if pipeline:
+        entry["pipeline"] = [asdict(report) for report in pipeline.reports]
+    return entry
+
+
+def run_batch(project: Dict[str, Any], variants: List[Dict[str, Any]], output_dir: str,
+              width: float, height: float, precision: int = 3, max_workers: Optional[int] = None,
+              prefix: str = "variant", pipeline: Optional[PlotPipeline] = None,
+              compress: bool = False) -> Dict[str, Any]:
+    """Render every variant of a project in a process pool.
+
+    Args:
+        project: Project data in the ``LayerManager.as_dict`` format
+        variants: Parameter overrides, e.g. from ``expand_spec``
+        output_dir: Directory for the SVGs and the manifest
+        width: Canvas width in user units
+        height: Canvas height in user units
+        precision: Decimal places for coordinates
+        max_workers: Process count (default: one per CPU)
+        prefix: File name prefix for the SVGs
+        pipeline: Optional export pipeline; each worker runs its own copy
+        compress: Write gzip-compressed ``.svgz`` files
+
+    Returns:
+        The manifest, which is also written to ``output_dir/manifest.json``
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Resolve every variant up front so a bad key fails before any work starts
+    jobs = [(index, variant, apply_variant(project, variant)) for index, variant in enumerate(variants)]
+    max_workers = max_workers or os.cpu_count() or 1
+    extension = ".svgz" if compress else ".svg"
+    entries: List[Dict[str, Any]] = [None] * len(jobs)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for index, variant, data in jobs:
+            path = os.path.join(output_dir, f"{prefix}_{index:04d}{extension}")
+            future = executor.submit(render_variant, data, path, width, height, precision, pipeline)
+            futures[future] = (index, variant, path)
+        for future in as_completed(futures):
+            index, variant, path = futures[future]
+            entry = {"index": index, "file": os.path.basename(path), "parameters": variant}
+            try:
+                entry.update(future.result())
+            except Exception as e:
+                print(f"Warning: Variant {index} failed: {e}")
+                entry["error"] = repr(e)
+            entries[index] = entry
+    wall = time.perf_counter() - start
+
+    manifest = {
+        "variants": entries,
+        "count": len(entries),
+        "failed": sum(1 for entry in entries if "error" in entry),
+        "workers": max_workers,
+        "wall_s": round(wall, 6),
+        "cpu_s": round(sum(entry.get("elapsed_s", 0.0) for entry in entries), 6),
+        "variants_per_s": round(len(entries) / wall, 3) if wall > 0 else None,
+        "canvas": {"width": width, "height": height}
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
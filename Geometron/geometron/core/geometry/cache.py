@@ -0,0 +1,361 @@
+"""
+Geometry caching for the Geometron application.
+
+Generated geometry is cached by (algorithm name, algorithm version,
+canonicalized parameters) so that returning to a previous parameter set
+does not rerun the algorithm. An optional on-disk cache keeps results
+across sessions.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .primitives import GeometryCollection, PathArray
+
+CacheKey = Tuple[str, str, str]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+# Environment variable naming a directory for the shared on-disk cache
+CACHE_DIR_ENV = "GEOMETRON_CACHE_DIR"
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a parameter value into a JSON-stable form."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    return value
+
+
+def geometry_nbytes(geometry: Any) -> int:
+    """Size of a generated geometry's coordinate buffers in bytes."""
+    return int(getattr(geometry, "nbytes", 0))
+
+
+class GeometryCache:
+    """Thread-safe LRU cache of generated geometry bounded by a byte budget.
+
+    Cached geometry is shared between layers and must be treated as
+    read-only; use ``transformed()`` or ``copy()`` before modifying it.
+
+    Attributes:
+        hits: Number of successful lookups
+        misses: Number of failed lookups
+        evictions: Number of entries dropped to stay within the budget
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk: Optional['DiskGeometryCache'] = None):
+        self.disk = disk
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(algorithm_name: str, algorithm_version: str, parameters: Dict[str, Any]) -> CacheKey:
+        """Build a cache key from an algorithm identity and its parameters."""
+        canonical = json.dumps(_canonical(parameters), sort_keys=True, separators=(",", ":"), default=repr)
+        return (algorithm_name, str(algorithm_version), canonical)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return cached geometry for ``key`` or None, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        geometry = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if geometry is None:
+                self.misses += 1
+            else:
+                self.hits += 1  # Answered by the disk tier
+        if geometry is not None:
+            self._store(key, geometry)
+        return geometry
+
+    def put(self, key: CacheKey, geometry: Any, background: Optional[Callable] = None) -> bool:
+        """Store geometry under ``key``, and on disk if a disk cache is set.
+
+        Args:
+            background: Runs the disk write, called like ``Executor.submit``
+                (e.g. ``GenerationScheduler.run_in_pool``); None writes before returning
+
+        Returns False if it exceeds the whole memory budget.
+        """
+        if self.disk is not None:
+            if background is None:
+                self.disk.put(key, geometry)
+            else:
+                background(self.disk.put, key, geometry)
+        return self._store(key, geometry)
+
+    def _store(self, key: CacheKey, geometry: Any) -> bool:
+        """Insert into the in-memory LRU."""
+        size = geometry_nbytes(geometry)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            if size > self._max_bytes:
+                return False
+            self._entries[key] = (geometry, size)
+            self._total_bytes += size
+            self._evict()
+            return True
+
+    def _evict(self):
+        """Drop least recently used entries until within budget. Caller holds the lock."""
+        while self._total_bytes > self._max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def reset_stats(self):
+        """Reset hit/miss/eviction counters."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters and current usage for sizing the cache."""
+        with self._lock:
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self._max_bytes
+            }
+        if self.disk is not None:
+            stats.update({f"disk_{k}": v for k, v in self.disk.stats().items()})
+        return stats
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"GeometryCache({len(self)} entries, {self._total_bytes}/{self._max_bytes} bytes)"
+
+
+class DiskGeometryCache:
+    """Size-capped on-disk store of generated geometry.
+
+    Each entry is a directory named after a hash of the cache key holding
+    raw ``.npy`` buffers (coordinates, path offsets, closed flags) and a
+    small ``meta.json``. Coordinates are memory-mapped read-only on load,
+    so reopening a project does not read whole layers into memory up
+    front. Least recently used entries are deleted once the directory
+    exceeds ``max_bytes``. The directory is scanned once on creation;
+    after that its size is tracked as entries are written and deleted.
+
+    Only path geometry is stored; each PathArray (or Line/Path/Shape) in a
+    collection comes back as a PathArray with its style. Collections that
+    mix 2D and 3D paths are not cached.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        # Entry directory -> size in bytes, least recently used first
+        self._sizes: "OrderedDict[str, int]" = OrderedDict(
+            (path, size) for _, size, path in sorted(self._scan()))
+        self._total_bytes = sum(self._sizes.values())
+
+    @staticmethod
+    def key_hash(key: CacheKey) -> str:
+        """Stable file name for a cache key."""
+        return hashlib.sha1(json.dumps(list(key)).encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: CacheKey) -> str:
+        return os.path.join(self.directory, self.key_hash(key))
+
+    def get(self, key: CacheKey) -> Optional[GeometryCollection]:
+        """Load geometry for ``key`` with memory-mapped coordinates, or None."""
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, self.META_FILE)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("key") != list(key):
+                raise ValueError("hash collision")
+            coords = np.load(os.path.join(entry_dir, "coords.npy"), mmap_mode="r")
+            offsets = np.load(os.path.join(entry_dir, "offsets.npy"))
+            closed = np.load(os.path.join(entry_dir, "closed.npy"))
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        collection = GeometryCollection()
+        first_path = 0
+        for group in meta["groups"]:
+            last_path = first_path + group["paths"]
+            start, end = offsets[first_path], offsets[last_path]
+            collection.add(PathArray(coords[start:end],
+                                     offsets[first_path:last_path + 1] - start,
+                                     closed[first_path:last_path],
+                                     group["style"]))
+            first_path = last_path
+        try:
+            os.utime(meta_path)  # Keeps the order across sessions
+        except OSError:
+            pass
+        with self._lock:
+            if entry_dir in self._sizes:
+                self._sizes.move_to_end(entry_dir)
+            self.hits += 1
+        return collection
+
+    def put(self, key: CacheKey, geometry: Any) -> bool:
+        """Write geometry to disk. Returns False if it cannot be stored."""
+        if not isinstance(geometry, GeometryCollection):
+            return False
+        groups = list(geometry.iter_path_arrays())
+        if len({paths.dim for paths in groups}) > 1:
+            return False
+        try:
+            meta = json.dumps({
+                "key": list(key),
+                "groups": [{"paths": len(paths), "style": paths.style} for paths in groups]
+            })
+        except (TypeError, ValueError):
+            return False
+
+        merged = PathArray.concatenate(groups) if groups else PathArray.empty()
+        entry_dir = self._entry_dir(key)
+        tmp_dir = f"{entry_dir}.tmp-{uuid.uuid4().hex}"
+        try:
+            os.makedirs(tmp_dir)
+            np.save(os.path.join(tmp_dir, "coords.npy"), merged.coords)
+            np.save(os.path.join(tmp_dir, "offsets.npy"), merged.offsets)
+            np.save(os.path.join(tmp_dir, "closed.npy"), merged.closed)
+            # meta.json goes last: an entry without it is treated as missing
+            with open(os.path.join(tmp_dir, self.META_FILE), "w", encoding="utf-8") as f:
+                f.write(meta)
+            size = sum(e.stat().st_size for e in os.scandir(tmp_dir))
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+                self._total_bytes += size - self._sizes.pop(entry_dir, 0)
+                self._sizes[entry_dir] = size
+                self._evict()
+        except OSError as e:
+            print(f"Warning: Could not write geometry cache entry: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        return True
+
+    def _scan(self):
+        """Return [(mtime, size, path)] for all complete entries."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            meta_path = os.path.join(path, self.META_FILE)
+            if ".tmp-" in name or not os.path.isfile(meta_path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path))
+                entries.append((os.path.getmtime(meta_path), size, path))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self):
+        """Delete least recently used entries until under ``max_bytes``. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes and self._sizes:
+            path, size = self._sizes.popitem(last=False)
+            shutil.rmtree(path, ignore_errors=True)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Delete all cache entries."""
+        with self._lock:
+            for _, _, path in self._scan():
+                shutil.rmtree(path, ignore_errors=True)
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters and current disk usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._sizes),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+_shared_cache: Optional[GeometryCache] = None
+
+
+def get_shared_cache() -> GeometryCache:
+    """Return the process-wide geometry cache used by layers.
+
+    If the ``GEOMETRON_CACHE_DIR`` environment variable is set, the cache
+    is backed by a DiskGeometryCache in that directory.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+        _shared_cache = GeometryCache(disk=DiskGeometryCache(cache_dir) if cache_dir else None)
+    return _shared_cache
+
+
+def set_shared_cache(cache: GeometryCache):
+    """Replace the process-wide geometry cache (e.g. to change its budget)."""
+    global _shared_cache
+    _shared_cache = cache
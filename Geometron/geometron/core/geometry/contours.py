@@ -0,0 +1,174 @@
+"""
+Iso-contour extraction for the Geometron application.
+
+``marching_squares`` classifies every grid cell at once and emits one or
+two oriented segments per crossing cell, with the region above the level
+always on the same side. Each crossing point is identified by the grid
+edge it lies on, so neighbouring cells share endpoints exactly and every
+crossing starts at most one segment. The successor of each segment is
+then a single lookup, and ``link_segments`` orders the segments into
+polylines with pointer jumping instead of walking them one by one.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .primitives import PathArray
+
+# Cell edges: crossing points on the top, right, bottom and left edge of a cell
+_TOP, _RIGHT, _BOTTOM, _LEFT = range(4)
+_EDGE_MIDPOINTS = np.array([[0.5, 0.0], [1.0, 0.5], [0.5, 1.0], [0.0, 0.5]])
+_CORNERS = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])  # Bits 1, 2, 4, 8 of the case index
+
+# Edge pairs joined in each case. Saddles (5, 10) are split so the corners above the level stay apart.
+_CASE_EDGES = {
+    1: [(_LEFT, _TOP)], 2: [(_TOP, _RIGHT)], 3: [(_LEFT, _RIGHT)], 4: [(_RIGHT, _BOTTOM)],
+    5: [(_LEFT, _BOTTOM), (_TOP, _RIGHT)], 6: [(_TOP, _BOTTOM)], 7: [(_LEFT, _BOTTOM)],
+    8: [(_LEFT, _BOTTOM)], 9: [(_TOP, _BOTTOM)], 10: [(_TOP, _LEFT), (_RIGHT, _BOTTOM)],
+    11: [(_RIGHT, _BOTTOM)], 12: [(_LEFT, _RIGHT)], 13: [(_TOP, _RIGHT)], 14: [(_LEFT, _TOP)],
+}
+
+
+def _case_table() -> np.ndarray:
+    """(16, 2, 2) table of oriented (from, to) edges per case; -1 marks no segment.
+
+    Segments are oriented so the corners above the level lie to their left
+    in grid coordinates (x right, y down).
+    """
+    table = np.full((16, 2, 2), -1, dtype=np.int64)
+    for case, pairs in _CASE_EDGES.items():
+        above = _CORNERS[[bit for bit in range(4) if case >> bit & 1]]
+        for i, (start, end) in enumerate(pairs):
+            p, q = _EDGE_MIDPOINTS[start], _EDGE_MIDPOINTS[end]
+            d, r = q - p, above[0] - p
+            if d[0] * r[1] - d[1] * r[0] > 0:
+                start, end = end, start
+            table[case, i] = start, end
+    return table
+
+
+_CASES = _case_table()
+
+
+def marching_squares(grid: np.ndarray, level: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the oriented iso-segments of a 2D grid.
+
+    A corner is above the level when its value is strictly greater.
+
+    Args:
+        grid: (rows, columns) array of values
+        level: Iso level
+
+    Returns:
+        (start, end, points): per segment the crossing ids it runs between,
+        and (n_crossings, 2) crossing coordinates as (column, row) indexed by id
+    """
+    grid = np.asarray(grid)
+    rows, cols = grid.shape
+    above = grid > level
+    case = (above[:-1, :-1].view(np.uint8) | above[:-1, 1:].view(np.uint8) << 1
+            | above[1:, 1:].view(np.uint8) << 2 | above[1:, :-1].view(np.uint8) << 3)
+    cell_row, cell_col = np.nonzero((case > 0) & (case < 15))
+    edges = _CASES[case[cell_row, cell_col]]  # (cells, 2, 2)
+
+    # Crossing id of each cell edge: horizontal grid edges first, then vertical ones
+    n_horizontal = rows * (cols - 1)
+    base = cell_row * (cols - 1) + cell_col
+    cell_edge_ids = np.stack([base, n_horizontal + cell_row * cols + cell_col + 1,
+                              base + cols - 1, n_horizontal + cell_row * cols + cell_col], axis=1)
+    second = edges[:, 1, 0] >= 0
+    cell = np.concatenate([np.arange(len(edges)), np.flatnonzero(second)])
+    pair = np.concatenate([edges[:, 0], edges[second, 1]])
+    start = cell_edge_ids[cell, pair[:, 0]]
+    end = cell_edge_ids[cell, pair[:, 1]]
+
+    # Interpolate the crossing on every edge used, and renumber the used edges from 0
+    used, ids = np.unique(np.concatenate([start, end]), return_inverse=True)
+    start, end = ids[:len(start)], ids[len(start):]
+    vertical = used >= n_horizontal
+    local = np.where(vertical, used - n_horizontal, used)
+    width = np.where(vertical, cols, cols - 1)
+    r, c = local // width, local % width
+    step = vertical.astype(np.int64)  # Vertical edges run down a row, horizontal ones right a column
+    v0, v1 = grid[r, c], grid[r + step, c + 1 - step]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(np.abs(v1 - v0) > 1e-12, (level - v0) / (v1 - v0), 0.5)
+    points = np.column_stack([c + np.where(vertical, 0.0, t), r + np.where(vertical, t, 0.0)])
+    return start, end, points
+
+
+def link_segments(start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Order oriented segments into chains.
+
+    Every id may start and end at most one segment, so each segment has at
+    most one successor (the segment starting where it ends) and the chains
+    are simple paths or loops.
+
+    Args:
+        start: Start id of each segment
+        end: End id of each segment
+
+    Returns:
+        (vertices, offsets, closed): vertex ids of every chain, chain offsets
+        into ``vertices`` and per-chain loop flags. Loops do not repeat their
+        first vertex.
+    """
+    n = len(start)
+    if not n:
+        return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=bool)
+    index = np.arange(n)
+    starting = np.full(max(int(start.max()), int(end.max())) + 1, -1, dtype=np.int64)
+    starting[start] = index
+    succ = starting[end]
+
+    # Loops: after enough pointer jumps, chain segments point at their tail and loop segments at a loop segment
+    ptr = np.where(succ < 0, index, succ)
+    label = index.copy()
+    for _ in range(max(1, n.bit_length())):
+        np.minimum(label, label[ptr], out=label)
+        ptr = ptr[ptr]
+    in_loop = succ[ptr] >= 0
+    # Cut every loop before its lowest segment, which becomes the head of the chain
+    heads = np.flatnonzero(in_loop & (label == index))
+    pred = np.full(n, -1, dtype=np.int64)
+    has_succ = succ >= 0
+    pred[succ[has_succ]] = index[has_succ]
+    succ[pred[heads]] = -1
+
+    # List ranking: the tail of every segment's chain and its distance to it
+    ptr = np.where(succ < 0, index, succ)
+    dist = (succ >= 0).astype(np.int64)
+    while True:
+        jumped = ptr[ptr]
+        if np.array_equal(jumped, ptr):
+            break
+        dist += dist[ptr]
+        ptr = jumped
+    order = np.lexsort((-dist, ptr))
+    tails = ptr[order]
+    first = np.flatnonzero(np.r_[True, tails[1:] != tails[:-1]])
+    counts = np.diff(np.r_[first, n])
+    closed = in_loop[order[first]]
+
+    # Vertices: the start of every segment, plus the end of the last one for open chains
+    extra = (~closed).astype(np.int64)
+    offsets = np.zeros(len(first) + 1, dtype=np.int64)
+    np.cumsum(counts + extra, out=offsets[1:])
+    vertices = np.empty(offsets[-1], dtype=np.int64)
+    shift = np.repeat(np.cumsum(extra) - extra, counts)
+    vertices[np.arange(n) + shift] = start[order]
+    open_chain = np.flatnonzero(~closed)
+    vertices[offsets[open_chain + 1] - 1] = end[order[first[open_chain] + counts[open_chain] - 1]]
+    return vertices, offsets, closed
+
+
+def contour_paths(grid: np.ndarray, level: float) -> PathArray:
+    """Iso-contours of a grid as joined polylines in (column, row) grid coordinates.
+
+    Contours that close on themselves become closed paths; contours that
+    reach the grid boundary stay open.
+    """
+    start, end, points = marching_squares(grid, level)
+    vertices, offsets, closed = link_segments(start, end)
+    return PathArray(points[vertices], offsets, closed)
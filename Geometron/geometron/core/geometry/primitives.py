@@ -7,7 +7,7 @@ This module defines the fundamental geometric objects used throughout the applic
 import math
 import copy
 from enum import Enum
-from typing import List, Tuple, Optional, Dict, Any, Union
+from typing import List, Tuple, Optional, Dict, Any, Union, Iterable, Iterator, Sequence
 import numpy as np
 import attr
 from dataclasses import dataclass
@@ -20,6 +20,7 @@ class GeometryType(Enum):
     PATH = 3
     SHAPE = 4
     GROUP = 5
+    PATH_ARRAY = 6
 
 
 @attr.s(auto_attribs=True)
@@ -90,6 +91,8 @@ class GeometryObject:
             return Shape.from_dict(data)
         elif geom_type == GeometryType.GROUP:
             return Group.from_dict(data)
+        elif geom_type == GeometryType.PATH_ARRAY:
+            return PathArray.from_dict(data)
         else:
             raise ValueError(f"Unknown geometry type: {geom_type}")
 
@@ -110,6 +113,11 @@ class Point:
         self.is_3d = z is not None
         self.coords = np.array([x, y, z] if self.is_3d else [x, y])
     
+    def transform(self, matrix: np.ndarray) -> 'Point':
+        """Apply transformation matrix in place. Returns self."""
+        self.coords = _apply_matrix(self.coords[np.newaxis, :], matrix)[0]
+        return self
+    
     def __repr__(self) -> str:
         return f"Point({', '.join(map(str, self.coords))})"
 
@@ -134,31 +142,92 @@ class Line:
         # Ensure both points are same dimensionality
         if self.start.is_3d != self.end.is_3d:
             raise ValueError("Line endpoints must both be 2D or both be 3D")
+    
+    def transform(self, matrix: np.ndarray) -> 'Line':
+        """Apply transformation matrix to both endpoints. Returns self."""
+        start, end = _apply_matrix(np.vstack([self.start.coords, self.end.coords]), matrix)
+        self.start.coords, self.end.coords = start, end
+        return self
 
 
-@dataclass
+def _as_coord_array(data) -> np.ndarray:
+    """Return ``data`` as a contiguous float64 ``(N, 2)`` or ``(N, 3)`` array.
+
+    Arrays that already have the right dtype and layout are returned as-is,
+    so views into a larger buffer are wrapped without copying.
+    """
+    coords = np.ascontiguousarray(data, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError(f"Coordinates must have shape (N, 2) or (N, 3), got {coords.shape}")
+    return coords
+
+
+def _apply_matrix(coords: np.ndarray, matrix: np.ndarray, in_place: bool = False) -> np.ndarray:
+    """Apply ``matrix`` to a coordinate array with the batched Transform API."""
+    from .transform import Transform  # Local import: transform.py imports this module
+    return Transform.apply(coords, matrix, in_place=in_place)
+
+
+@dataclass(eq=False)
 class Path:
     """A collection of connected lines.
     
+    Vertices are held in a single coordinate array instead of a list of
+    ``Point`` objects. ``points`` materializes ``Point`` objects on demand.
+    
     Attributes:
-        points: List of points defining the path
+        coords: Numpy array of shape (N, 2) or (N, 3), one row per vertex
         closed: Whether the path forms a closed loop
         style: Dictionary containing style attributes
     """
-    points: List[Point]
+    coords: np.ndarray
     closed: bool = False
     style: dict = None
     
-    def __post_init__(self):
-        """Validate path and ensure style dictionary exists."""
-        if self.style is None:
-            self.style = {}
-        if len(self.points) < 2:
+    def __init__(self, points: Union[List[Point], np.ndarray], closed: bool = False, style: dict = None):
+        """Initialize a Path from a list of Points or an (N, 2)/(N, 3) coordinate array."""
+        if len(points) < 2:
             raise ValueError("Path must contain at least 2 points")
-        # Ensure all points are same dimensionality
-        is_3d = self.points[0].is_3d
-        if not all(p.is_3d == is_3d for p in self.points):
-            raise ValueError("All points in path must be same dimensionality")
+        if isinstance(points, np.ndarray):
+            self.coords = _as_coord_array(points)
+        else:
+            # Ensure all points are same dimensionality
+            is_3d = points[0].is_3d
+            if not all(p.is_3d == is_3d for p in points):
+                raise ValueError("All points in path must be same dimensionality")
+            self.coords = _as_coord_array([p.coords for p in points])
+        self.closed = closed
+        self.style = style if style is not None else {}
+    
+    @property
+    def points(self) -> List[Point]:
+        """Vertices as ``Point`` objects (built on each access)."""
+        return [Point(*row) for row in self.coords.tolist()]
+    
+    @points.setter
+    def points(self, points: List[Point]) -> None:
+        self.coords = _as_coord_array([p.coords for p in points])
+    
+    @property
+    def is_3d(self) -> bool:
+        return self.coords.shape[1] == 3
+    
+    def __len__(self) -> int:
+        return len(self.coords)
+    
+    def transform(self, matrix: np.ndarray) -> 'Path':
+        """Apply transformation matrix to all vertices. Returns self.
+        
+        Coordinates are updated in place only when this path owns a writable
+        buffer. A path viewing a shared buffer (e.g. from ``PathArray[i]``,
+        possibly cached or memory-mapped) gets a transformed copy instead,
+        so the buffer it views is never modified.
+        """
+        if self.coords.flags.owndata and self.coords.flags.writeable:
+            _apply_matrix(self.coords, matrix, in_place=True)
+        else:
+            self.coords = _apply_matrix(self.coords, matrix)
+        return self
 
 
 @dataclass
@@ -177,6 +246,16 @@ class Shape:
         self.path.closed = True
         if self.fill is None:
             self.fill = {}
+    
+    @property
+    def coords(self) -> np.ndarray:
+        """Boundary coordinates of the shape."""
+        return self.path.coords
+    
+    def transform(self, matrix: np.ndarray) -> 'Shape':
+        """Apply transformation matrix to the boundary. Returns self."""
+        self.path.transform(matrix)
+        return self
 
 
 @dataclass
@@ -184,10 +263,10 @@ class Group:
     """A collection of geometry objects that can be transformed together.
     
     Attributes:
-        elements: List of geometry objects (Points, Lines, Paths, Shapes, or other Groups)
+        elements: List of geometry objects (Points, Lines, Paths, Shapes, PathArrays or other Groups)
         transform: Optional transformation matrix
     """
-    elements: List[Union[Point, Line, Path, Shape, 'Group']]
+    elements: List[Union[Point, Line, Path, Shape, 'PathArray', 'Group']]
     transform: Optional[np.ndarray] = None
     
     def __post_init__(self):
@@ -195,10 +274,263 @@ class Group:
         if self.transform is None:
             # Create identity matrix of appropriate size based on first element
             first_elem = self.elements[0] if self.elements else None
-            is_3d = (isinstance(first_elem, Point) and first_elem.is_3d) or \
-                    (isinstance(first_elem, Line) and first_elem.start.is_3d) or \
-                    (isinstance(first_elem, Path) and first_elem.points[0].is_3d)
-            self.transform = np.eye(4 if is_3d else 3)
+            self.transform = np.eye(4 if _is_3d(first_elem) else 3)
+    
+    def compose(self, matrix: np.ndarray) -> 'Group':
+        """Pre-multiply ``matrix`` onto the group transform without touching elements.
+        
+        Returns self for method chaining.
+        """
+        from .transform import Transform
+        self.transform = Transform.matrix_for_dim(matrix, self.transform.shape[0] - 1) @ self.transform
+        return self
+    
+    def apply_transform(self) -> 'Group':
+        """Bake the group transform into its elements and reset it to identity.
+        
+        Each element is transformed with a single batched call.
+        Returns self for method chaining.
+        """
+        if not np.array_equal(self.transform, np.eye(len(self.transform))):
+            for elem in self.elements:
+                if isinstance(elem, Group):
+                    elem.compose(self.transform)
+                else:
+                    elem.transform(self.transform)
+            self.transform = np.eye(len(self.transform))
+        return self
+
+
+def _is_3d(elem) -> bool:
+    """Return True if a geometry element holds 3D coordinates."""
+    if isinstance(elem, Line):
+        return elem.start.is_3d
+    if isinstance(elem, Shape):
+        return elem.path.is_3d
+    if isinstance(elem, Group):
+        return elem.transform.shape == (4, 4)
+    return bool(getattr(elem, "is_3d", False))
+
+
+class PathArray:
+    """Columnar storage for many paths.
+    
+    All vertices live in one contiguous float64 buffer of shape (N, 2) or
+    (N, 3). Path ``i`` spans ``coords[offsets[i]:offsets[i + 1]]`` and has its
+    own ``closed`` flag. Large layers should be built as a PathArray rather
+    than as individual ``Path``/``Point`` objects.
+    
+    Attributes:
+        coords: Vertex buffer of shape (N, 2) or (N, 3)
+        offsets: int64 array of length ``len(self) + 1`` into ``coords``
+        closed: bool array with one flag per path
+        style: Dictionary containing style attributes shared by all paths
+    """
+    geometry_type = GeometryType.PATH_ARRAY
+    
+    def __init__(self, coords: np.ndarray, offsets: Optional[np.ndarray] = None,
+                 closed: Union[bool, np.ndarray] = False, style: dict = None):
+        self.coords = _as_coord_array(coords)
+        if offsets is None:
+            offsets = [0, len(self.coords)] if len(self.coords) else [0]
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        if self.offsets.ndim != 1 or len(self.offsets) == 0 or self.offsets[0] != 0:
+            raise ValueError("Offsets must be a 1D array starting at 0")
+        if self.offsets[-1] != len(self.coords):
+            raise ValueError("Last offset must equal the number of vertices")
+        if np.any(np.diff(self.offsets) < 0):
+            raise ValueError("Offsets must be non-decreasing")
+        self.closed = np.ascontiguousarray(
+            np.broadcast_to(np.asarray(closed, dtype=bool), (len(self.offsets) - 1,)))
+        self.style = style if style is not None else {}
+    
+    @classmethod
+    def empty(cls, dim: int = 2, style: dict = None) -> 'PathArray':
+        """Create a PathArray with no paths."""
+        return cls(np.empty((0, dim)), style=style)
+    
+    @classmethod
+    def from_arrays(cls, arrays: Iterable[np.ndarray], closed: Union[bool, Sequence[bool]] = False,
+                    style: dict = None) -> 'PathArray':
+        """Pack a sequence of (N_i, D) coordinate arrays into one buffer."""
+        arrays = [_as_coord_array(a) for a in arrays]
+        if not arrays:
+            return cls.empty(style=style)
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in arrays], out=offsets[1:])
+        return cls(np.concatenate(arrays), offsets, closed, style)
+    
+    @classmethod
+    def from_paths(cls, paths: Iterable[Path], style: dict = None) -> 'PathArray':
+        """Pack ``Path`` objects, keeping their closed flags."""
+        paths = list(paths)
+        return cls.from_arrays([p.coords for p in paths], [p.closed for p in paths], style)
+    
+    @classmethod
+    def concatenate(cls, arrays: Sequence['PathArray'], style: dict = None) -> 'PathArray':
+        """Join several PathArrays into one. Style defaults to the first array's."""
+        arrays = [a for a in arrays if len(a)]
+        if not arrays:
+            return cls.empty(style=style)
+        offsets = [arrays[0].offsets]
+        base = arrays[0].offsets[-1]
+        for a in arrays[1:]:
+            offsets.append(a.offsets[1:] + base)
+            base += a.offsets[-1]
+        return cls(np.concatenate([a.coords for a in arrays]),
+                   np.concatenate(offsets),
+                   np.concatenate([a.closed for a in arrays]),
+                   style if style is not None else dict(arrays[0].style))
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    @property
+    def n_vertices(self) -> int:
+        return len(self.coords)
+    
+    @property
+    def dim(self) -> int:
+        return self.coords.shape[1]
+    
+    @property
+    def is_3d(self) -> bool:
+        return self.dim == 3
+    
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of vertices in each path."""
+        return np.diff(self.offsets)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the coordinate, offset and flag buffers."""
+        return self.coords.nbytes + self.offsets.nbytes + self.closed.nbytes
+    
+    def path_coords(self, index: int) -> np.ndarray:
+        """Return a view of the vertices of path ``index``."""
+        return self.coords[self.offsets[index]:self.offsets[index + 1]]
+    
+    def __getitem__(self, index: int) -> Path:
+        """Wrap path ``index`` as a ``Path`` sharing this buffer."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PathArray index out of range")
+        return Path(self.path_coords(index), bool(self.closed[index]), self.style)
+    
+    def __iter__(self) -> Iterator[Path]:
+        for i in range(len(self)):
+            yield self[i]
+    
+    def iter_coords(self) -> Iterator[Tuple[np.ndarray, bool]]:
+        """Yield ``(coords_view, closed)`` for each path without creating Path objects."""
+        offsets = self.offsets.tolist()
+        closed = self.closed.tolist()
+        for i in range(len(closed)):
+            yield self.coords[offsets[i]:offsets[i + 1]], closed[i]
+    
+    def select(self, indices: np.ndarray) -> 'PathArray':
+        """Return a new PathArray holding the given paths, in the given order.
+        
+        ``indices`` may be an integer index array or a boolean mask.
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        counts = self.lengths[indices]
+        new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=new_offsets[1:])
+        vertex_index = np.repeat(self.offsets[indices] - new_offsets[:-1], counts)
+        vertex_index += np.arange(new_offsets[-1])
+        return PathArray(self.coords[vertex_index], new_offsets, self.closed[indices], dict(self.style))
+
+    def endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (first, last) vertex rows of every path. Paths must not be empty."""
+        return self.coords[self.offsets[:-1]], self.coords[self.offsets[1:] - 1]
+
+    def reverse(self, mask: Optional[np.ndarray] = None) -> 'PathArray':
+        """Return a new PathArray with the vertex order of the masked paths (default: all) reversed."""
+        flip = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        path_index = np.repeat(np.arange(len(self)), self.lengths)
+        vertex_index = np.arange(self.n_vertices)
+        flipped = flip[path_index]
+        owners = path_index[flipped]
+        vertex_index[flipped] = self.offsets[owners] + self.offsets[owners + 1] - 1 - vertex_index[flipped]
+        return PathArray(self.coords[vertex_index], self.offsets, self.closed, dict(self.style))
+
+    def transform(self, matrix: np.ndarray) -> 'PathArray':
+        """Apply transformation matrix to the whole buffer in one operation.
+        
+        Returns self for method chaining.
+        """
+        _apply_matrix(self.coords, matrix, in_place=True)
+        return self
+    
+    def transformed(self, matrix: np.ndarray) -> 'PathArray':
+        """Return a transformed copy, leaving this PathArray untouched."""
+        return PathArray(_apply_matrix(self.coords, matrix), self.offsets, self.closed, self.style)
+    
+    def to_open(self) -> 'PathArray':
+        """Return an equivalent PathArray with no closed flags.
+        
+        Closed paths get their first vertex repeated at the end, which is
+        what polyline renderers and plotter output need.
+        """
+        if not self.closed.any():
+            return self
+        closed_idx = np.flatnonzero(self.closed & (self.lengths > 0))
+        coords = np.insert(self.coords, self.offsets[closed_idx + 1], self.coords[self.offsets[closed_idx]], axis=0)
+        added = np.zeros(len(self) + 1, dtype=np.int64)
+        added[closed_idx + 1] = 1
+        return PathArray(coords, self.offsets + np.cumsum(added), False, self.style)
+    
+    def bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return (min, max) coordinate rows, or None if empty."""
+        if not self.n_vertices:
+            return None
+        return self.coords.min(axis=0), self.coords.max(axis=0)
+    
+    def copy(self) -> 'PathArray':
+        """Create a deep copy of this PathArray."""
+        return PathArray(self.coords.copy(), self.offsets.copy(), self.closed.copy(), copy.deepcopy(self.style))
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "type": self.geometry_type.name,
+            "dim": self.dim,
+            "coords": self.coords.tolist(),
+            "offsets": self.offsets.tolist(),
+            "closed": self.closed.tolist(),
+            "style": self.style
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PathArray':
+        """Create from dictionary."""
+        coords = np.asarray(data["coords"], dtype=np.float64).reshape(-1, data.get("dim", 2))
+        return cls(coords, data["offsets"], data["closed"], data.get("style"))
+    
+    def __repr__(self) -> str:
+        return f"PathArray({len(self)} paths, {self.n_vertices} vertices, {self.dim}D)"
+
+
+def _iter_path_arrays(obj) -> Iterator[PathArray]:
+    """Yield ``obj`` as one or more PathArrays."""
+    if isinstance(obj, PathArray):
+        yield obj
+    elif isinstance(obj, Path):
+        yield PathArray(obj.coords, closed=obj.closed, style=obj.style)
+    elif isinstance(obj, Shape):
+        yield PathArray(obj.path.coords, closed=True, style=obj.path.style)
+    elif isinstance(obj, Line):
+        yield PathArray(np.vstack([obj.start.coords, obj.end.coords]), style=obj.style)
+    elif isinstance(obj, Group):
+        is_identity = np.array_equal(obj.transform, np.eye(len(obj.transform)))
+        for elem in obj.elements:
+            for paths in _iter_path_arrays(elem):
+                yield paths if is_identity else paths.transformed(obj.transform)
 
 
 class GeometryCollection:
@@ -210,13 +542,78 @@ class GeometryCollection:
     def add(self, obj: GeometryObject) -> None:
         """Add an object to the collection."""
         self.objects.append(obj)
+    
+    def add_paths(self, arrays: Iterable[np.ndarray], closed: Union[bool, Sequence[bool]] = False,
+                  style: dict = None) -> PathArray:
+        """Pack coordinate arrays into a single PathArray and add it."""
+        paths = PathArray.from_arrays(arrays, closed, style)
+        self.add(paths)
+        return paths
+    
+    def extend(self, other: 'GeometryCollection') -> 'GeometryCollection':
+        """Append all objects of another collection (not copied). Returns self."""
+        self.objects.extend(other.objects)
+        return self
+    
+    @classmethod
+    def merge(cls, collections: Iterable['GeometryCollection']) -> 'GeometryCollection':
+        """Create a collection holding the objects of all given collections."""
+        merged = cls()
+        for collection in collections:
+            merged.extend(collection)
+        return merged
+    
+    def iter_path_arrays(self) -> Iterator[PathArray]:
+        """Yield contained geometry as PathArrays.
+        
+        PathArrays are yielded as-is; Lines, Paths and Shapes are packed
+        into small PathArrays and Groups are flattened. Points are skipped.
+        """
+        for obj in self.objects:
+            yield from _iter_path_arrays(obj)
+    
+    def to_path_array(self) -> PathArray:
+        """Flatten all contained paths into one PathArray."""
+        return PathArray.concatenate(list(self.iter_path_arrays()))
+    
+    @property
+    def n_vertices(self) -> int:
+        return sum(p.n_vertices for p in self.iter_path_arrays())
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the coordinate buffers of the contained geometry."""
+        return sum(p.nbytes for p in self.iter_path_arrays())
         
     def transform(self, matrix: np.ndarray) -> 'GeometryCollection':
-        """Apply transformation to all contained geometry."""
+        """Apply transformation to all contained geometry.
+        
+        PathArrays are transformed with one batched operation each; Groups
+        only have the matrix composed onto their own transform.
+        """
         for obj in self.objects:
-            obj.transform(matrix)
+            if isinstance(obj, Group):
+                obj.compose(matrix)
+            else:
+                obj.transform(matrix)
         return self
         
+    def transformed(self, matrix: np.ndarray) -> 'GeometryCollection':
+        """Return a transformed copy of this collection.
+        
+        PathArrays are written straight into new buffers, so the source
+        geometry is never copied and then transformed in a second pass.
+        """
+        new_collection = GeometryCollection()
+        for obj in self.objects:
+            if isinstance(obj, PathArray):
+                new_collection.add(obj.transformed(matrix))
+            elif isinstance(obj, Group):
+                new_collection.add(copy.deepcopy(obj).compose(matrix))
+            else:
+                new_collection.add(copy.deepcopy(obj).transform(matrix))
+        return new_collection
+    
     def copy(self) -> 'GeometryCollection':
         """Create a deep copy of this collection."""
         new_collection = GeometryCollection()
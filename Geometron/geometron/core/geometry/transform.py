@@ -1,5 +1,5 @@
 import numpy as np
-from typing import Tuple, Union
+from typing import List, Optional, Tuple, Union
 from .primitives import Point
 
 class Transform:
@@ -81,6 +81,102 @@ class Transform:
         """
         return np.diag([sx, sy, sz, 1.0])
     
+    @staticmethod
+    def compose(*matrices: np.ndarray) -> np.ndarray:
+        """Compose matrices so that the last one is applied first.
+        
+        Args:
+            *matrices: Matrices of equal size, e.g. compose(T, R, S)
+            
+        Returns:
+            The product T @ R @ S
+        """
+        result = matrices[0]
+        for matrix in matrices[1:]:
+            result = result @ matrix
+        return result
+    
+    @staticmethod
+    def matrix_for_dim(matrix: np.ndarray, dim: int) -> np.ndarray:
+        """Adapt a homogeneous matrix to coordinates of the given dimension.
+        
+        A 4x4 matrix applied to 2D coordinates drops its z row and column
+        (z is taken as 0). A 3x3 matrix applied to 3D coordinates passes z
+        through unchanged.
+        
+        Args:
+            matrix: 3x3 or 4x4 homogeneous transformation matrix
+            dim: Coordinate dimension (2 or 3)
+            
+        Returns:
+            (dim + 1) x (dim + 1) transformation matrix
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape == (dim + 1, dim + 1):
+            return matrix
+        idx = [0, 1, 3]
+        if matrix.shape == (4, 4) and dim == 2:
+            return matrix[np.ix_(idx, idx)]
+        if matrix.shape == (3, 3) and dim == 3:
+            expanded = np.eye(4)
+            expanded[np.ix_(idx, idx)] = matrix
+            return expanded
+        raise ValueError(f"Cannot apply a {matrix.shape} matrix to {dim}D coordinates")
+    
+    @staticmethod
+    def apply(coords: np.ndarray, matrix: np.ndarray, in_place: bool = False,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply a transformation matrix to a whole coordinate array.
+        
+        Args:
+            coords: (N, 2) or (N, 3) array of coordinates
+            matrix: Transformation matrix (3x3 for 2D or 4x4 for 3D, adapted otherwise)
+            in_place: Write the result back into ``coords``
+            out: Optional preallocated array for the result
+            
+        Returns:
+            Transformed (N, 2) or (N, 3) array. Non-affine matrices are
+            followed by a perspective divide.
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim != 2:
+            raise ValueError(f"Coordinates must have shape (N, 2) or (N, 3), got {coords.shape}")
+        dim = coords.shape[1]
+        matrix = Transform.matrix_for_dim(matrix, dim)
+        linear = matrix[:dim, :dim]
+        offset = matrix[:dim, dim]
+        projective = matrix[dim, dim] != 1.0 or np.any(matrix[dim, :dim])
+        if projective:
+            w = coords @ matrix[dim, :dim] + matrix[dim, dim]
+        
+        if in_place:
+            out = coords
+        if out is None:
+            out = coords @ linear.T
+        else:
+            np.matmul(coords, linear.T, out=out)
+        out += offset
+        
+        if projective:
+            out /= w[:, np.newaxis]
+        return out
+    
+    @staticmethod
+    def transform_points(points: List[Point], matrix: np.ndarray) -> List[Point]:
+        """Apply transformation matrix to a list of points in one batch.
+        
+        Args:
+            points: Points to transform (all 2D or all 3D)
+            matrix: Transformation matrix (3x3 for 2D or 4x4 for 3D)
+            
+        Returns:
+            Transformed points
+        """
+        if not points:
+            return []
+        coords = Transform.apply(np.array([p.coords for p in points]), matrix, in_place=True)
+        return [Point(*row) for row in coords.tolist()]
+    
     @staticmethod
     def transform_point(point: Point, matrix: np.ndarray) -> Point:
         """Apply transformation matrix to a point.
@@ -92,16 +188,5 @@ class Transform:
         Returns:
             Transformed point
         """
-        # Convert to homogeneous coordinates
-        coords = np.append(point.coords, 1.0)
-        
-        # Apply transformation
-        if matrix.shape == (3, 3):  # 2D transformation
-            coords = np.append(point.coords, 1.0)
-            transformed = matrix @ coords
-            new_coords = transformed[:-1] / transformed[-1]
-        else:  # 3D transformation
-            transformed = matrix @ coords
-            new_coords = transformed[:-1] / transformed[-1]
-            
-        return Point(*new_coords) 
\ No newline at end of file
+        new_coords = Transform.apply(point.coords[np.newaxis, :], matrix)[0]
+        return Point(*new_coords)
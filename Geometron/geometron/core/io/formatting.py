@@ -0,0 +1,72 @@
+"""
+Fast fixed-point number formatting for text export backends.
+
+Exporters snap coordinates to integers in units of ``10 ** -precision``
+and format whole batches of them with a single %-format call. Up to
+``MAX_TRIMMED_PRECISION`` decimals each number is split into sign, integer
+part and decimal part (looked up in a table, trailing zeros removed), so
+no float formatting is involved.
+"""
+
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+import numpy as np
+
+BATCH_VERTICES = 1 << 16  # Vertices formatted per write
+MAX_TRIMMED_PRECISION = 4  # Above this, numbers are written with all their decimals
+
+_SIGNS = np.array(["", "-"], dtype=object)
+
+
+@lru_cache(maxsize=None)
+def _fraction_table(precision: int) -> np.ndarray:
+    """Decimal part, without trailing zeros, of every fixed-point fraction: 500 -> ".5"."""
+    return np.array([""] + ["." + f"{f:0{precision}d}".rstrip("0") for f in range(1, 10 ** precision)],
+                    dtype=object)
+
+
+def number_format(precision: int) -> str:
+    """%-format of one number, matching the arguments produced by ``number_values``."""
+    return "%s%d%s" if precision <= MAX_TRIMMED_PRECISION else f"%.{precision}f"
+
+
+def number_values(fixed: np.ndarray, precision: int) -> list:
+    """Flat %-format arguments for fixed-point integers, in row-major order.
+
+    Args:
+        fixed: Integer array of values in units of ``10 ** -precision``
+        precision: Decimal places
+    """
+    scale = 10 ** precision
+    if precision > MAX_TRIMMED_PRECISION:
+        return (fixed / scale).ravel().tolist()
+    magnitude = np.abs(fixed)
+    parts = np.empty(fixed.shape + (3,), dtype=object)
+    parts[..., 0] = _SIGNS[(fixed < 0).view(np.int8)]
+    parts[..., 1] = magnitude // scale
+    parts[..., 2] = _fraction_table(precision)[magnitude % scale]
+    return parts.ravel().tolist()
+
+
+def step_decimals(step: float, max_decimals: int = 6) -> int:
+    """Number of decimals needed to write multiples of ``step`` exactly (capped)."""
+    for decimals in range(max_decimals + 1):
+        scaled = step * 10 ** decimals
+        if abs(scaled - round(scaled)) < 1e-9 * max(1.0, scaled):
+            return decimals
+    return max_decimals
+
+
+def batch_ranges(offsets: np.ndarray, batch_vertices: int = BATCH_VERTICES) -> Iterator[Tuple[int, int]]:
+    """Split paths into ``(first, last)`` index ranges of about ``batch_vertices`` vertices.
+
+    Ranges hold whole paths, at least one each.
+    """
+    n_paths = len(offsets) - 1
+    first = 0
+    while first < n_paths:
+        last = int(np.searchsorted(offsets, offsets[first] + batch_vertices, side="right")) - 1
+        last = min(max(last, first + 1), n_paths)
+        yield first, last
+        first = last
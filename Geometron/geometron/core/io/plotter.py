@@ -0,0 +1,259 @@
+"""
+G-code and HPGL export for the Geometron application.
+
+Plotter backends stream pen-up travel, pen-down drawing and pen changes
+for the visible layers straight to a file handle, one batch of vertices
+at a time, so large jobs start writing immediately and never need the
+whole program in memory.
+
+Coordinates stay in canvas orientation (y up, origin bottom-left), which
+is what both G-code machines and HPGL plotters expect. They are scaled to
+machine units and snapped to the machine step; consecutive vertices that
+land on the same step are dropped.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from ..geometry.primitives import PathArray
+from ..layer import Layer
+from ..plotting.pipeline import PlotPipeline
+from .formatting import BATCH_VERTICES, batch_ranges, number_format, number_values, step_decimals
+from .svg import layer_path_arrays
+
+
+def quantize_paths(paths: PathArray, scale: float, step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Scale paths to machine units and snap them to multiples of ``step``.
+
+    Closed paths get their closing vertex. Paths with fewer than two vertices
+    are dropped; paths that collapse to a single step keep one vertex.
+
+    Returns:
+        (steps, offsets): (N, 2) integer coordinates in steps and path offsets
+    """
+    paths = paths.select(paths.lengths >= 2).to_open()
+    steps = np.round(paths.coords[:, :2] * (scale / step)).astype(np.int64)
+    keep = np.ones(len(steps), dtype=bool)
+    keep[1:] = (steps[1:] != steps[:-1]).any(axis=1)
+    keep[paths.offsets[:-1]] = True  # Every path keeps its first vertex
+    kept = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    return steps[keep], kept[paths.offsets]
+
+
+def assign_pens(layers: Iterable[Layer]) -> Dict[str, int]:
+    """Number pens from 1 by distinct (color, weight), in layer order.
+
+    Returns:
+        Layer id -> pen number
+    """
+    pens: Dict[Tuple, int] = {}
+    assignment = {}
+    for layer in layers:
+        key = (tuple(layer.line_color), layer.line_weight)
+        assignment[layer.id] = pens.setdefault(key, len(pens) + 1)
+    return assignment
+
+
+class PlotterWriter(ABC):
+    """Base class for streaming plotter backends.
+
+    Subclasses supply the command templates; the base class handles
+    quantization, batching and pen changes.
+
+    Args:
+        fh: Text file handle to write to
+        scale: Machine units per canvas unit
+        step: Machine step in machine units; coordinates are multiples of it
+    """
+
+    extensions: Tuple[str, ...] = ()
+
+    def __init__(self, fh: TextIO, scale: float = 1.0, step: float = 0.01):
+        if step <= 0:
+            raise ValueError("Machine step must be positive")
+        self.fh = fh
+        self.scale = scale
+        self.step = step
+        self.decimals = step_decimals(step)
+        self.pen: Optional[int] = None  # Currently selected pen
+        self._step_fixed = int(round(step * 10 ** self.decimals))  # Step in units of 10 ** -decimals
+        self._templates: Dict[int, str] = {}
+
+    @property
+    def coordinate_format(self) -> str:
+        """%-format of one coordinate number."""
+        return number_format(self.decimals)
+
+    def begin(self, width: float, height: float):
+        """Write the program header."""
+        pass
+
+    def end(self):
+        """Write the program footer."""
+        pass
+
+    @abstractmethod
+    def select_pen(self, pen: int, label: str = ""):
+        """Write a pen change to ``pen``."""
+        pass
+
+    @abstractmethod
+    def path_template(self, n: int) -> str:
+        """%-format template drawing one path of ``n`` vertices, taking 2n coordinates."""
+        pass
+
+    def write_paths(self, paths: PathArray, batch_vertices: int = BATCH_VERTICES) -> int:
+        """Write paths as travel + draw moves. Returns the number of paths written."""
+        steps, offsets = quantize_paths(paths, self.scale, self.step)
+        lengths = np.diff(offsets).tolist()
+        for first, last in batch_ranges(offsets, batch_vertices):
+            template = "".join(self._templates.get(n) or self._templates.setdefault(n, self.path_template(n))
+                               for n in lengths[first:last])
+            fixed = steps[offsets[first]:offsets[last]] * self._step_fixed
+            self.fh.write(template % tuple(number_values(fixed, self.decimals)))
+        return len(lengths)
+
+
+class GcodeWriter(PlotterWriter):
+    """G-code backend for pen plotters driven by CNC firmware (e.g. GRBL).
+
+    Args:
+        fh: Text file handle to write to
+        scale: Millimetres per canvas unit
+        step: Machine step in millimetres
+        feed_rate: Drawing feed rate (mm/min)
+        travel_rate: Pen-up feed rate (mm/min); None uses rapid G0 moves
+        pen_up: Command(s) lifting the pen
+        pen_down: Command(s) lowering the pen
+        pen_change: Command(s) for a pen change; ``{pen}`` and ``{label}`` are filled in
+    """
+
+    extensions = (".gcode", ".nc", ".ngc", ".gc")
+
+    def __init__(self, fh: TextIO, scale: float = 1.0, step: float = 0.01, feed_rate: float = 3000.0,
+                 travel_rate: Optional[float] = None, pen_up: str = "G0 Z5", pen_down: str = "G1 Z0 F1000",
+                 pen_change: str = "M0 ; Change to pen {pen} ({label})"):
+        super().__init__(fh, scale, step)
+        self.feed_rate = feed_rate
+        self.travel_rate = travel_rate
+        self.pen_up = pen_up
+        self.pen_down = pen_down
+        self.pen_change = pen_change
+
+    def begin(self, width: float, height: float):
+        self.fh.write(f"; Geometron plot {width * self.scale:g} x {height * self.scale:g} mm\n"
+                      "G21\nG90\n")
+
+    def end(self):
+        self.fh.write("G0 X0 Y0\nM2\n")  # Every path already ends with the pen up
+
+    def select_pen(self, pen: int, label: str = ""):
+        self.fh.write(f"{self.pen_up}\n{self.pen_change.format(pen=pen, label=label)}\n")
+        self.pen = pen
+
+    def path_template(self, n: int) -> str:
+        xy = f"X{self.coordinate_format} Y{self.coordinate_format}"
+        travel = f"G0 {xy}" if self.travel_rate is None else f"G1 {xy} F{self.travel_rate:g}"
+        pen_up, pen_down = self.pen_up.replace("%", "%%"), self.pen_down.replace("%", "%%")
+        if n == 1:
+            return f"{travel}\n{pen_down}\n{pen_up}\n"
+        return (f"{travel}\n{pen_down}\nG1 {xy} F{self.feed_rate:g}\n"
+                + f"G1 {xy}\n" * (n - 2) + f"{pen_up}\n")
+
+
+class HpglWriter(PlotterWriter):
+    """HPGL backend for pen plotters.
+
+    Args:
+        fh: Text file handle to write to
+        scale: Plotter units per canvas unit (40 for canvas units in millimetres)
+        step: Machine step in plotter units (HPGL coordinates are integers)
+        velocity: Pen speed in cm/s (VS); None keeps the plotter default
+    """
+
+    extensions = (".hpgl", ".hpg", ".plt")
+
+    def __init__(self, fh: TextIO, scale: float = 40.0, step: float = 1.0, velocity: Optional[float] = None):
+        if step != int(step):
+            raise ValueError("HPGL coordinates are integers; the step must be a whole number of plotter units")
+        super().__init__(fh, scale, step)
+        self.velocity = velocity
+
+    def begin(self, width: float, height: float):
+        self.fh.write("IN;\n")
+        if self.velocity is not None:
+            self.fh.write(f"VS{self.velocity:g};\n")
+
+    def end(self):
+        self.fh.write("PU;\nSP0;\n")
+
+    def select_pen(self, pen: int, label: str = ""):
+        self.fh.write(f"PU;\nSP{pen};\n")
+        self.pen = pen
+
+    def path_template(self, n: int) -> str:
+        xy = f"{self.coordinate_format},{self.coordinate_format}"
+        if n == 1:
+            return f"PU{xy};PD;PU;\n"
+        return f"PU{xy};PD{xy}{(',' + xy) * (n - 2)};\n"
+
+
+WRITERS = {"gcode": GcodeWriter, "hpgl": HpglWriter}
+
+
+def format_for_path(path: str) -> Optional[str]:
+    """Return the plotter format implied by a file extension, or None."""
+    lower = path.lower()
+    for name, writer in WRITERS.items():
+        if lower.endswith(writer.extensions):
+            return name
+    return None
+
+
+def export_plot(layers: Iterable[Layer], writer: PlotterWriter, width: float, height: float,
+                pipeline: Optional[PlotPipeline] = None, pens: Optional[Dict[str, int]] = None) -> int:
+    """Stream visible layers through a plotter backend.
+
+    Args:
+        layers: Layers in plotting order; hidden layers are skipped
+        writer: Backend wrapping the output file handle
+        width: Canvas width in canvas units
+        height: Canvas height in canvas units
+        pipeline: Optional export pipeline run on each layer (in canvas coordinates)
+        pens: Layer id -> pen number (default: ``assign_pens``)
+
+    Returns:
+        Number of paths written
+    """
+    visible: List[Layer] = [layer for layer in layers if layer.visible]
+    pens = pens or assign_pens(visible)
+    writer.begin(width, height)
+    count = 0
+    for layer in visible:
+        pen = pens.get(layer.id, writer.pen or 1)
+        if pen != writer.pen:
+            writer.select_pen(pen, layer.name)
+        for paths in layer_path_arrays(layer, None, pipeline):
+            count += writer.write_paths(paths)
+    writer.end()
+    return count
+
+
+def export_pen_plot(buckets: Iterable, writer: PlotterWriter, width: float, height: float) -> int:
+    """Write pen buckets (see ``plotting.pens``), changing pen once per bucket.
+
+    Bucket paths must be in canvas coordinates.
+
+    Returns:
+        Number of paths written
+    """
+    writer.begin(width, height)
+    count = 0
+    for bucket in buckets:
+        writer.select_pen(bucket.pen, bucket.label)
+        count += writer.write_paths(bucket.paths)
+    writer.end()
+    return count
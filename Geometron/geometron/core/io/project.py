@@ -0,0 +1,40 @@
+"""
+Project file loading and saving for the Geometron application.
+
+Projects are JSON documents in the ``LayerManager.as_dict`` format, optionally
+with a ``canvas`` section giving the drawing size.
+"""
+
+import json
+from typing import Any, Dict, Tuple
+
+from ..algorithms.registry import AlgorithmRegistry
+from ..layer import LayerManager
+
+DEFAULT_CANVAS_SIZE = (800, 600) # Matches the CanvasWidget defaults
+
+
+def read_project(path: str) -> Dict[str, Any]:
+    """Read a project JSON file into a dictionary."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_project(data: Dict[str, Any], registry: AlgorithmRegistry | None = None) -> LayerManager:
+    """Create a LayerManager from project data."""
+    return LayerManager.from_dict(data, registry or AlgorithmRegistry())
+
+
+def canvas_size(data: Dict[str, Any]) -> Tuple[float, float]:
+    """Return (width, height) from a project's canvas section, or the defaults."""
+    canvas = data.get("canvas", {})
+    return (canvas.get("width", DEFAULT_CANVAS_SIZE[0]), canvas.get("height", DEFAULT_CANVAS_SIZE[1]))
+
+
+def save_project(path: str, layer_manager: LayerManager, width: float | None = None, height: float | None = None):
+    """Write a LayerManager (and optionally the canvas size) to a project JSON file."""
+    data = layer_manager.as_dict()
+    if width is not None and height is not None:
+        data["canvas"] = {"width": width, "height": height}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,193 @@
+"""
+SVG export for the Geometron application.
+
+Layers are written as ``<g>`` groups of ``<path>`` elements, one path per
+polyline, directly to a file handle. Geometry is pulled from each layer
+chunk by chunk, so streaming algorithms are never held in memory whole,
+unless an export pipeline needs the whole layer at once.
+
+Path data is formatted a batch of vertices at a time straight from the
+coordinate arrays. Coordinates are snapped to the output precision before
+relative offsets are taken, so relative paths do not accumulate rounding
+error. Files ending in ``.svgz`` are gzip-compressed on the fly.
+"""
+
+import gzip
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from ..geometry.primitives import PathArray
+from ..geometry.transform import Transform
+from ..layer import Layer
+from ..plotting.pipeline import PlotPipeline
+from .formatting import BATCH_VERTICES, batch_ranges, number_format, number_values
+
+
+def rgb_hex(color) -> str:
+    """Format an (r, g, b) tuple as #rrggbb."""
+    r, g, b = (int(c) for c in color[:3])
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _path_template(n: int, closed: bool, precision: int, relative: bool) -> str:
+    """%-format template of one ``<path>`` element with ``n`` vertices."""
+    number = number_format(precision)
+    xy = f"{number},{number}"
+    command = "l" if relative else "L"
+    return f'    <path d="M{xy}{command}{xy}{(" " + xy) * (n - 2)}{"z" if closed else ""}"/>\n'
+
+
+def path_elements(paths: PathArray, precision: int = 3, relative: bool = True,
+                  batch_vertices: int = BATCH_VERTICES) -> Iterator[str]:
+    """Yield ``<path>`` elements for ``paths`` as text blocks of bounded size.
+
+    Paths with fewer than two vertices are skipped.
+
+    Args:
+        paths: Paths in SVG coordinates
+        precision: Decimal places for coordinates
+        relative: Use relative ``l`` commands after the initial ``M``
+        batch_vertices: Approximate number of vertices per yielded block
+    """
+    drawable = paths.lengths >= 2
+    if not drawable.all():
+        paths = paths.select(drawable)
+    if not len(paths):
+        return
+    scale = 10.0 ** precision
+    templates: Dict[Tuple[int, bool], str] = {}
+    lengths = paths.lengths.tolist()
+    closed = paths.closed.tolist()
+    offsets = paths.offsets
+    for first, last in batch_ranges(offsets, batch_vertices):
+        begin, end = offsets[first], offsets[last]
+        snapped = np.round(paths.coords[begin:end, :2] * scale).astype(np.int64)
+        if relative:
+            starts = offsets[first:last] - begin
+            values = snapped.copy()
+            values[1:] -= snapped[:-1]
+            values[starts] = snapped[starts]
+        else:
+            values = snapped
+        template = "".join(templates.get(key) or templates.setdefault(
+                               key, _path_template(key[0], key[1], precision, relative))
+                           for key in zip(lengths[first:last], closed[first:last]))
+        yield template % tuple(number_values(values, precision))
+
+
+def path_data(coords: np.ndarray, closed: bool = False, precision: int = 3, relative: bool = True) -> str:
+    """Build the ``d`` attribute of an SVG path from an (N, 2) coordinate array."""
+    element = "".join(path_elements(PathArray.from_arrays([coords], [closed]), precision, relative))
+    return element[element.index('d="') + 3:element.rindex('"')] if element else ""
+
+
+def open_svg(path: str, compress: Optional[bool] = None) -> TextIO:
+    """Open ``path`` for writing an SVG document.
+
+    Args:
+        path: Output file
+        compress: Write gzip-compressed SVGZ; by default only if ``path`` ends in ``.svgz``
+    """
+    if compress is None:
+        compress = path.lower().endswith(".svgz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    return open(path, "w", encoding="utf-8")
+
+
+def flip_y_matrix(height: float) -> np.ndarray:
+    """Map canvas coordinates (y up) to SVG coordinates (y down)."""
+    return Transform.compose(Transform.translation_matrix(0, height), Transform.scale_matrix(1, -1))
+
+
+def layer_path_arrays(layer: Layer, height: Optional[float],
+                      pipeline: Optional[PlotPipeline] = None) -> Iterator[PathArray]:
+    """Yield a layer's paths in SVG coordinates, run through ``pipeline`` if given.
+
+    With ``height=None`` paths stay in canvas coordinates (y up), as used by
+    plotter backends. Pipeline stages see the whole layer as one PathArray,
+    so the layer is gathered in memory first.
+    """
+    arrays = (paths for chunk in layer.iter_geometry_chunks() for paths in chunk.iter_path_arrays())
+    if height is not None:
+        flip = flip_y_matrix(height)
+        arrays = (paths.transformed(flip) for paths in arrays)
+    if pipeline:
+        yield pipeline.run(PathArray.concatenate(list(arrays)), layer.name, layer)
+    else:
+        yield from arrays
+
+
+def write_group(fh: TextIO, group_id: str, label: str, color, weight: float, arrays: Iterable[PathArray],
+                precision: int = 3, relative: bool = True) -> int:
+    """Write paths as an Inkscape layer group. Returns the number of paths written."""
+    style = f"fill:none;stroke:{rgb_hex(color)};stroke-width:{weight}"
+    fh.write(f'  <g id="{group_id}" inkscape:groupmode="layer" inkscape:label={quoteattr(label)} '
+             f'style="{style}">\n')
+    count = 0
+    for paths in arrays:
+        for block in path_elements(paths, precision, relative):
+            fh.write(block)
+        count += int(np.count_nonzero(paths.lengths >= 2))
+    fh.write("  </g>\n")
+    return count
+
+
+def write_layer(fh: TextIO, layer: Layer, height: float, precision: int = 3,
+                pipeline: Optional[PlotPipeline] = None, relative: bool = True) -> int:
+    """Write one layer as an SVG group. Returns the number of paths written."""
+    return write_group(fh, f"layer_{layer.id}", layer.name, layer.line_color, layer.line_weight,
+                       layer_path_arrays(layer, height, pipeline), precision, relative)
+
+
+def write_header(fh: TextIO, width: float, height: float):
+    """Write the XML declaration and the opening ``<svg>`` tag."""
+    fh.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+    fh.write(f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+             'xmlns="http://www.w3.org/2000/svg" '
+             'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">\n')
+
+
+def export_svg(layers: Iterable[Layer], fh: TextIO, width: float, height: float, precision: int = 3,
+               pipeline: Optional[PlotPipeline] = None, relative: bool = True) -> int:
+    """Write visible layers to ``fh`` as an SVG document.
+
+    Args:
+        layers: Layers in bottom-to-top order; hidden layers are skipped
+        fh: Text file handle to write to
+        width: Canvas width in user units
+        height: Canvas height in user units
+        precision: Decimal places for coordinates
+        pipeline: Optional export pipeline run on each layer (in SVG coordinates)
+        relative: Write relative path commands (smaller files)
+
+    Returns:
+        Number of paths written
+    """
+    write_header(fh, width, height)
+    count = 0
+    for layer in layers:
+        if layer.visible:
+            count += write_layer(fh, layer, height, precision, pipeline, relative)
+    fh.write("</svg>\n")
+    return count
+
+
+def export_pen_svg(buckets: Iterable, fh: TextIO, width: float, height: float, precision: int = 3,
+                   relative: bool = True) -> int:
+    """Write pen buckets (see ``plotting.pens``) as one Inkscape layer group per pen.
+
+    Bucket paths must already be in SVG coordinates.
+
+    Returns:
+        Number of paths written
+    """
+    write_header(fh, width, height)
+    count = 0
+    for bucket in buckets:
+        count += write_group(fh, f"pen_{bucket.pen}", bucket.label, bucket.color, bucket.weight,
+                             [bucket.paths], precision, relative)
+    fh.write("</svg>\n")
+    return count
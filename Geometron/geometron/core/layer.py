@@ -1,13 +1,15 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import numpy as np
-from .geometry.primitives import Group
+from .geometry.primitives import Group, GeometryCollection
 from .geometry.transform import Transform
+from .geometry.cache import GeometryCache, get_shared_cache
 import uuid
 import math
-from PyQt6.QtCore import QObject, pyqtSignal
-from .algorithms.base import AlgorithmBase, AlgorithmParameter
+from .signals import Signal
+from .algorithms.base import AlgorithmBase, AlgorithmParameter, LOD_FULL, LOD_PREVIEW
 from .algorithms.registry import AlgorithmRegistry
+from .scheduler import GenerationScheduler, UpdateCoalescer
 
 # Basic placeholder for geometry data or vectors if needed later
 class Vector2D:
@@ -42,10 +44,19 @@ class Layer:
         # Styling properties
         self.line_color = (0, 0, 0)  # RGB tuple (0-255)
         self.line_weight = 1.0
+        self.simplify_tolerance = 0.0  # Export simplification in output units (0 = off)
         
-        # Cache - Placeholder for now
+        # Algorithm output, regenerated only when parameters change
         self.geometry_cache = None
-        self.needs_update = True
+        self.geometry_lod = None # Level of detail of geometry_cache
+        self._geometry_key = None # Cache key of geometry_cache
+        self.needs_update = True # Full-resolution output is out of date
+        self.partial_geometry = None # Chunks streamed so far by a running job
+        self._partial_key = None
+        # Algorithm output placed by position/scale/rotation, redone on transform changes
+        self._placed_cache = None
+        self._placed_source = None
+        self._placed_key = None
         
     def set_parameter(self, param_name: str, value: Any):
         """Set a parameter value and mark layer for update."""
@@ -57,40 +68,164 @@ class Layer:
         else:
              print(f"Warning: Parameter '{param_name}' not found for layer '{self.name}'")
              
+    def get_lod_parameters(self, lod: str = LOD_FULL) -> Dict[str, Any]:
+        """Parameters to generate with at the given level of detail."""
+        return self.algorithm.parameters_for_lod(self.parameters, lod)
+
+    def has_preview_lod(self) -> bool:
+        """Return True if preview generation would differ from full resolution."""
+        return bool(self.algorithm) and self.get_lod_parameters(LOD_PREVIEW) != self.parameters
+
+    def get_cache_key(self, lod: str = LOD_FULL):
+        """Key identifying this layer's algorithm output in the geometry cache.
+        
+        Preview and full resolution only share a key when their effective
+        parameters are identical, so each level is cached separately.
+        """
+        return GeometryCache.make_key(self.algorithm.get_name(), self.algorithm.get_version(),
+                                      self.get_lod_parameters(lod))
+
+    def _install_geometry(self, geometry, key, lod: str):
+        """Make ``geometry`` the layer's algorithm output."""
+        if lod != LOD_FULL and key == self.get_cache_key(LOD_FULL):
+            lod = LOD_FULL # Preview limits did not apply
+        self.geometry_cache = geometry
+        self.geometry_lod = lod
+        self._geometry_key = key
+        self.partial_geometry = None
+        self._partial_key = None
+        if lod == LOD_FULL:
+            self.needs_update = False
+
+    def load_cached_geometry(self, lod: str = LOD_FULL) -> bool:
+        """Install algorithm output for ``lod`` from the shared cache if it is there.
+        
+        Returns True if the layer's output is current at that level of detail.
+        Current full-resolution output satisfies any level.
+        """
+        if not self.algorithm:
+            self.geometry_cache = None
+            self.needs_update = False
+            return True
+        if not self.needs_update:
+            return True
+        key = self.get_cache_key(lod)
+        if self._geometry_key == key:
+            return True
+        cached = get_shared_cache().get(key)
+        if cached is None:
+            return False
+        self._install_geometry(cached, key, lod)
+        return True
+
+    def set_generated_geometry(self, geometry, key, lod: str = LOD_FULL, background=None) -> bool:
+        """Install geometry generated elsewhere (e.g. a background worker).
+        
+        The result is always added to the shared cache, but only replaces the
+        layer's output if ``key`` still matches the current parameters.
+        ``background`` runs the disk-cache write (see ``GeometryCache.put``).
+        """
+        if geometry is not None:
+            get_shared_cache().put(key, geometry, background)
+        if not self.algorithm or key != self.get_cache_key(lod):
+            return False
+        self._install_geometry(geometry, key, lod)
+        return True
+
+    def add_partial_geometry(self, chunk, key, lod: str = LOD_FULL) -> bool:
+        """Append a streamed chunk to the partial output shown while generating.
+        
+        Chunks for parameters that are no longer current are ignored.
+        """
+        if not self.algorithm or key != self.get_cache_key(lod):
+            return False
+        if self._partial_key != key:
+            self.partial_geometry = GeometryCollection()
+            self._partial_key = key
+        # New collection each time so placed output is recomputed for it
+        self.partial_geometry = GeometryCollection.merge([self.partial_geometry, chunk])
+        return True
+
     def update_geometry(self):
         """Regenerate geometry if needed."""
+        if self.load_cached_geometry():
+            return
         if self.needs_update and self.algorithm:
+            cache = get_shared_cache()
+            key = self.get_cache_key()
             try:
-                self.geometry_cache = self.algorithm.generate_geometry(self.parameters)
-                self.needs_update = False
+                geometry = self.algorithm.generate_geometry(self.parameters)
+                self._install_geometry(geometry, key, LOD_FULL)
+                if geometry is not None:
+                    cache.put(key, geometry)
                 print(f"Layer '{self.name}' geometry updated.")
             except Exception as e:
                  print(f"Error generating geometry for layer '{self.name}': {e}")
                  self.geometry_cache = None # Ensure cache is cleared on error
                  # Keep needs_update True so it retries later?
-        elif not self.algorithm:
-             self.geometry_cache = None
-             self.needs_update = False # Nothing to update
 
-    def get_geometry(self):
-        """Get the transformed geometry of this layer."""
-        self.update_geometry() # Ensure cache is up-to-date
+    def get_transform_matrix(self) -> np.ndarray:
+        """Compose position, rotation and scale into a 3x3 affine matrix.
         
-        if self.geometry_cache:
-            # TODO: Implement actual geometry transformation
-            # Create a copy of the geometry
-            # transformed = self.geometry_cache.copy()
-            
-            # Apply transformations (using matrix math eventually)
-            # transform_matrix = Matrix.identity()
-            # transform_matrix.translate(self.position.x, self.position.y)
-            # transform_matrix.rotate(math.radians(self.rotation))
-            # transform_matrix.scale(self.scale.x, self.scale.y)
-            # transformed.transform(transform_matrix)
-            # return transformed
-            return self.geometry_cache # Return untransformed for now
+        Scale is applied first, then rotation, then translation.
+        """
+        matrix = Transform.compose(
+            Transform.translation_matrix(self.position.x, self.position.y),
+            Transform.rotation_matrix_3d(math.radians(self.rotation), 'z'),
+            Transform.scale_matrix(self.scale.x, self.scale.y)
+        )
+        return Transform.matrix_for_dim(matrix, 2)
+
+    def get_geometry(self, generate: bool = True):
+        """Get the transformed geometry of this layer.
+        
+        The algorithm only reruns when parameters changed. Transform changes
+        just re-place the cached algorithm output with one batched transform.
+        With ``generate=False`` the last available output is used as-is, which
+        is what the UI does while a background job is pending.
+        """
+        if generate:
+            self.update_geometry() # Ensure cache is up-to-date
+        
+        source = self.geometry_cache
+        if not generate and self.partial_geometry is not None:
+            source = self.partial_geometry # Show streamed chunks while generating
+        if source is None:
+            return None
             
-        return None
+        placement = self._placement()
+        if placement is None:
+            return source
+        if self._placed_source is not source or self._placed_key != placement:
+            self._placed_cache = source.transformed(self.get_transform_matrix())
+            self._placed_source = source
+            self._placed_key = placement
+        return self._placed_cache
+
+    def _placement(self):
+        """Transform properties as a tuple, or None for the identity transform."""
+        placement = (self.position.x, self.position.y, self.scale.x, self.scale.y, self.rotation)
+        return None if placement == (0, 0, 1, 1, 0) else placement
+
+    def iter_geometry_chunks(self, lod: str = LOD_FULL) -> Iterator[GeometryCollection]:
+        """Yield the layer's transformed geometry in chunks, for export.
+        
+        Cached output is yielded in one piece. Otherwise streaming algorithms
+        are run chunk by chunk and each placed chunk is yielded and then
+        dropped, so huge layers are never held in memory as a whole.
+        """
+        if not self.algorithm:
+            return
+        if self.load_cached_geometry(lod) or not self.algorithm.supports_streaming():
+            if lod == LOD_FULL:
+                self.update_geometry()
+            geometry = self.get_geometry(generate=False)
+            if geometry is not None:
+                yield geometry
+            return
+        matrix = None if self._placement() is None else self.get_transform_matrix()
+        for chunk in self.algorithm.generate_chunks(self.get_lod_parameters(lod)):
+            yield chunk if matrix is None else chunk.transformed(matrix)
 
     def as_dict(self):
         """Convert layer to dictionary for serialization."""
@@ -105,7 +240,8 @@ class Layer:
             "scale": [self.scale.x, self.scale.y],
             "rotation": self.rotation,
             "line_color": list(self.line_color),
-            "line_weight": self.line_weight
+            "line_weight": self.line_weight,
+            "simplify_tolerance": self.simplify_tolerance
         }
 
     @classmethod
@@ -137,6 +273,7 @@ class Layer:
         
         layer.line_color = tuple(data.get("line_color", [0, 0, 0]))
         layer.line_weight = data.get("line_weight", 1.0)
+        layer.simplify_tolerance = data.get("simplify_tolerance", 0.0)
         
         # Set parameters *after* creating layer with defaults
         layer.parameters = data.get("parameters", {}) 
@@ -147,7 +284,7 @@ class Layer:
 # --- End Reinstated Layer Class --- 
 
 # --- LayerManager remains the same --- 
-class LayerManager(QObject):
+class LayerManager:
     """Manages a collection of layers and their ordering.
     
     Attributes:
@@ -156,16 +293,18 @@ class LayerManager(QObject):
     """
 
     # --- Define Signals as Class Attributes --- #
-    layers_changed = pyqtSignal() # Emitted when layers are added, removed, or reordered
-    active_layer_changed = pyqtSignal(object) # Emitted with the new active Layer object (or None)
-    layer_updated = pyqtSignal(object) # Emitted with the updated Layer object
+    layers_changed = Signal() # Emitted when layers are added, removed, or reordered
+    active_layer_changed = Signal(object) # Emitted with the new active Layer object (or None)
+    layer_updated = Signal(object) # Emitted with the updated Layer object
     # --- End Signal Definitions --- #
 
-    def __init__(self, algorithm_registry: AlgorithmRegistry):
-        super().__init__()
+    def __init__(self, algorithm_registry: AlgorithmRegistry, scheduler: GenerationScheduler | None = None):
         self.layers: List[Layer] = []
         self._active_layer_index = -1
         self.algorithm_registry = algorithm_registry # Store registry
+        self.scheduler = scheduler or GenerationScheduler() # Runs algorithms off the UI thread
+        self.coalescer = UpdateCoalescer() # Merges bursts of parameter edits per layer
+        self.idle_coalescer = UpdateCoalescer(latency=0.4, max_latency=float('inf')) # Upgrades previews when idle
     
     @property
     def active_layer_index(self):
@@ -215,6 +354,9 @@ class LayerManager(QObject):
         """
         if 0 <= index < len(self.layers):
              layer = self.layers.pop(index)
+             self.scheduler.cancel(layer.id)
+             self.coalescer.discard(layer.id)
+             self.idle_coalescer.discard(layer.id)
              # Update active index logic (careful)
              current_active = self._active_layer_index
              new_active = -1
@@ -340,6 +482,97 @@ class LayerManager(QObject):
                 return True
         return False
 
+    def get_layer_by_id(self, layer_id):
+        """Get a layer object by its UUID, or None."""
+        for layer in self.layers:
+            if layer.id == layer_id:
+                return layer
+        return None
+
+    # --- Background generation ---
+
+    def request_geometry(self, layer: Layer, lod: str = LOD_FULL) -> bool:
+        """Bring a layer's geometry up to date at ``lod`` without blocking.
+        
+        Cache hits are installed immediately. Otherwise the algorithm is
+        submitted to the scheduler with a snapshot of the parameters for that
+        level of detail, and any older job for the layer is cancelled.
+        Returns True if a job was queued.
+        """
+        if layer.load_cached_geometry() or layer.load_cached_geometry(lod):
+            self.scheduler.cancel(layer.id)
+            return False
+        self.scheduler.submit(layer.id, layer.algorithm, layer.get_lod_parameters(lod),
+                              layer.get_cache_key(lod), lod=lod)
+        return True
+
+    def is_generating(self, layer: Layer) -> bool:
+        """Return True while a regeneration for the layer is scheduled or running."""
+        return (self.coalescer.is_pending(layer.id) or self.idle_coalescer.is_pending(layer.id)
+                or self.scheduler.is_pending(layer.id))
+
+    def schedule_geometry(self, layer: Layer):
+        """Request regeneration after the current burst of edits settles.
+        
+        Parameter sets already in the cache are shown immediately. Layers
+        with a cheaper preview level regenerate at preview resolution after
+        each burst and are upgraded to full resolution once editing has been
+        idle for a while; others regenerate at full resolution directly.
+        """
+        if layer.load_cached_geometry():
+            self.coalescer.resolve(layer.id)
+            self.idle_coalescer.resolve(layer.id)
+            self.scheduler.cancel(layer.id)
+            return
+        if layer.has_preview_lod():
+            layer.load_cached_geometry(LOD_PREVIEW)
+            self.idle_coalescer.note_change(layer.id)
+        self.coalescer.note_change(layer.id)
+
+    def process_pending_updates(self) -> int:
+        """Flush settled edit bursts and install finished results.
+        
+        Called periodically from the UI thread. Returns the number of layers
+        whose geometry was updated.
+        """
+        for layer_id in self.coalescer.due():
+            layer = self.get_layer_by_id(layer_id)
+            if layer is not None and layer.needs_update:
+                self.request_geometry(layer, LOD_PREVIEW if self.idle_coalescer.is_pending(layer_id) else LOD_FULL)
+        for layer_id in self.idle_coalescer.due():
+            layer = self.get_layer_by_id(layer_id)
+            if layer is not None and layer.needs_update:
+                self.request_geometry(layer, LOD_FULL)
+        return self.process_generation_results()
+
+    def process_generation_results(self) -> int:
+        """Install finished background results and emit layer_updated for each.
+        
+        Must be called from the thread that owns the layers (the UI thread
+        polls this on a timer). Returns the number of layers updated.
+        """
+        updated = []
+        for result in self.scheduler.poll():
+            layer = self.get_layer_by_id(result.layer_id)
+            if layer is None:
+                continue
+            if result.error is not None:
+                print(f"Error generating geometry for layer '{layer.name}': {result.error}")
+                continue
+            if result.partial:
+                changed = layer.add_partial_geometry(result.geometry, result.key, result.lod)
+            else:
+                changed = layer.set_generated_geometry(result.geometry, result.key, result.lod,
+                                                       self.scheduler.run_in_pool)
+                if changed:
+                    print(f"Layer '{layer.name}' geometry updated in {result.elapsed * 1000:.1f} ms.")
+            if changed and layer not in updated:
+                updated.append(layer)
+        # One update per layer per poll, however many chunks arrived
+        for layer in updated:
+            self.layer_updated.emit(layer)
+        return len(updated)
+
     # --- Methods for modifying layer properties ---
     # These methods ensure the layer_updated signal is emitted
 
@@ -350,6 +583,8 @@ class LayerManager(QObject):
                  print(f"Layer '{layer.name}' is locked.")
                  return False
             layer.set_parameter(param_name, value)
+            if layer.needs_update:
+                self.schedule_geometry(layer)
             self.layer_updated.emit(layer)
             return True
         return False
@@ -0,0 +1,123 @@
+"""
+Rectangle clipping for the canvas preview and plotter export.
+
+Every segment of every path is clipped at once with a vectorized
+Liang-Barsky pass. Paths are split where they leave the rectangle and
+start a new polyline where they re-enter it. Paths that lie entirely
+inside pass through unchanged, so closed shapes on the page stay closed;
+closed shapes that cross the border are clipped starting from a vertex
+outside, so no visible run is split at the shape's start.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from ..geometry.primitives import PathArray
+from .optimize import drop_empty
+from .pipeline import PipelineStage
+from .segments import join_segments, path_segments
+
+Rect = Tuple[float, float, float, float]  # (xmin, ymin, xmax, ymax)
+
+
+def liang_barsky(start: np.ndarray, end: np.ndarray, rect: Rect) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Clip segments ``start``-``end`` to ``rect`` using only x and y.
+
+    Returns:
+        (visible, t0, t1): which segments intersect the rectangle, and the
+        parameter range of the visible part along each segment
+    """
+    xmin, ymin, xmax, ymax = rect
+    t0 = np.zeros(len(start))
+    t1 = np.ones(len(start))
+    for axis, low, high in ((0, xmin, xmax), (1, ymin, ymax)):
+        origin = np.ascontiguousarray(start[:, axis])
+        delta = end[:, axis] - origin
+        moving = delta != 0
+        # Segments parallel to the slab are inside or outside it for their whole
+        # length; they must not update t0/t1, where 0 * inf would give NaN
+        t_low = np.divide(low - origin, delta, out=np.full(len(start), -np.inf), where=moving)
+        t_high = np.divide(high - origin, delta, out=np.full(len(start), np.inf), where=moving)
+        np.maximum(t0, np.minimum(t_low, t_high), out=t0)  # Entering through this slab
+        np.minimum(t1, np.maximum(t_low, t_high), out=t1)  # Leaving through this slab
+        outside = ~moving & ((origin < low) | (origin > high))
+        t0[outside] = np.inf
+    return t0 <= t1, t0, t1
+
+
+def points_inside(coords: np.ndarray, rect: Rect) -> np.ndarray:
+    """Return which points lie inside (or on the border of) ``rect``."""
+    xmin, ymin, xmax, ymax = rect
+    x, y = coords[:, 0], coords[:, 1]
+    return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+
+def start_outside(paths: PathArray, rect: Rect) -> PathArray:
+    """Rotate closed paths that start inside ``rect`` to start at their first vertex outside it.
+
+    Otherwise the visible run through a closed path's start would come out
+    as two pieces, one ending at its last vertex and one starting at its
+    first, costing an extra pen lift. Every path must have a vertex outside.
+    """
+    lengths = paths.lengths
+    starts = paths.offsets[:-1]
+    inside = points_inside(paths.coords, rect)
+    rotate = paths.closed & (lengths > 2) & inside[np.minimum(starts, len(inside) - 1)]
+    if not rotate.any():
+        return paths
+    outside = np.flatnonzero(~inside)
+    shift = np.where(rotate, outside[np.searchsorted(outside, starts)] - starts, 0)
+    path = np.repeat(np.arange(len(paths)), lengths)
+    local = np.arange(len(path)) - starts[path]
+    order = starts[path] + (local + shift[path]) % lengths[path]
+    return PathArray(paths.coords[order], paths.offsets, paths.closed, dict(paths.style))
+
+
+def clip_paths(paths: PathArray, rect: Sequence[float]) -> PathArray:
+    """Clip paths to an axis-aligned rectangle.
+
+    Args:
+        paths: Paths to clip
+        rect: (xmin, ymin, xmax, ymax)
+
+    Returns:
+        A new PathArray: paths fully inside first (unchanged), then the
+        open pieces of paths that cross the border
+    """
+    rect = tuple(float(v) for v in rect)
+    paths = drop_empty(paths)
+    inside = points_inside(paths.coords, rect)
+    inside_count = np.zeros(len(inside) + 1, dtype=np.int64)
+    np.cumsum(inside, out=inside_count[1:])
+    all_inside = (inside_count[paths.offsets[1:]] - inside_count[paths.offsets[:-1]]) == paths.lengths
+    if all_inside.all():
+        return paths
+
+    crossing_mask = ~all_inside & (paths.lengths > 1)
+    crossing = start_outside(paths if crossing_mask.all() else paths.select(crossing_mask), rect)
+    start, end, owner = path_segments(crossing)
+    visible, t0, t1 = liang_barsky(start, end, rect)
+    start_cut = visible & (t0 > 0)
+    end_cut = visible & (t1 < 1)
+    clipped_start, clipped_end = start.copy(), end.copy()
+    clipped_start[start_cut] += t0[start_cut, None] * (end[start_cut] - start[start_cut])
+    clipped_end[end_cut] = start[end_cut] + t1[end_cut, None] * (end[end_cut] - start[end_cut])
+    pieces = join_segments(clipped_start, clipped_end, owner, visible, start_cut, end_cut, dict(paths.style))
+    return PathArray.concatenate([paths.select(all_inside), pieces], style=dict(paths.style))
+
+
+class RectClipper(PipelineStage):
+    """Clips paths to a rectangle, e.g. the canvas/paper area."""
+
+    name = "clip"
+
+    def __init__(self, rect: Sequence[float]):
+        super().__init__()
+        self.rect = tuple(rect)
+
+    def process(self, paths: PathArray) -> PathArray:
+        result = clip_paths(paths, self.rect)
+        self.stats = {"paths_before": len(paths), "paths_after": len(result),
+                      "vertices_before": paths.n_vertices, "vertices_after": result.n_vertices}
+        return result
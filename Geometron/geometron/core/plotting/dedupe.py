@@ -0,0 +1,204 @@
+"""
+Duplicate and overlapping segment elimination for plotter export.
+
+Rotated and mirrored patterns often draw the same segment several times.
+This pass splits paths into segments, hashes every segment by its
+supporting line (direction angle and normal offset), groups segments that
+lie within tolerance of each other's line, and sweeps each line's segments
+in order along it. Parts already covered by an
+earlier segment are removed; the remaining segments are rejoined into
+polylines wherever they still connect.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from ..geometry.primitives import PathArray
+from .optimize import drop_empty
+from .pipeline import PipelineStage
+from .segments import join_segments, path_segments, polyline_length
+
+
+def covered_intervals(group: np.ndarray, t0: np.ndarray, t1: np.ndarray) -> np.ndarray:
+    """Sweep intervals ``[t0, t1]`` that are sorted by (group, t0).
+
+    Returns, for each interval, how far along its line earlier intervals of
+    the same group already reach (``-inf`` for the first of a group).
+    """
+    if not len(group):
+        return np.empty(0)
+    low = min(t0.min(), t1.min())
+    span = max(t0.max(), t1.max()) - low + 1.0
+    # Shift each group into its own band above all earlier groups, so one
+    # running maximum over the whole array serves every group
+    first = np.r_[True, group[1:] != group[:-1]]
+    band = np.cumsum(first) * span
+    reach = np.maximum.accumulate(t1 - low + band)
+    previous = np.r_[-np.inf, reach[:-1]] - band + low
+    previous[first] = -np.inf
+    return previous
+
+
+def collinear_groups(xy_start: np.ndarray, xy_end: np.ndarray, unit: np.ndarray, tolerance: float,
+                     angle_tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Group segments that lie on a common line.
+
+    Segments are hashed by their true direction angle and normal offset;
+    pairs in the same or adjacent buckets count as collinear when each
+    one's endpoints lie within ``tolerance`` of the other's line. Groups
+    are the connected components of those pairs.
+
+    Args:
+        xy_start, xy_end: (S, 2) segment endpoints
+        unit: (S, 2) unit directions, in either orientation
+
+    Returns:
+        (group, direction): group label per segment (-1 for segments that
+        share their line with no other), and per segment the direction of
+        its group's first segment, to measure positions along the line
+    """
+    group = np.full(len(unit), -1, dtype=np.int64)
+    if len(unit) < 2:
+        return group, unit
+    angle = np.mod(np.arctan2(unit[:, 1], unit[:, 0]), np.pi)
+    # Normal of the folded angle, so a segment and its reverse share an offset
+    normal = np.stack([-np.sin(angle), np.cos(angle)], axis=1)
+    origin = (np.minimum(xy_start.min(axis=0), xy_end.min(axis=0))
+              + np.maximum(xy_start.max(axis=0), xy_end.max(axis=0))) / 2
+    offset = (normal * ((xy_start + xy_end) / 2 - origin)).sum(axis=1)
+    # Directions just below pi are also parallel to those just above 0, with the normal reversed
+    wrap = np.flatnonzero(angle > np.pi - angle_tolerance)
+    keys = np.concatenate([np.stack([angle / angle_tolerance, offset / tolerance], axis=1),
+                           np.stack([(angle[wrap] - np.pi) / angle_tolerance, -offset[wrap] / tolerance], axis=1)])
+    source = np.r_[np.arange(len(unit)), wrap]
+    pairs = source[cKDTree(keys).query_pairs(1.0, p=np.inf, output_type="ndarray")]
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    if not len(pairs):
+        return group, unit
+
+    # Collinear when both endpoints of each segment lie on the other's line
+    i, j = pairs[:, 0], pairs[:, 1]
+    collinear = np.ones(len(pairs), dtype=bool)
+    for line, other in ((i, j), (j, i)):
+        for point in (xy_start[other], xy_end[other]):
+            collinear &= np.abs((normal[line] * (point - xy_start[line])).sum(axis=1)) <= tolerance
+    i, j = i[collinear], j[collinear]
+    if not len(i):
+        return group, unit
+    linked = np.unique(np.r_[i, j])
+    graph = coo_matrix((np.ones(len(i)), (np.searchsorted(linked, i), np.searchsorted(linked, j))),
+                       shape=(len(linked), len(linked)))
+    _, labels = connected_components(graph, directed=False)
+    group[linked] = labels
+    # The lowest segment of each group sets the direction along the line
+    _, first = np.unique(labels, return_index=True)
+    direction = unit.copy()
+    direction[linked] = unit[linked[first][labels]]
+    return group, direction
+
+
+def dedupe_paths(paths: PathArray, tolerance: float = 0.05,
+                 angle_tolerance: float = 1e-3) -> Tuple[PathArray, Dict[str, int]]:
+    """Remove coincident and collinear-overlapping segment coverage.
+
+    Args:
+        paths: Paths sharing one style
+        tolerance: Lateral distance below which segments count as collinear,
+            and overlap below which nothing is trimmed
+        angle_tolerance: Direction difference in radians below which
+            segments count as parallel
+
+    Returns:
+        (paths, counts): the deduplicated paths and ``removed``/``trimmed``
+        segment counts. Paths that lose nothing are returned unchanged
+        (keeping their closed flag); the rest are split into open runs.
+    """
+    paths = drop_empty(paths)
+    start, end, owner = path_segments(paths)
+    counts = {"segments": len(owner), "removed": 0, "trimmed": 0}
+    if len(owner) < 2:
+        return paths, counts
+
+    xy_start, xy_end = start[:, :2], end[:, :2]
+    delta = xy_end - xy_start
+    # Orient every segment the same way so a segment and its reverse hash alike
+    flip = (delta[:, 0] < 0) | ((delta[:, 0] == 0) & (delta[:, 1] < 0))
+    delta[flip] *= -1
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    candidate = length > tolerance
+    if start.shape[1] == 3:
+        candidate &= np.abs(end[:, 2] - start[:, 2]) <= tolerance
+    index = np.flatnonzero(candidate)
+    group, direction = collinear_groups(xy_start[index], xy_end[index], delta[index] / length[index, None],
+                                        tolerance, angle_tolerance)
+    on_line = group >= 0
+    index, line_key, direction = index[on_line], group[on_line], direction[on_line]
+    if not len(index):
+        return paths, counts
+    # Sweep each line's segments in order of interval start, along one shared direction
+    ta = np.full(len(owner), np.nan)
+    tb = np.full(len(owner), np.nan)
+    ta[index] = (direction * xy_start[index]).sum(axis=1)
+    tb[index] = (direction * xy_end[index]).sum(axis=1)
+    lo, hi = np.minimum(ta[index], tb[index]), np.maximum(ta[index], tb[index])
+    order = np.lexsort((index, lo, line_key))
+    index, lo, hi, line_key = index[order], lo[order], hi[order], line_key[order]
+    covered = covered_intervals(line_key, lo, hi)
+
+    removed = np.zeros(len(owner), dtype=bool)
+    new_lo = np.full(len(owner), np.nan)
+    full = hi <= covered + tolerance
+    removed[index[full]] = True
+    partial = ~full & (lo < covered - tolerance)
+    new_lo[index[partial]] = covered[partial]
+    counts["removed"] = int(full.sum())
+    counts["trimmed"] = int(partial.sum())
+    if not counts["removed"] and not counts["trimmed"]:
+        return paths, counts
+
+    # Move the trimmed end of each partially covered segment to where coverage ends
+    trimmed = np.flatnonzero(~np.isnan(new_lo))
+    forward = ta[trimmed] <= tb[trimmed]
+    t_from = np.where(forward, ta[trimmed], tb[trimmed])
+    t_to = np.where(forward, tb[trimmed], ta[trimmed])
+    fraction = (new_lo[trimmed] - t_from) / (t_to - t_from)
+    seg_start, seg_end = start.copy(), end.copy()
+    moved = start[trimmed] + (end[trimmed] - start[trimmed]) * np.where(forward, fraction, 1.0 - fraction)[:, None]
+    seg_start[trimmed[forward]] = moved[forward]
+    seg_end[trimmed[~forward]] = moved[~forward]
+    start_moved = np.zeros(len(owner), dtype=bool)
+    end_moved = np.zeros(len(owner), dtype=bool)
+    start_moved[trimmed[forward]] = True
+    end_moved[trimmed[~forward]] = True
+
+    # Untouched paths pass through as they are
+    touched = np.zeros(len(paths), dtype=bool)
+    touched[owner[removed | start_moved | end_moved]] = True
+    keep = ~removed & touched[owner]
+    rebuilt = join_segments(seg_start, seg_end, owner, keep, start_moved, end_moved, dict(paths.style))
+    untouched = paths.select(~touched)
+    return PathArray.concatenate([untouched, rebuilt], style=dict(paths.style)), counts
+
+
+class SegmentDeduplicator(PipelineStage):
+    """Removes coincident and collinear-overlapping segment coverage."""
+
+    name = "dedupe_segments"
+
+    def __init__(self, tolerance: float = 0.05, angle_tolerance: float = 1e-3):
+        super().__init__()
+        if not (tolerance > 0 and angle_tolerance > 0):
+            raise ValueError("Dedupe tolerances must be positive")  # Both scale the line hash
+        self.tolerance = tolerance
+        self.angle_tolerance = angle_tolerance
+
+    def process(self, paths: PathArray) -> PathArray:
+        before = polyline_length(paths)
+        result, counts = dedupe_paths(paths, self.tolerance, self.angle_tolerance)
+        after = polyline_length(result) if result is not paths else before
+        self.stats = {**counts, "length_before": before, "length_after": after, "length_saved": before - after}
+        return result
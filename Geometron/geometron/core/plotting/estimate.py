@@ -0,0 +1,221 @@
+"""
+Plot-time and ink-length estimation for the Geometron application.
+
+Drawing moves follow a trapezoidal velocity profile with constant
+acceleration. Corner speeds are limited with the junction-deviation model
+used by GRBL-style firmware. The pen stops at both ends of every path,
+and travel moves start and end at rest.
+
+The speed limit at every vertex is the minimum of its junction limit and
+what acceleration allows from any earlier or later vertex. In squared
+speeds that is a running minimum over cumulative path length, so the
+whole layer is planned with two ``minimum.accumulate`` passes instead of a
+per-segment loop. Paths are planned in the order they will be plotted.
+
+All lengths are in canvas units, speeds in units per second and times in
+seconds.
+"""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from ..geometry.primitives import GeometryCollection, PathArray
+from .pipeline import PipelineStage
+
+
+@dataclass
+class MotionProfile:
+    """Machine motion limits.
+
+    Attributes:
+        draw_speed: Maximum pen-down speed
+        travel_speed: Maximum pen-up speed
+        acceleration: Acceleration for all moves; 0 plans at constant speed
+        junction_deviation: Allowed corner deviation, controls cornering speed
+        pen_lift_time: Seconds for one pen-down plus pen-up cycle
+    """
+    draw_speed: float = 50.0
+    travel_speed: float = 150.0
+    acceleration: float = 1000.0
+    junction_deviation: float = 0.05
+    pen_lift_time: float = 0.25
+
+
+@dataclass
+class PlotEstimate:
+    """Totals of a plot estimate.
+
+    Attributes:
+        paths: Paths drawn (paths with fewer than two vertices are skipped)
+        pen_lifts: Pen-down/pen-up cycles
+        draw_length: Pen-down length
+        travel_length: Pen-up travel, from the origin to the last path
+        draw_time: Seconds spent drawing
+        travel_time: Seconds spent travelling
+        lift_time: Seconds spent lifting and lowering the pen
+    """
+    paths: int = 0
+    pen_lifts: int = 0
+    draw_length: float = 0.0
+    travel_length: float = 0.0
+    draw_time: float = 0.0
+    travel_time: float = 0.0
+    lift_time: float = 0.0
+
+    @property
+    def total_time(self) -> float:
+        return self.draw_time + self.travel_time + self.lift_time
+
+    def __add__(self, other: 'PlotEstimate') -> 'PlotEstimate':
+        return PlotEstimate(**{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)})
+
+    def describe(self) -> str:
+        """One-line human-readable summary."""
+        return (f"{format_duration(self.total_time)} "
+                f"(draw {self.draw_length:.6g} in {format_duration(self.draw_time)}, "
+                f"travel {self.travel_length:.6g} in {format_duration(self.travel_time)}, "
+                f"{self.pen_lifts} pen lifts)")
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. ``2h 05m``, ``4m 12s`` or ``8.3s``."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {secs:02d}s"
+
+
+def trapezoid_times(length: np.ndarray, entry_sq: np.ndarray, exit_sq: np.ndarray,
+                    max_speed: float, acceleration: float) -> np.ndarray:
+    """Duration of moves with trapezoidal velocity profiles.
+
+    Args:
+        length: Move lengths
+        entry_sq: Squared entry speeds (already reachable within ``length``)
+        exit_sq: Squared exit speeds
+        max_speed: Cruise speed
+        acceleration: Acceleration and deceleration; 0 means constant speed
+    """
+    if acceleration <= 0:
+        return length / max_speed
+    peak_sq = np.minimum(max_speed * max_speed, 0.5 * (entry_sq + exit_sq) + acceleration * length)
+    peak = np.sqrt(peak_sq)
+    ramps = (2 * peak - np.sqrt(entry_sq) - np.sqrt(exit_sq)) / acceleration
+    cruise = np.maximum(length - (2 * peak_sq - entry_sq - exit_sq) / (2 * acceleration), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ramps + np.where(peak > 0, cruise / peak, 0.0)
+
+
+def junction_limits(incoming: np.ndarray, outgoing: np.ndarray, profile: MotionProfile) -> np.ndarray:
+    """Squared maximum corner speeds between unit direction vectors (junction deviation)."""
+    cos_theta = -np.einsum("ij,ij->i", incoming, outgoing)
+    sin_half = np.sqrt(np.clip(0.5 * (1.0 - cos_theta), 0.0, 1.0))
+    max_sq = profile.draw_speed * profile.draw_speed
+    with np.errstate(divide="ignore"):
+        limit = profile.acceleration * profile.junction_deviation * sin_half / (1.0 - sin_half)
+    return np.minimum(np.nan_to_num(limit, nan=max_sq, posinf=max_sq), max_sq)
+
+
+def estimate_paths(paths: PathArray, profile: Optional[MotionProfile] = None,
+                   origin: Sequence[float] = (0.0, 0.0)) -> PlotEstimate:
+    """Estimate plotting ``paths`` in their current order, starting at ``origin``.
+
+    Only x and y are considered. Closed paths are drawn back to their start.
+    """
+    profile = profile or MotionProfile()
+    paths = paths.select(paths.lengths >= 2).to_open()
+    n_paths = len(paths)
+    if not n_paths:
+        return PlotEstimate()
+    coords = paths.coords[:, :2]
+    starts = paths.offsets[:-1]
+
+    # Drop repeated vertices so every segment has a direction
+    keep = np.ones(len(coords), dtype=bool)
+    keep[1:] = (coords[1:] != coords[:-1]).any(axis=1)
+    keep[starts] = True
+    kept = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    coords, offsets = coords[keep], kept[paths.offsets]
+    starts, ends = offsets[:-1], offsets[1:] - 1
+
+    # Travel: origin -> first start, then each end -> next start
+    travel_from = np.vstack([np.asarray(origin, dtype=float)[None, :2], coords[ends[:-1]]])
+    travel = np.linalg.norm(coords[starts] - travel_from, axis=1)
+    travel_time = trapezoid_times(travel, np.zeros(n_paths), np.zeros(n_paths),
+                                  profile.travel_speed, profile.acceleration)
+
+    delta = np.diff(coords, axis=0)
+    length = np.linalg.norm(delta, axis=1)
+    inner = np.ones(len(length), dtype=bool)
+    inner[ends[:-1]] = False  # The step from one path's end to the next path's start is travel
+    length = np.where(inner, length, 0.0)
+    draw_length = float(length.sum())
+
+    # Squared speed limit per vertex: junction limits inside paths, rest at path ends
+    limit = np.zeros(len(coords))
+    interior = np.ones(len(coords), dtype=bool)
+    interior[starts] = False
+    interior[ends] = False
+    corner = np.flatnonzero(interior)
+    if len(corner):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            direction = delta / length[:, None]
+        limit[corner] = junction_limits(direction[corner - 1], direction[corner], profile)
+
+    if profile.acceleration > 0:
+        # Speeds reachable accelerating from earlier vertices and braking for later ones
+        distance = np.zeros(len(coords))
+        np.cumsum(length, out=distance[1:])
+        reach = 2 * profile.acceleration * distance
+        forward = reach + np.minimum.accumulate(limit - reach)
+        backward = np.minimum.accumulate((limit + reach)[::-1])[::-1] - reach
+        limit = np.maximum(np.minimum(forward, backward), 0.0)
+    segment = np.flatnonzero(inner)
+    draw_time = trapezoid_times(length[segment], limit[segment], limit[segment + 1],
+                                profile.draw_speed, profile.acceleration)
+
+    return PlotEstimate(paths=n_paths, pen_lifts=n_paths, draw_length=draw_length,
+                        travel_length=float(travel.sum()), draw_time=float(draw_time.sum()),
+                        travel_time=float(travel_time.sum()), lift_time=n_paths * profile.pen_lift_time)
+
+
+def estimate_collection(geometry: GeometryCollection, profile: Optional[MotionProfile] = None,
+                        origin: Sequence[float] = (0.0, 0.0)) -> PlotEstimate:
+    """Estimate plotting a collection in its current path order."""
+    return estimate_paths(geometry.to_path_array(), profile, origin)
+
+
+def estimate_layers(layers: Iterable, profile: Optional[MotionProfile] = None) -> Dict[str, PlotEstimate]:
+    """Estimate every visible layer, each plotted from the origin.
+
+    Returns:
+        Layer id -> estimate; ``sum(result.values(), PlotEstimate())`` is the project total
+    """
+    estimates = {}
+    for layer in layers:
+        if not layer.visible:
+            continue
+        arrays = [paths for chunk in layer.iter_geometry_chunks() for paths in chunk.iter_path_arrays()]
+        estimates[layer.id] = estimate_paths(PathArray.concatenate(arrays), profile)
+    return estimates
+
+
+class PlotEstimator(PipelineStage):
+    """Records a plot estimate of each layer; paths pass through unchanged.
+
+    Put it last so the estimate reflects the optimized path order.
+    """
+
+    name = "estimate"
+
+    def __init__(self, profile: Optional[MotionProfile] = None):
+        super().__init__()
+        self.profile = profile or MotionProfile()
+
+    def process(self, paths: PathArray) -> PathArray:
+        self.stats = asdict(estimate_paths(paths, self.profile))
+        return paths
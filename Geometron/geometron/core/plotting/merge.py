@@ -0,0 +1,199 @@
+"""
+Endpoint-joining path merger for plotter export.
+
+Algorithms often emit one curve as many short pieces whose endpoints
+coincide, and every piece costs a pen lift. This pass joins open paths
+whose endpoints lie within a tolerance into longer polylines, reversing
+pieces as needed. Nearby endpoints are found with a spatial hash on a grid
+of tolerance-sized cells, so the pass runs in near-linear time.
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..geometry.primitives import GeometryCollection, PathArray
+from .optimize import drop_empty
+from .pipeline import PipelineStage
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Pack (N, 2) integer cell coordinates into one int64 key per row."""
+    return (cells[:, 0] << 32) ^ (cells[:, 1] & 0xFFFFFFFF)
+
+
+def close_pairs(points: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find all pairs of points within ``tolerance`` of each other.
+
+    Points are bucketed into a grid of ``tolerance``-sized cells; each point
+    is compared only with points in its own and the eight neighbouring
+    cells, found by binary search over the sorted cell keys.
+
+    Returns:
+        (i, j, distance) arrays with ``i < j``
+    """
+    cells = np.floor(points[:, :2] / tolerance).astype(np.int64)
+    order = np.argsort(_cell_keys(cells), kind="stable")
+    # Work in sorted order: neighbouring-cell queries are then nearly sorted
+    # too, which keeps the binary searches cache friendly
+    cells = cells[order]
+    sorted_keys = _cell_keys(cells)
+
+    found_i, found_j = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            keys = _cell_keys(cells + (dx, dy))
+            lo = np.searchsorted(sorted_keys, keys, side="left")
+            hi = np.searchsorted(sorted_keys, keys, side="right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            i = order[np.repeat(np.arange(len(points)), counts)]
+            starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+            j = order[starts + np.arange(total)]
+            keep = i < j
+            found_i.append(i[keep])
+            found_j.append(j[keep])
+
+    if not found_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+    i = np.concatenate(found_i)
+    j = np.concatenate(found_j)
+    distance = np.linalg.norm(points[i] - points[j], axis=1)
+    keep = distance <= tolerance
+    return i[keep], j[keep], distance[keep]
+
+
+def merge_paths(paths: PathArray, tolerance: float = 0.05) -> PathArray:
+    """Join open paths whose endpoints lie within ``tolerance``.
+
+    Each endpoint joins at most one other endpoint, closest pairs first.
+    Chains that come back to their start become closed paths. Closed input
+    paths are passed through unchanged, after the merged ones.
+
+    Args:
+        paths: Paths sharing one style
+        tolerance: Maximum gap between joined endpoints
+
+    Returns:
+        A new PathArray with the same style
+    """
+    paths = drop_empty(paths)
+    open_paths = paths.select(~paths.closed)
+    closed_paths = paths.select(paths.closed)
+    n = len(open_paths)
+    if n < 2:
+        return paths
+
+    # Endpoint 2p is the start of path p, 2p + 1 its end
+    first, last = open_paths.endpoints()
+    endpoints = np.empty((2 * n, open_paths.dim))
+    endpoints[0::2] = first
+    endpoints[1::2] = last
+    i, j, distance = close_pairs(endpoints, tolerance)
+    different = (i >> 1) != (j >> 1)
+    i, j, distance = i[different], j[different], distance[different]
+
+    closest_first = np.argsort(distance, kind="stable")
+    partner_list = [-1] * (2 * n)
+    for a, b in zip(i[closest_first].tolist(), j[closest_first].tolist()):
+        if partner_list[a] < 0 and partner_list[b] < 0:
+            partner_list[a] = b
+            partner_list[b] = a
+
+    # Walk chains: from every path with a free end first, then the remaining cycles
+    visited = bytearray(n)
+    seq_path: List[int] = []
+    seq_reversed: List[bool] = []
+    chain_sizes: List[int] = []
+    chain_closed: List[bool] = []
+
+    def walk(path: int, reverse: bool) -> bool:
+        """Follow a chain from ``path``; returns True if it closes on itself."""
+        start = path
+        size = 0
+        while True:
+            visited[path] = 1
+            seq_path.append(path)
+            seq_reversed.append(reverse)
+            size += 1
+            other = partner_list[2 * path if reverse else 2 * path + 1]
+            if other < 0 or visited[other >> 1]:
+                chain_sizes.append(size)
+                return other >= 0 and (other >> 1) == start
+            path, reverse = other >> 1, bool(other & 1)
+
+    for path in range(n):
+        if visited[path]:
+            continue
+        if partner_list[2 * path] < 0:
+            chain_closed.append(walk(path, False))
+        elif partner_list[2 * path + 1] < 0:
+            chain_closed.append(walk(path, True))
+    for path in range(n):
+        if not visited[path]:
+            chain_closed.append(walk(path, False))
+
+    # Lay the pieces out in chain order, dropping each joined piece's first vertex
+    pieces = open_paths.select(np.array(seq_path, dtype=np.int64)).reverse(np.array(seq_reversed, dtype=bool))
+    sizes = np.array(chain_sizes, dtype=np.int64)
+    chain_start = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=chain_start[1:])
+    continuation = np.ones(len(pieces), dtype=bool)
+    continuation[chain_start] = False
+    keep = np.ones(pieces.n_vertices, dtype=bool)
+    keep[pieces.offsets[:-1][continuation]] = False
+
+    closed = np.array(chain_closed, dtype=bool)
+    piece_lengths = pieces.lengths - continuation
+    # A closed chain ends on its first vertex; closed paths do not repeat it
+    chain_end = chain_start + sizes - 1
+    drop_last = closed & (piece_lengths[chain_end] > 0)
+    keep[pieces.offsets[chain_end[drop_last] + 1] - 1] = False
+    piece_lengths[chain_end[drop_last]] -= 1
+
+    chain_lengths = np.add.reduceat(piece_lengths, chain_start)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(chain_lengths, out=offsets[1:])
+    merged = PathArray(pieces.coords[keep], offsets, closed & (chain_lengths > 2), dict(paths.style))
+    return PathArray.concatenate([merged, closed_paths], style=dict(paths.style)) if len(closed_paths) else merged
+
+
+def _style_key(style: Dict) -> str:
+    return json.dumps(style, sort_keys=True, default=repr)
+
+
+def merge_collection(geometry: GeometryCollection, tolerance: float = 0.05) -> GeometryCollection:
+    """Merge the paths of a collection, keeping paths of different styles apart.
+
+    Returns a new collection with one PathArray per distinct style. Points
+    are dropped, as for other plotter output.
+    """
+    groups: Dict[str, List[PathArray]] = {}
+    for paths in geometry.iter_path_arrays():
+        groups.setdefault(_style_key(paths.style), []).append(paths)
+    merged = GeometryCollection()
+    for arrays in groups.values():
+        merged.add(merge_paths(PathArray.concatenate(arrays, style=dict(arrays[0].style)), tolerance))
+    return merged
+
+
+class PathMerger(PipelineStage):
+    """Joins paths whose endpoints lie within ``tolerance``."""
+
+    name = "merge_paths"
+
+    def __init__(self, tolerance: float = 0.05):
+        super().__init__()
+        if not tolerance > 0:
+            raise ValueError("Merge tolerance must be positive")  # Zero would hash every endpoint into one cell
+        self.tolerance = tolerance
+
+    def process(self, paths: PathArray) -> PathArray:
+        result = merge_paths(paths, self.tolerance)
+        self.stats = {"paths_before": len(paths), "paths_after": len(result),
+                      "joins": len(paths) - len(result)}
+        return result
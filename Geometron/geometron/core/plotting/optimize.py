@@ -0,0 +1,232 @@
+"""
+Pen-travel optimization for plotter export.
+
+Paths are reordered, and open paths reversed where that is cheaper, to
+minimize the pen-up distance between the end of one path and the start of
+the next. Ordering starts with a greedy nearest-neighbour tour seeded from a
+KD-tree over path endpoints, and is then refined with 2-opt moves (reversing
+a run of paths) until no move helps or the time budget runs out.
+"""
+
+import time
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..geometry.primitives import PathArray
+from .pipeline import PipelineStage
+
+
+def path_endpoints(paths: PathArray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the (entry, exit) points of every path in drawing order.
+
+    A closed path is drawn back to its first vertex, so it exits where it
+    entered. Only x and y are returned.
+    """
+    first, last = paths.endpoints()
+    entry = first[:, :2]
+    exit_ = np.where(paths.closed[:, None], entry, last[:, :2])
+    return entry, exit_
+
+
+def pen_up_distance(paths: PathArray, origin: Sequence[float] = (0.0, 0.0)) -> float:
+    """Total pen-up travel from ``origin`` through all paths in their current order."""
+    paths = drop_empty(paths)
+    if not len(paths):
+        return 0.0
+    entry, exit_ = path_endpoints(paths)
+    previous = np.vstack([np.asarray(origin, dtype=np.float64)[None, :2], exit_[:-1]])
+    return float(np.linalg.norm(entry - previous, axis=1).sum())
+
+
+def drop_empty(paths: PathArray) -> PathArray:
+    """Return ``paths`` without zero-vertex paths."""
+    keep = paths.lengths > 0
+    return paths if keep.all() else paths.select(keep)
+
+
+def nearest_neighbour_order(entry: np.ndarray, exit_: np.ndarray, reversible: np.ndarray,
+                            origin: Sequence[float] = (0.0, 0.0)) -> Tuple[np.ndarray, np.ndarray]:
+    """Greedy tour: repeatedly draw the unvisited path with the nearest free endpoint.
+
+    Args:
+        entry: (N, 2) first point of each path
+        exit_: (N, 2) last point of each path
+        reversible: Paths that may be drawn from their exit point
+        origin: Pen position before the first path
+
+    Returns:
+        (order, flip): path indices in drawing order, and whether each is drawn reversed
+    """
+    n = len(entry)
+    reversible_idx = np.flatnonzero(reversible)
+    points = np.vstack([entry, exit_[reversible_idx]])
+    owner = np.concatenate([np.arange(n), reversible_idx])
+    reverse = np.concatenate([np.zeros(n, dtype=bool), np.ones(len(reversible_idx), dtype=bool)])
+
+    # Nearest endpoints seen from each path's exit (or, when drawn reversed,
+    # its entry), queried in one batch. The per-path loop walks these lists
+    # and only falls back to a tree query once they are all visited.
+    tree = cKDTree(points)
+    k = min(10, len(points))
+    near_exit = tree.query(exit_, k=k)[1].reshape(n, -1).tolist()
+    near_entry = tree.query(entry, k=k)[1].reshape(n, -1).tolist()
+
+    # The loop runs once per path, so it works on Python lists rather than arrays
+    owner_list = owner.tolist()
+    reverse_list = reverse.tolist()
+    entry_list = entry.tolist()
+    exit_list = exit_.tolist()
+    visited = bytearray(n)
+    order = []
+    flip = []
+    live = list(range(len(points)))  # Endpoint indices in the fallback tree
+    stale = 0  # Visited paths still present in the fallback tree
+    position = [float(v) for v in origin[:2]]
+    near = []
+
+    for step in range(n):
+        choice = None
+        for index in near:
+            if not visited[owner_list[index]]:
+                choice = index
+                break
+        k = 8
+        while choice is None:
+            k = min(k, len(live))
+            _, found = tree.query(position, k=k)
+            for index in ([found] if k == 1 else found.tolist()):
+                if not visited[owner_list[live[index]]]:
+                    choice = live[index]
+                    break
+            k *= 4
+        path = owner_list[choice]
+        visited[path] = 1
+        order.append(path)
+        flip.append(reverse_list[choice])
+        if reverse_list[choice]:
+            position, near = entry_list[path], near_entry[path]
+        else:
+            position, near = exit_list[path], near_exit[path]
+
+        # Rebuild once half the tree is visited so fallback queries stay short
+        stale += 1
+        if stale * 2 > n - step and step + 1 < n and len(live) > 64:
+            live = [index for index in live if not visited[owner_list[index]]]
+            tree = cKDTree(points[live])
+            stale = 0
+    return np.array(order, dtype=np.int64), np.array(flip, dtype=bool)
+
+
+def two_opt(entry: np.ndarray, exit_: np.ndarray, order: np.ndarray, flip: np.ndarray,
+            time_budget: float = 1.0, neighbours: int = 8) -> int:
+    """Refine a tour in place by reversing runs of paths.
+
+    Reversing the run ``i..j`` also reverses the drawing direction of each
+    path in it, so every path must be reversible (closed paths trivially
+    are). Candidate runs end at one of the ``neighbours`` paths with an
+    endpoint nearest the pen position before ``i``. The first path of the
+    tour is kept in place.
+
+    Returns:
+        Number of improving moves applied
+    """
+    n = len(order)
+    if n < 3 or time_budget <= 0:
+        return 0
+    deadline = time.perf_counter() + time_budget
+
+    # Candidate partners of each path, by proximity of either endpoint
+    tree = cKDTree(np.vstack([entry, exit_]))
+    k = min(neighbours, 2 * n)
+    _, near_entry = tree.query(entry, k=k)
+    _, near_exit = tree.query(exit_, k=k)
+    candidates = np.hstack([near_entry.reshape(n, -1), near_exit.reshape(n, -1)]) % n
+
+    # Tour-ordered entry (a) and exit (b) points
+    a = np.where(flip[:, None], exit_[order], entry[order])
+    b = np.where(flip[:, None], entry[order], exit_[order])
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+
+    moves = 0
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n):
+            if (i & 255) == 0 and time.perf_counter() > deadline:
+                return moves
+            p = b[i - 1]
+            j = position[candidates[order[i - 1]]]
+            j = np.unique(j[j >= i])
+            if not len(j):
+                continue
+            nxt = np.minimum(j + 1, n - 1)
+            has_next = j + 1 < n
+            old = np.linalg.norm(a[i] - p) + np.where(has_next, np.linalg.norm(b[j] - a[nxt], axis=1), 0.0)
+            new = np.linalg.norm(b[j] - p, axis=1) + np.where(has_next, np.linalg.norm(a[i] - a[nxt], axis=1), 0.0)
+            delta = new - old
+            best = np.argmin(delta)
+            if delta[best] >= -1e-9:
+                continue
+            j = j[best]
+            run = slice(i, j + 1)
+            a[run], b[run] = b[run][::-1].copy(), a[run][::-1].copy()
+            order[run] = order[run][::-1]
+            flip[run] = ~flip[run][::-1]
+            position[order[run]] = np.arange(i, j + 1)
+            moves += 1
+            improved = True
+        if time.perf_counter() > deadline:
+            break
+    return moves
+
+
+class TravelOptimizer(PipelineStage):
+    """Reorders and reverses paths to minimize pen-up travel.
+
+    Args:
+        reverse: Allow drawing open paths end to start
+        two_opt: Refine the nearest-neighbour tour with 2-opt moves
+        time_budget: Seconds allowed for 2-opt refinement per run
+        origin: Pen position before the first path
+        neighbours: Candidate partners per path for 2-opt
+    """
+
+    name = "optimize_travel"
+
+    def __init__(self, reverse: bool = True, two_opt: bool = True, time_budget: float = 1.0,
+                 origin: Sequence[float] = (0.0, 0.0), neighbours: int = 8):
+        super().__init__()
+        self.reverse = reverse
+        self.two_opt = two_opt
+        self.time_budget = time_budget
+        self.origin = tuple(origin)
+        self.neighbours = neighbours
+
+    def process(self, paths: PathArray) -> PathArray:
+        paths = drop_empty(paths)
+        before = pen_up_distance(paths, self.origin)
+        self.stats = {"paths": len(paths), "travel_before": before, "travel_after": before,
+                      "reversed": 0, "two_opt_moves": 0}
+        if len(paths) < 2:
+            return paths
+
+        entry, exit_ = path_endpoints(paths)
+        reversible = ~paths.closed if self.reverse else np.zeros(len(paths), dtype=bool)
+        order, flip = nearest_neighbour_order(entry, exit_, reversible, self.origin)
+        # 2-opt reverses runs of paths, which is only valid if every open path may be reversed
+        if self.two_opt and (self.reverse or paths.closed.all()):
+            self.stats["two_opt_moves"] = two_opt(entry, exit_, order, flip, self.time_budget,
+                                                  self.neighbours)
+        flip &= ~paths.closed[order]  # Closed paths are drawn from their first vertex
+
+        result = paths.select(order)
+        if flip.any():
+            result = result.reverse(flip)
+        after = pen_up_distance(result, self.origin)
+        if after >= before:
+            return paths  # Generation order was already better
+        self.stats.update({"travel_after": after, "reversed": int(flip.sum())})
+        return result
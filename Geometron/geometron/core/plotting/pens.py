@@ -0,0 +1,144 @@
+"""
+Multi-pen separation for plotter export.
+
+All visible geometry is bucketed by pen, i.e. by (color, weight): the
+layer's line color and weight, unless a PathArray's style dict sets its
+own ``color``/``weight``. Layers sharing a pen end up in one bucket, so a
+pen is only picked up once. Stages that depend on layer settings run on
+each layer before bucketing. Buckets are independent, so each is run
+through the export pipeline in its own worker process; a multi-pen job
+takes about as long as its largest bucket.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..geometry.primitives import PathArray
+from ..io.svg import layer_path_arrays, rgb_hex
+from .pipeline import PlotPipeline, StageReport
+from .simplify import Simplifier
+
+PenKey = Tuple[Tuple[int, int, int], float]  # (color, weight)
+
+
+@dataclass
+class PenBucket:
+    """All paths drawn with one pen.
+
+    Attributes:
+        pen: Pen number, from 1 in order of first use
+        color: RGB color
+        weight: Line weight
+        paths: The pen's paths, in plotting order
+        layers: Names of the layers that contributed paths
+    """
+    pen: int
+    color: Tuple[int, int, int]
+    weight: float
+    paths: PathArray
+    layers: List[str] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return f"Pen {self.pen} ({rgb_hex(self.color)}, {self.weight:g})"
+
+
+def pen_key(layer, paths: PathArray) -> PenKey:
+    """The pen of a layer's paths: the style dict's color/weight, else the layer's."""
+    style = paths.style if isinstance(paths.style, dict) else {}
+    color = style.get("color", layer.line_color)
+    return tuple(int(c) for c in color[:3]), float(style.get("weight", layer.line_weight))
+
+
+def separate_pens(layers: Iterable, height: Optional[float] = None,
+                  layer_pipeline: Optional[PlotPipeline] = None) -> List[PenBucket]:
+    """Bucket the paths of all visible layers by pen.
+
+    Stages that use per-layer settings, such as the layer's simplify
+    tolerance, must run in ``layer_pipeline``, since buckets may mix layers.
+
+    Args:
+        layers: Layers in plotting order; hidden layers are skipped
+        height: Canvas height to flip into SVG coordinates; None keeps canvas coordinates
+        layer_pipeline: Run on each layer's paths before bucketing (default:
+            a Simplifier applying the layers' own tolerances)
+
+    Returns:
+        Buckets in order of first use
+    """
+    if layer_pipeline is None:
+        layer_pipeline = PlotPipeline([Simplifier()])
+    arrays: Dict[PenKey, List[PathArray]] = {}
+    names: Dict[PenKey, List[str]] = {}
+    for layer in layers:
+        if not layer.visible:
+            continue
+        for paths in layer_path_arrays(layer, height):
+            key = pen_key(layer, paths)
+            if layer_pipeline:
+                paths = layer_pipeline.run(paths, layer.name, layer)
+            arrays.setdefault(key, []).append(paths)
+            if layer.name not in names.setdefault(key, []):
+                names[key].append(layer.name)
+    return [PenBucket(pen, color, weight, PathArray.concatenate(arrays[(color, weight)]), names[(color, weight)])
+            for pen, (color, weight) in enumerate(arrays, start=1)]
+
+
+def split_pipeline(pipeline: PlotPipeline) -> Tuple[PlotPipeline, PlotPipeline]:
+    """Split an export pipeline for ``separate_pens`` and ``optimize_pens``.
+
+    Stages up to the last Simplifier run per layer, so each layer keeps its
+    own simplify tolerance; the rest run per bucket.
+    """
+    cut = max((i + 1 for i, stage in enumerate(pipeline.stages) if isinstance(stage, Simplifier)), default=0)
+    return PlotPipeline(pipeline.stages[:cut]), PlotPipeline(pipeline.stages[cut:])
+
+
+def _run_bucket(pipeline: PlotPipeline, paths: PathArray, label: str) -> Tuple[PathArray, List[StageReport]]:
+    """Worker entry point: run a fresh copy of the pipeline on one bucket."""
+    pipeline.reports = []
+    return pipeline.run(paths, label), pipeline.reports
+
+
+def optimize_pens(buckets: List[PenBucket], pipeline: PlotPipeline,
+                  max_workers: Optional[int] = None) -> Tuple[List[PenBucket], float]:
+    """Run ``pipeline`` on every bucket, one process per bucket.
+
+    Stage reports are appended to ``pipeline.reports``, labelled per pen.
+
+    Args:
+        buckets: Buckets from ``separate_pens``
+        pipeline: Export pipeline; each worker runs its own copy
+        max_workers: Process count (default: one per bucket, up to the CPU count)
+
+    Returns:
+        (buckets with processed paths, wall-clock seconds)
+    """
+    start = time.perf_counter()
+    if not pipeline or not buckets:
+        return buckets, time.perf_counter() - start
+    max_workers = max_workers or min(len(buckets), os.cpu_count() or 1)
+    jobs = [(pipeline, bucket.paths, bucket.label) for bucket in buckets]
+    if max_workers == 1 or len(buckets) == 1:
+        results = [pipeline.run(paths, label) for _, paths, label in jobs]
+    else:
+        # Submit the largest buckets first so they finish about together
+        order = sorted(range(len(jobs)), key=lambda i: -jobs[i][1].n_vertices)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(_run_bucket, *jobs[i]) for i in order}
+            results = []
+            for i in range(len(jobs)):
+                paths, reports = futures[i].result()
+                pipeline.reports.extend(reports)
+                results.append(paths)
+    processed = [PenBucket(b.pen, b.color, b.weight, paths, list(b.layers)) for b, paths in zip(buckets, results)]
+    return processed, time.perf_counter() - start
+
+
+def pen_file_path(output: str, bucket: PenBucket) -> str:
+    """File name for one pen of a per-pen export: ``art.svg`` -> ``art_pen1_ff0000.svg``."""
+    root, ext = os.path.splitext(output)
+    return f"{root}_pen{bucket.pen}_{rgb_hex(bucket.color)[1:]}{ext}"
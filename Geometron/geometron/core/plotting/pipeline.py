@@ -0,0 +1,97 @@
+"""
+Plotter export pipeline for the Geometron application.
+
+A pipeline is an ordered list of stages that each take the paths of one
+layer as a PathArray and return a new PathArray, e.g. reordering paths to
+cut pen-up travel. Stages record statistics for every run so exports can
+report what each stage achieved.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..geometry.primitives import GeometryCollection, PathArray
+
+
+@dataclass
+class StageReport:
+    """Statistics of one stage run.
+
+    Attributes:
+        stage: Name of the stage
+        label: Caller-supplied label, typically the layer name
+        elapsed: Seconds spent in the stage
+        stats: Stage-specific counters
+    """
+    stage: str
+    label: str
+    elapsed: float
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class PipelineStage(ABC):
+    """Base class for export pipeline stages."""
+
+    name = "stage"
+
+    def __init__(self):
+        self.stats: Dict[str, Any] = {}  # Statistics of the last run
+
+    def prepare(self, layer: Any):
+        """Pick up per-layer settings before ``process`` runs on that layer's paths."""
+        pass
+
+    @abstractmethod
+    def process(self, paths: PathArray) -> PathArray:
+        """Transform the paths of one layer.
+
+        Args:
+            paths: Input paths; must not be modified in place
+
+        Returns:
+            The processed paths
+        """
+        pass
+
+
+class PlotPipeline:
+    """Runs a sequence of stages over each layer's paths."""
+
+    def __init__(self, stages: Optional[Iterable[PipelineStage]] = None):
+        self.stages: List[PipelineStage] = list(stages or [])
+        self.reports: List[StageReport] = []
+
+    def add_stage(self, stage: PipelineStage) -> 'PlotPipeline':
+        """Append a stage. Returns self for chaining."""
+        self.stages.append(stage)
+        return self
+
+    def run(self, paths: PathArray, label: str = "", layer: Any = None) -> PathArray:
+        """Run all stages on ``paths``, recording a report per stage.
+
+        ``layer`` is handed to each stage's ``prepare`` for per-layer settings.
+        """
+        for stage in self.stages:
+            stage.prepare(layer)
+            start = time.perf_counter()
+            paths = stage.process(paths)
+            self.reports.append(StageReport(stage.name, label, time.perf_counter() - start, dict(stage.stats)))
+        return paths
+
+    def run_collection(self, geometry: GeometryCollection, label: str = "", layer: Any = None) -> PathArray:
+        """Flatten a collection into one PathArray and run all stages on it."""
+        return self.run(geometry.to_path_array(), label, layer)
+
+    def summary(self) -> str:
+        """Return a human-readable summary of all recorded reports."""
+        lines = []
+        for report in self.reports:
+            stats = ", ".join(f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={v}"
+                              for k, v in report.stats.items())
+            lines.append(f"[{report.label}] {report.stage}: {stats} ({report.elapsed * 1000:.1f} ms)")
+        return "\n".join(lines)
+
+    def __bool__(self) -> bool:
+        return bool(self.stages)
@@ -0,0 +1,74 @@
+"""
+Segment-level helpers shared by plotter export stages.
+
+Stages that cut paths (deduplication, clipping) explode paths into
+segments, decide per segment what survives, and then rejoin the surviving
+segments into polylines wherever they still connect.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from ..geometry.primitives import PathArray
+
+
+def path_segments(paths: PathArray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split paths into segments, including the closing segment of closed paths.
+
+    Segments are returned in path order.
+
+    Returns:
+        (start, end, path) arrays: segment endpoints and the owning path index
+    """
+    lengths = paths.lengths
+    n_segments = np.where(paths.closed & (lengths > 2), lengths, np.maximum(lengths - 1, 0))
+    path = np.repeat(np.arange(len(paths)), n_segments)
+    seg_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(n_segments, out=seg_offsets[1:])
+    local = np.arange(len(path)) - seg_offsets[path]
+    start = paths.offsets[path] + local
+    # The closing segment wraps back to the path's first vertex
+    end = np.where(local + 1 < lengths[path], start + 1, paths.offsets[path])
+    return paths.coords[start], paths.coords[end], path
+
+
+def polyline_length(paths: PathArray) -> float:
+    """Total drawn length, including closing segments."""
+    start, end, _ = path_segments(paths)
+    return float(np.linalg.norm(end - start, axis=1).sum())
+
+
+def join_segments(start: np.ndarray, end: np.ndarray, owner: np.ndarray, keep: np.ndarray,
+                  start_cut: np.ndarray, end_cut: np.ndarray, style: dict = None) -> PathArray:
+    """Rejoin surviving segments into open polylines.
+
+    A new polyline begins at every kept segment that does not continue the
+    previous segment: the previous one was dropped, belongs to another path,
+    had its end cut, or this one had its start cut.
+
+    Args:
+        start: (S, D) segment start points (already moved where cut)
+        end: (S, D) segment end points (already moved where cut)
+        owner: Path index of each segment; segments must be in path order
+        keep: Segments that survive
+        start_cut: Segments whose start point was moved
+        end_cut: Segments whose end point was moved
+        style: Style of the returned PathArray
+    """
+    kept = np.flatnonzero(keep)
+    previous = kept - 1
+    has_previous = previous >= 0
+    continues = np.zeros(len(kept), dtype=bool)
+    p = previous[has_previous]
+    continues[has_previous] = keep[p] & ~end_cut[p] & (owner[p] == owner[kept[has_previous]])
+    breaks = ~continues | start_cut[kept]
+
+    # Each kept segment contributes its end point, preceded by its start point at a break
+    n_out = len(kept) + int(breaks.sum())
+    coords = np.empty((n_out, start.shape[1]))
+    end_slot = np.cumsum(1 + breaks) - 1
+    coords[end_slot] = end[kept]
+    coords[end_slot[breaks] - 1] = start[kept[breaks]]
+    offsets = np.append(end_slot[breaks] - 1, n_out).astype(np.int64)
+    return PathArray(coords, offsets, False, style)
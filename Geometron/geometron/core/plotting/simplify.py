@@ -0,0 +1,180 @@
+"""
+Polyline simplification for the canvas preview and plotter export.
+
+Both methods work on whole PathArray buffers at once rather than on
+per-point objects:
+
+- Douglas-Peucker splits every path range of every path in one batched
+  step per recursion level, using an explicit range stack.
+- Visvalingam-Whyatt removes, in each round, every vertex whose triangle
+  area is below the threshold and smaller than that of its neighbours, so
+  whole runs of nearly collinear vertices collapse in a few rounds.
+
+Tolerances are distances in the units of the coordinates: screen-space
+for the canvas, plotter resolution for export. Only x and y are considered.
+"""
+
+from typing import Callable
+
+import numpy as np
+
+from ..geometry.primitives import PathArray
+from .pipeline import PipelineStage
+
+DOUGLAS_PEUCKER = "douglas-peucker"
+VISVALINGAM = "visvalingam"
+
+
+def _segment_distance_sq(px, py, ax, ay, bx, by) -> np.ndarray:
+    """Squared distance from points ``p`` to segments ``a``-``b``, on x/y columns."""
+    abx, aby = bx - ax, by - ay
+    apx, apy = px - ax, py - ay
+    denom = abx * abx + aby * aby
+    t = np.clip((apx * abx + apy * aby) / np.where(denom > 0, denom, 1.0), 0.0, 1.0)
+    dx, dy = apx - t * abx, apy - t * aby
+    return dx * dx + dy * dy
+
+
+def _path_ends(offsets: np.ndarray):
+    """First and last vertex index of every non-empty path."""
+    starts, ends = offsets[:-1], offsets[1:] - 1
+    nonempty = ends >= starts
+    return starts[nonempty], ends[nonempty]
+
+
+def douglas_peucker_mask(coords: np.ndarray, offsets: np.ndarray, tolerance: float) -> np.ndarray:
+    """Return a keep-mask over ``coords`` for Douglas-Peucker simplification.
+
+    All pending ranges, across all paths, are processed together: each pass
+    finds the farthest interior vertex of every range and splits the ranges
+    where it lies beyond ``tolerance``.
+    """
+    keep = np.zeros(len(coords), dtype=bool)
+    x, y = np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1])
+    lo, hi = _path_ends(offsets)
+    keep[lo] = True
+    keep[hi] = True
+    tolerance_sq = tolerance * tolerance
+    while len(lo):
+        span = hi - lo - 1
+        pending = span > 0
+        lo, hi, span = lo[pending], hi[pending], span[pending]
+        if not len(lo):
+            break
+        first = np.zeros(len(lo), dtype=np.int64)
+        np.cumsum(span[:-1], out=first[1:])
+        index = np.repeat(lo + 1 - first, span) + np.arange(int(span.sum()))
+        distance = _segment_distance_sq(x[index], y[index],
+                                        np.repeat(x[lo], span), np.repeat(y[lo], span),
+                                        np.repeat(x[hi], span), np.repeat(y[hi], span))
+        farthest = np.maximum.reduceat(distance, first)
+        over = farthest > tolerance_sq
+        if not over.any():
+            break
+        # Position of the (first) farthest vertex in each range that must split
+        at_max = np.flatnonzero(distance == np.repeat(farthest, span))
+        range_id = np.searchsorted(first, at_max, side="right") - 1
+        first_hit = np.r_[True, range_id[1:] != range_id[:-1]]
+        split = np.empty(len(lo), dtype=np.int64)
+        split[range_id[first_hit]] = index[at_max[first_hit]]
+
+        lo, hi, split = lo[over], hi[over], split[over]
+        keep[split] = True
+        lo, hi = np.concatenate([lo, split]), np.concatenate([split, hi])
+    return keep
+
+
+def visvalingam_mask(coords: np.ndarray, offsets: np.ndarray, tolerance: float) -> np.ndarray:
+    """Return a keep-mask over ``coords`` for batched Visvalingam-Whyatt simplification.
+
+    Vertices whose triangle with their current neighbours has an area below
+    ``tolerance ** 2`` are removed. Each round removes every such vertex that
+    beats both neighbours on (area, pseudo-random rank), so no two adjacent
+    vertices go at once and runs of equal areas still shrink geometrically.
+    """
+    n = len(coords)
+    threshold = tolerance * tolerance
+    xy = coords[:, :2]
+    keep = np.ones(n, dtype=bool)
+    previous = np.arange(n) - 1
+    following = np.arange(n) + 1
+    interior = np.ones(n, dtype=bool)
+    starts, ends = _path_ends(offsets)
+    interior[starts] = False
+    interior[ends] = False
+    rank = (np.arange(n, dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    priority = np.full(n, np.inf)
+    mark = np.zeros(n, dtype=bool)
+
+    active = np.flatnonzero(interior)
+    while len(active):
+        p, q = previous[active], following[active]
+        u, v = xy[active] - xy[p], xy[q] - xy[p]
+        area = 0.5 * np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0])
+        candidate = area < threshold
+        active, area, p, q = active[candidate], area[candidate], p[candidate], q[candidate]
+        if not len(active):
+            break
+        priority[active] = area
+
+        # A candidate goes if it beats both neighbours; non-candidates have infinite priority
+        beats_left = (area < priority[p]) | ((area == priority[p]) & (rank[active] < rank[p]))
+        beats_right = (area < priority[q]) | ((area == priority[q]) & (rank[active] < rank[q]))
+        removed = active[beats_left & beats_right]
+        keep[removed] = False
+        interior[removed] = False
+        left, right = previous[removed], following[removed]
+        following[left] = right
+        previous[right] = left
+
+        # Only survivors and the neighbours of removed vertices can change
+        priority[active] = np.inf
+        mark[active] = True
+        mark[left] = True
+        mark[right] = True
+        mark &= interior
+        active = np.flatnonzero(mark)
+        mark[active] = False
+    return keep
+
+
+def simplify_paths(paths: PathArray, tolerance: float, method: str = DOUGLAS_PEUCKER) -> PathArray:
+    """Return a simplified copy of ``paths``; ``tolerance <= 0`` returns ``paths`` itself.
+
+    Closed paths are simplified as rings and stay closed.
+    """
+    if tolerance <= 0 or not len(paths):
+        return paths
+    mask_fn: Callable = {DOUGLAS_PEUCKER: douglas_peucker_mask, VISVALINGAM: visvalingam_mask}[method]
+    opened = paths.to_open()  # Closing vertex made explicit so rings simplify correctly
+    keep = mask_fn(opened.coords, opened.offsets, tolerance)
+    closed = paths.closed & (paths.lengths > 0)
+    keep[opened.offsets[1:][closed] - 1] = False
+    kept = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    return PathArray(opened.coords[keep], kept[opened.offsets], paths.closed, dict(paths.style))
+
+
+class Simplifier(PipelineStage):
+    """Removes vertices that deviate less than a tolerance from the simplified path.
+
+    The tolerance is the larger of the stage's own and the layer's
+    ``simplify_tolerance``.
+    """
+
+    name = "simplify"
+
+    def __init__(self, tolerance: float = 0.0, method: str = DOUGLAS_PEUCKER):
+        super().__init__()
+        self.tolerance = tolerance
+        self.method = method
+        self._tolerance = tolerance
+
+    def prepare(self, layer):
+        self._tolerance = max(self.tolerance, getattr(layer, "simplify_tolerance", 0.0) or 0.0)
+
+    def process(self, paths: PathArray) -> PathArray:
+        result = simplify_paths(paths, self._tolerance, self.method)
+        self.stats = {"tolerance": self._tolerance, "vertices_before": paths.n_vertices,
+                      "vertices_after": result.n_vertices}
+        return result
@@ -0,0 +1,279 @@
+"""
+Background geometry generation for the Geometron application.
+
+Algorithms run in a worker pool so that slow layers never block the UI
+thread. Results are collected by polling from the thread that owns the
+layers (the Qt main thread in the application), which keeps this module
+free of any GUI dependency.
+"""
+
+import copy
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .algorithms.base import AlgorithmBase, LOD_FULL
+from .geometry.primitives import GeometryCollection
+
+
+def _run_algorithm(algorithm: AlgorithmBase, parameters: Dict[str, Any]):
+    """Worker entry point. Module level so it can be pickled for process pools."""
+    start = time.perf_counter()
+    geometry = algorithm.generate_geometry(parameters)
+    return geometry, time.perf_counter() - start
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of one background generation job.
+
+    Attributes:
+        layer_id: Layer the job was submitted for
+        generation: Per-layer sequence number of the job
+        key: Cache key of the parameter snapshot
+        parameters: Parameter snapshot the geometry was generated from
+        geometry: Generated geometry, or None on error
+        error: Exception raised by the algorithm, if any
+        elapsed: Seconds spent inside the algorithm
+        lod: Level of detail the job was generated at
+        partial: True for a streamed chunk; geometry then holds only that chunk
+    """
+    layer_id: Any
+    generation: int
+    key: Any
+    parameters: Dict[str, Any]
+    lod: str = LOD_FULL
+    geometry: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+    partial: bool = False
+
+
+@dataclass
+class _Job:
+    generation: int
+    key: Any
+    parameters: Dict[str, Any]
+    lod: str
+    future: Future = field(repr=False, default=None)
+
+
+class GenerationScheduler:
+    """Runs algorithms in a thread or process pool, one live job per layer.
+
+    Submitting a job for a layer supersedes any earlier job for the same
+    layer: queued jobs are cancelled and results of running ones are
+    dropped. Parameters are deep-copied on submission so later edits do
+    not leak into a running job.
+
+    Algorithms that support streaming are run chunk by chunk on thread
+    pools: each chunk is delivered as a partial result, and a superseded
+    job stops at the next chunk boundary. Process pools always run
+    ``generate_geometry`` in one piece.
+
+    Call ``poll()`` regularly from the owning thread to collect results.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = False):
+        if max_workers is None:
+            max_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.use_processes = use_processes
+        self._executor: Executor = (ProcessPoolExecutor if use_processes else ThreadPoolExecutor)(max_workers=max_workers)
+        # Side tasks run on the worker threads; a process pool would have to pickle their arguments
+        self._io_executor: Executor = ThreadPoolExecutor(max_workers=1) if use_processes else self._executor
+        self._jobs: Dict[Any, _Job] = {}
+        self._generations: Dict[Any, int] = {}
+        self._results: "queue.Queue[GenerationResult]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.cancelled = 0
+
+    def submit(self, layer_id: Any, algorithm: AlgorithmBase, parameters: Dict[str, Any], key: Any = None,
+               lod: str = LOD_FULL) -> int:
+        """Queue generation for a layer, superseding any pending job for it.
+
+        Returns:
+            The generation number assigned to this job
+        """
+        snapshot = copy.deepcopy(parameters)
+        with self._lock:
+            generation = self._generations.get(layer_id, 0) + 1
+            self._generations[layer_id] = generation
+            self._cancel_locked(layer_id)
+            job = _Job(generation, key, snapshot, lod)
+            self._jobs[layer_id] = job
+        if not self.use_processes and algorithm.supports_streaming():
+            job.future = self._executor.submit(self._run_streaming, layer_id, job, algorithm, snapshot)
+        else:
+            job.future = self._executor.submit(_run_algorithm, algorithm, snapshot)
+        job.future.add_done_callback(lambda future: self._on_done(layer_id, job, future))
+        return generation
+
+    def run_in_pool(self, fn, *args) -> Future:
+        """Run a side task off the owning thread, e.g. writing a result to the disk cache.
+
+        Side tasks are not cancelled on ``shutdown``.
+        """
+        return self._io_executor.submit(fn, *args)
+
+    def _run_streaming(self, layer_id: Any, job: _Job, algorithm: AlgorithmBase, parameters: Dict[str, Any]):
+        """Worker entry point for streaming algorithms (thread pools only)."""
+        start = time.perf_counter()
+        chunks = []
+        for chunk in algorithm.generate_chunks(parameters):
+            with self._lock:
+                if self._jobs.get(layer_id) is not job:
+                    return None, time.perf_counter() - start  # Superseded; stop early
+            chunks.append(chunk)
+            self._results.put(GenerationResult(layer_id, job.generation, job.key, job.parameters, job.lod,
+                                               chunk, partial=True))
+        return GeometryCollection.merge(chunks), time.perf_counter() - start
+
+    def _on_done(self, layer_id: Any, job: _Job, future: Future):
+        """Runs in a worker/callback thread; only queues the result."""
+        if future.cancelled():
+            return
+        with self._lock:
+            if self._jobs.get(layer_id) is not job:
+                return  # Superseded while running
+            del self._jobs[layer_id]
+        result = GenerationResult(layer_id, job.generation, job.key, job.parameters, job.lod)
+        try:
+            result.geometry, result.elapsed = future.result()
+        except Exception as e:
+            result.error = e
+        self._results.put(result)
+
+    def _cancel_locked(self, layer_id: Any):
+        job = self._jobs.pop(layer_id, None)
+        if job is not None:
+            if job.future is not None:
+                job.future.cancel()
+            self.cancelled += 1
+
+    def cancel(self, layer_id: Any):
+        """Cancel any pending job for a layer."""
+        with self._lock:
+            self._cancel_locked(layer_id)
+
+    def is_pending(self, layer_id: Any) -> bool:
+        """Return True if a job for the layer is queued or running."""
+        with self._lock:
+            return layer_id in self._jobs
+
+    def poll(self) -> List[GenerationResult]:
+        """Return all results that finished since the last poll.
+
+        Results from jobs that were superseded after finishing are dropped.
+        """
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._generations.get(result.layer_id) == result.generation:
+                results.append(result)
+        return results
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until no jobs are pending. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                futures = [job.future for job in self._jobs.values() if job.future is not None]
+            if not futures:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                futures[0].result(timeout=remaining)
+            except Exception:
+                pass
+            time.sleep(0)  # Let done-callbacks run
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker pool, cancelling queued jobs; side tasks still finish."""
+        with self._lock:
+            for layer_id in list(self._jobs):
+                self._cancel_locked(layer_id)
+        self._executor.shutdown(wait=wait)
+        if self._io_executor is not self._executor:
+            self._io_executor.shutdown(wait=wait)
+
+
+class UpdateCoalescer:
+    """Merges bursts of changes per layer into a single regeneration.
+
+    Every change restarts a short quiet period. A layer becomes due once it
+    has been quiet for ``latency`` seconds, or once ``max_latency`` seconds
+    have passed since the first change of the burst, so a long drag still
+    refreshes regularly. The regeneration always uses the layer's latest
+    parameters.
+
+    Attributes:
+        latency: Quiet period in seconds before a burst is flushed
+        max_latency: Upper bound in seconds between first change and flush
+        changes: Total number of changes noted
+        flushes: Total number of regenerations requested
+    """
+
+    def __init__(self, latency: float = 0.05, max_latency: float = 0.25):
+        self.latency = latency
+        self.max_latency = max_latency
+        self._bursts: Dict[Any, List] = {}  # layer_id -> [first_time, last_time, count]
+        self.changes = 0
+        self.flushes = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of changes that were merged into another change's regeneration."""
+        return self.changes - self.flushes - sum(burst[2] for burst in self._bursts.values())
+
+    def note_change(self, layer_id: Any, now: Optional[float] = None):
+        """Record a change for a layer."""
+        now = time.monotonic() if now is None else now
+        burst = self._bursts.get(layer_id)
+        if burst is None:
+            self._bursts[layer_id] = [now, now, 1]
+        else:
+            burst[1] = now
+            burst[2] += 1
+        self.changes += 1
+
+    def discard(self, layer_id: Any):
+        """Forget pending changes for a layer (e.g. it was removed)."""
+        burst = self._bursts.pop(layer_id, None)
+        if burst is not None:
+            self.changes -= burst[2]
+
+    def resolve(self, layer_id: Any):
+        """Close a layer's burst early because its latest value needs no regeneration."""
+        if self._bursts.pop(layer_id, None) is not None:
+            self.flushes += 1
+
+    def is_pending(self, layer_id: Any) -> bool:
+        return layer_id in self._bursts
+
+    def due(self, now: Optional[float] = None) -> List[Any]:
+        """Return layers whose burst should be flushed now, and forget them."""
+        now = time.monotonic() if now is None else now
+        ready = [layer_id for layer_id, (first, last, _) in self._bursts.items()
+                 if now - last >= self.latency or now - first >= self.max_latency]
+        for layer_id in ready:
+            del self._bursts[layer_id]
+        self.flushes += len(ready)
+        return ready
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters for tuning the latency target."""
+        return {
+            "changes": self.changes,
+            "flushes": self.flushes,
+            "coalesced": self.coalesced,
+            "pending": len(self._bursts)
+        }
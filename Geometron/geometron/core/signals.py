@@ -0,0 +1,70 @@
+"""
+Minimal signal/slot implementation for core classes.
+
+Mirrors the ``connect``/``disconnect``/``emit`` API of ``pyqtSignal`` so that
+UI code can subscribe to core objects unchanged, while the core stays
+importable without PyQt6 (e.g. for headless rendering). Signals are emitted
+synchronously on the calling thread; core objects only emit from the thread
+that owns them.
+"""
+
+import weakref
+from typing import Any, Callable, List
+
+
+class BoundSignal:
+    """A signal bound to one instance."""
+
+    def __init__(self):
+        self._slots: List[Any] = []
+
+    @staticmethod
+    def _ref(slot: Callable):
+        # Bound methods are held weakly so subscribers can be garbage collected
+        if hasattr(slot, "__self__") and hasattr(slot, "__func__"):
+            return weakref.WeakMethod(slot)
+        return lambda: slot
+
+    def connect(self, slot: Callable):
+        """Call ``slot`` whenever the signal is emitted."""
+        self._slots.append(self._ref(slot))
+
+    def disconnect(self, slot: Callable = None):
+        """Disconnect ``slot``, or all slots if none is given."""
+        if slot is None:
+            self._slots.clear()
+            return
+        self._slots = [ref for ref in self._slots if ref() != slot]
+
+    def emit(self, *args):
+        """Call all connected slots with ``args``."""
+        for ref in list(self._slots):
+            slot = ref()
+            if slot is None:
+                self._slots.remove(ref)
+            else:
+                slot(*args)
+
+
+class Signal:
+    """Class-level signal declaration, analogous to ``pyqtSignal``.
+
+    Example:
+        class LayerManager:
+            layers_changed = Signal()
+    """
+
+    def __init__(self, *types):
+        self.types = types  # Documentation only; arguments are not checked
+        self._name = None
+
+    def __set_name__(self, owner, name):
+        self._name = f"_signal_{name}"
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self._name)
+        if bound is None:
+            bound = instance.__dict__[self._name] = BoundSignal()
+        return bound
@@ -0,0 +1,255 @@
+"""Headless command-line renderer.
+
+Renders a project JSON file (the ``LayerManager.as_dict`` format) to SVG,
+G-code or HPGL without importing PyQt6, pyqtgraph or vispy, so it runs on
+machines without a display.
+
+Usage:
+    geometron-render project.json -o output.svg
+    geometron-render project.json -o output.svgz
+    geometron-render project.json -o output.gcode --feed 2400 --step 0.01
+    geometron-render project.json -o output.hpgl --scale 40
+    geometron-render project.json -o output.svg --pens files --optimize [--jobs N]
+    geometron-render project.json --sweep sweep.json -o out_dir/ [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from geometron.core.io.project import read_project, load_project, canvas_size
+from geometron.core.io.svg import export_svg, export_pen_svg, open_svg
+from geometron.core.io.plotter import GcodeWriter, HpglWriter, export_plot, export_pen_plot, format_for_path
+from geometron.core.batch import expand_spec, run_batch
+from geometron.core.plotting.pipeline import PlotPipeline
+from geometron.core.plotting.clip import RectClipper
+from geometron.core.plotting.dedupe import SegmentDeduplicator
+from geometron.core.plotting.estimate import MotionProfile, PlotEstimate, PlotEstimator
+from geometron.core.plotting.merge import PathMerger
+from geometron.core.plotting.optimize import TravelOptimizer
+from geometron.core.plotting.pens import separate_pens, optimize_pens, pen_file_path, split_pipeline
+from geometron.core.plotting.simplify import Simplifier, DOUGLAS_PEUCKER, VISVALINGAM
+
+
+def parse_rect(text: str):
+    """Parse ``"xmin,ymin,xmax,ymax"`` into a tuple of floats."""
+    try:
+        xmin, ymin, xmax, ymax = (float(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid rectangle: {text!r} (expected XMIN,YMIN,XMAX,YMAX)")
+    return min(xmin, xmax), min(ymin, ymax), max(xmin, xmax), max(ymin, ymax)
+
+
+def positive_float(text: str) -> float:
+    """Parse a tolerance that must be greater than zero."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number: {text!r}")
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"Must be greater than 0: {text!r}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="geometron-render",
+                                     description="Render a Geometron project to SVG without the GUI.")
+    parser.add_argument("project", help="Project JSON file")
+    parser.add_argument("-o", "--output",
+                        help="Output file (.svg, .svgz, .gcode, .hpgl, ...), or directory with --sweep "
+                             "(default: derived from project name)")
+    parser.add_argument("--format", choices=["svg", "gcode", "hpgl"],
+                        help="Output format (default: from the output file extension, else svg)")
+    parser.add_argument("--width", type=float, help="Canvas width (default: from project, else 800)")
+    parser.add_argument("--height", type=float, help="Canvas height (default: from project, else 600)")
+    parser.add_argument("--precision", type=int, default=3, help="Decimal places for coordinates")
+    parser.add_argument("--svgz", action="store_true",
+                        help="Write gzip-compressed SVG (implied by an .svgz output file)")
+    parser.add_argument("--sweep", help="Parameter sweep spec (JSON); renders one SVG per variant")
+    parser.add_argument("-j", "--jobs", type=int, help="Worker processes for --sweep or --pens (default: CPU count)")
+    parser.add_argument("--pens", choices=["groups", "files"],
+                        help="Separate output by pen (color + weight) and optimize pens in parallel: "
+                             "one group/pen change per pen, or one file per pen")
+
+    plotting = parser.add_argument_group("plotter optimization")
+    plotting.add_argument("--clip", action="store_true", help="Clip paths to the canvas rectangle")
+    plotting.add_argument("--clip-rect", type=parse_rect, metavar="XMIN,YMIN,XMAX,YMAX",
+                          help="Clip paths to this rectangle instead of the canvas "
+                               "(SVG: y down from the top; G-code/HPGL: y up from the bottom)")
+    plotting.add_argument("--simplify", type=float, metavar="TOL",
+                          help="Simplify paths to TOL (layers' own simplify tolerance applies regardless)")
+    plotting.add_argument("--simplify-method", choices=[DOUGLAS_PEUCKER, VISVALINGAM], default=DOUGLAS_PEUCKER)
+    plotting.add_argument("--dedupe", type=positive_float, metavar="TOL",
+                          help="Remove segments drawn more than once (within TOL)")
+    plotting.add_argument("--merge", type=positive_float, metavar="TOL",
+                          help="Join paths whose endpoints lie within TOL")
+    plotting.add_argument("--optimize", action="store_true", help="Reorder/reverse paths to minimize pen-up travel")
+    plotting.add_argument("--two-opt-time", type=float, default=1.0,
+                          help="Seconds per layer for 2-opt refinement (0 disables)")
+
+    estimate = parser.add_argument_group("plot time estimate (canvas units and seconds)")
+    estimate.add_argument("--estimate", action="store_true",
+                          help="Report pen-down length, travel, pen lifts and plot time per layer")
+    estimate.add_argument("--draw-speed", type=float,
+                          help="Pen-down speed per second (default: --feed / 60 for G-code, else 50)")
+    estimate.add_argument("--travel-speed", type=float,
+                          help="Pen-up speed per second (default: --travel-feed / 60 for G-code, else 150)")
+    estimate.add_argument("--accel", type=float, default=1000.0, help="Acceleration (0: constant speed)")
+    estimate.add_argument("--junction-deviation", type=float, default=0.05, help="Cornering junction deviation")
+    estimate.add_argument("--lift-time", type=float, default=0.25, help="Seconds per pen-down/pen-up cycle")
+
+    machine = parser.add_argument_group("G-code / HPGL output")
+    machine.add_argument("--scale", type=float,
+                         help="Machine units per canvas unit (default: 1 for G-code mm, 40 for HPGL units)")
+    machine.add_argument("--step", type=float,
+                         help="Machine step to snap coordinates to (default: 0.01 mm for G-code, 1 for HPGL)")
+    machine.add_argument("--feed", type=float, default=3000.0, help="G-code drawing feed rate (mm/min)")
+    machine.add_argument("--travel-feed", type=float, help="G-code pen-up feed rate (default: rapid G0 moves)")
+    machine.add_argument("--pen-up", default="G0 Z5", help="G-code command lifting the pen")
+    machine.add_argument("--pen-down", default="G1 Z0 F1000", help="G-code command lowering the pen")
+    machine.add_argument("--velocity", type=float, help="HPGL pen velocity (cm/s)")
+    return parser
+
+
+def build_writer(fmt, fh, args):
+    """Create the G-code or HPGL backend selected on the command line."""
+    options = {name: value for name, value in (("scale", args.scale), ("step", args.step)) if value is not None}
+    if fmt == "gcode":
+        return GcodeWriter(fh, feed_rate=args.feed, travel_rate=args.travel_feed,
+                           pen_up=args.pen_up, pen_down=args.pen_down, **options)
+    return HpglWriter(fh, velocity=args.velocity, **options)
+
+
+def output_format(args) -> str:
+    """The output format: --format, else from the output file extension, else svg.
+    
+    With --sweep the output is a directory, so its name never selects a format.
+    """
+    return args.format or (args.output and not args.sweep and format_for_path(args.output)) or "svg"
+
+
+def build_profile(args) -> MotionProfile:
+    """Motion profile for --estimate; G-code feed rates are the default speeds."""
+    profile = MotionProfile(acceleration=args.accel, junction_deviation=args.junction_deviation,
+                            pen_lift_time=args.lift_time)
+    gcode = output_format(args) == "gcode"
+    mm_per_unit = args.scale or 1.0  # Feed rates are in mm/min, the estimate in canvas units
+    if args.draw_speed is not None or gcode:
+        profile.draw_speed = args.draw_speed or args.feed / 60 / mm_per_unit
+    if args.travel_speed is not None or (gcode and args.travel_feed):
+        profile.travel_speed = args.travel_speed or args.travel_feed / 60 / mm_per_unit
+    return profile
+
+
+def print_estimate(pipeline: PlotPipeline):
+    """Print the total of the estimate stage's per-layer reports."""
+    estimates = [PlotEstimate(**report.stats) for report in pipeline.reports if report.stage == PlotEstimator.name]
+    if estimates:
+        print(f"Estimated plot time: {sum(estimates, PlotEstimate()).describe()}")
+
+
+def build_pipeline(args, data, width, height) -> PlotPipeline:
+    """Create the export pipeline selected on the command line."""
+    pipeline = PlotPipeline()
+    if args.clip_rect:
+        pipeline.add_stage(RectClipper(args.clip_rect))
+    elif args.clip:
+        pipeline.add_stage(RectClipper((0.0, 0.0, width, height)))
+    if args.simplify is not None or any(layer.get("simplify_tolerance") for layer in data.get("layers", [])):
+        pipeline.add_stage(Simplifier(args.simplify or 0.0, args.simplify_method))
+    if args.dedupe is not None:
+        pipeline.add_stage(SegmentDeduplicator(args.dedupe))
+    if args.merge is not None:
+        pipeline.add_stage(PathMerger(args.merge))
+    if args.optimize:
+        pipeline.add_stage(TravelOptimizer(two_opt=args.two_opt_time > 0, time_budget=args.two_opt_time))
+    if args.estimate:
+        pipeline.add_stage(PlotEstimator(build_profile(args)))  # Last, to see the final path order
+    return pipeline
+
+
+def run_sweep(args, data, width, height):
+    """Render every variant of a sweep spec into an output directory."""
+    with open(args.sweep, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    output_dir = args.output or os.path.splitext(args.project)[0] + "_sweep"
+    variants = expand_spec(spec)
+    prefix = os.path.splitext(os.path.basename(args.project))[0]
+    manifest = run_batch(data, variants, output_dir, width, height, args.precision, args.jobs, prefix,
+                         build_pipeline(args, data, width, height), args.svgz)
+    print(f"Rendered {manifest['count'] - manifest['failed']}/{manifest['count']} variants to {output_dir} "
+          f"in {manifest['wall_s']:.2f} s with {manifest['workers']} workers "
+          f"({manifest['variants_per_s']} variants/s)")
+    return 1 if manifest["failed"] else 0
+
+
+def write_pens(fmt, path, buckets, args, width, height) -> int:
+    """Write pen buckets to one output file."""
+    if fmt == "svg":
+        with open_svg(path, args.svgz or None) as fh:
+            return export_pen_svg(buckets, fh, width, height, args.precision)
+    with open(path, "w", encoding="ascii", newline="\n") as fh:
+        return export_pen_plot(buckets, build_writer(fmt, fh, args), width, height)
+
+
+def export_pens(args, fmt, layers, output, width, height, pipeline) -> int:
+    """Bucket visible geometry by pen, optimize the buckets in parallel and write them."""
+    layer_pipeline, pen_pipeline = split_pipeline(pipeline)
+    buckets = separate_pens(layers, height if fmt == "svg" else None, layer_pipeline)
+    buckets, elapsed = optimize_pens(buckets, pen_pipeline, args.jobs)
+    pipeline.reports.extend(layer_pipeline.reports + pen_pipeline.reports)
+    if pipeline:
+        print(f"Processed {len(buckets)} pens in {elapsed:.2f} s")
+    if args.pens == "groups":
+        return write_pens(fmt, output, buckets, args, width, height)
+    count = 0
+    for bucket in buckets:
+        path = pen_file_path(output, bucket)
+        count += write_pens(fmt, path, [bucket], args, width, height)
+        print(f"{bucket.label}: {path} ({', '.join(bucket.layers)})")
+    return count
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.sweep and args.pens:
+        parser.error("--pens cannot be combined with --sweep")
+
+    data = read_project(args.project)
+    width, height = canvas_size(data)
+    width = args.width or width
+    height = args.height or height
+    if args.sweep:
+        return run_sweep(args, data, width, height)
+
+    fmt = output_format(args)
+    extension = {"gcode": ".gcode", "hpgl": ".hpgl"}.get(fmt, ".svgz" if args.svgz else ".svg")
+    output = args.output or os.path.splitext(args.project)[0] + extension
+    layer_manager = load_project(data)
+    pipeline = build_pipeline(args, data, width, height)
+    start = time.perf_counter()
+    try:
+        if args.pens:
+            count = export_pens(args, fmt, layer_manager.layers, output, width, height, pipeline)
+        elif fmt == "svg":
+            with open_svg(output, args.svgz or None) as fh:
+                count = export_svg(layer_manager.layers, fh, width, height, args.precision, pipeline)
+        else:
+            with open(output, "w", encoding="ascii", newline="\n") as fh:
+                count = export_plot(layer_manager.layers, build_writer(fmt, fh, args),
+                                    width, height, pipeline)
+    finally:
+        layer_manager.scheduler.shutdown()
+    if pipeline.reports:
+        print(pipeline.summary())
+        print_estimate(pipeline)
+    print(f"Wrote {count} paths to {output} in {time.perf_counter() - start:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,9 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QPushButton
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QPushButton, QCheckBox
 from PyQt6.QtCore import Qt, pyqtSignal, QRectF
 import pyqtgraph as pg
 import numpy as np
+from ...core.plotting.simplify import simplify_paths
+from ...core.plotting.clip import clip_paths
 
 class CanvasWidget(QWidget):
     """Custom canvas widget for 2D and 3D rendering."""
@@ -15,6 +17,10 @@ class CanvasWidget(QWidget):
         
         self.h_grid_lines = []
         self.v_grid_lines = []
+        self._layer_items = {}  # Layer id -> PlotCurveItem
+        self._layer_sources = {}  # Layer id -> (full-resolution PathArray, style, min tolerance)
+        self.simplify_pixels = 0.5  # Preview simplification tolerance in screen pixels
+        self._drawn_pixel_size = None  # Pixel size the layers were last simplified for
         
         # Create layout
         self.layout = QVBoxLayout()
@@ -87,6 +93,11 @@ class CanvasWidget(QWidget):
         self.snap_button.setToolTip("Snap view to canvas size")
         self.snap_button.clicked.connect(self.snap_view_to_canvas)
 
+        # Clip to canvas toggle
+        self.clip_checkbox = QCheckBox("Clip")
+        self.clip_checkbox.setToolTip("Hide geometry outside the canvas rectangle")
+        self.clip_checkbox.toggled.connect(self._redraw_layers)
+
         # Horizontal Grid Lines control
         h_grid_label = QLabel("H Grid:")
         self.h_grid_spin = QSpinBox()
@@ -107,6 +118,7 @@ class CanvasWidget(QWidget):
         control_layout.addWidget(height_label)
         control_layout.addWidget(self.height_spin)
         control_layout.addWidget(self.snap_button)
+        control_layout.addWidget(self.clip_checkbox)
         control_layout.addSpacing(20) # Add some space
         control_layout.addWidget(h_grid_label)
         control_layout.addWidget(self.h_grid_spin)
@@ -181,13 +193,34 @@ class CanvasWidget(QWidget):
         # Update grid
         self._update_grid()
         
+        if self.clip_checkbox.isChecked():
+            self._redraw_layers()
+        
         # Emit signal
         self.size_changed.emit(width, height)
     
     def _on_view_changed(self):
         """Handle view changes."""
+        # Re-simplify only on real zoom changes, not while panning
+        pixel_size = self._pixel_size()
+        if self._drawn_pixel_size and pixel_size and not (
+                0.67 < pixel_size / self._drawn_pixel_size < 1.5):
+            self._redraw_layers()
         self.view_changed.emit()
     
+    def _redraw_layers(self):
+        """Redraw all layers from their sources, e.g. after zoom or clipping changes."""
+        for layer_id in list(self._layer_sources):
+            self._draw_layer(layer_id)
+    
+    def _pixel_size(self):
+        """Size of one screen pixel in canvas units, or 0 if the view has no size yet."""
+        try:
+            size = self.view_box.viewPixelSize()
+        except Exception:
+            return 0.0
+        return float(min(size)) if size and min(size) > 0 else 0.0
+    
     def add_item(self, item):
         """Add a graphics item to the canvas."""
         self.view_box.addItem(item)
@@ -199,8 +232,55 @@ class CanvasWidget(QWidget):
     def clear(self):
         """Clear all items from the canvas."""
         self.view_box.clear()
+        self._layer_items.clear()
+        self._layer_sources.clear()
         self._create_canvas_outline()  # Re-add canvas outline
     
+    def set_layer_geometry(self, layer_id, geometry, color=(0, 0, 0), weight=1.0, z=0, tolerance=0.0):
+        """Draw a layer's geometry, replacing whatever was drawn for it before.
+        
+        All paths of a layer go into a single PlotCurveItem, using a connect
+        array to break the polyline between paths. Paths are simplified to
+        ``simplify_pixels`` screen pixels, or to ``tolerance`` canvas units
+        (the layer's export tolerance) if that is coarser.
+        """
+        if geometry is None:
+            self.remove_layer_geometry(layer_id)
+            return
+        self._layer_sources[layer_id] = (geometry.to_path_array(), (color, weight, z), tolerance)
+        self._draw_layer(layer_id)
+    
+    def _draw_layer(self, layer_id):
+        """(Re)draw a layer from its full-resolution source at the current zoom."""
+        source, (color, weight, z), tolerance = self._layer_sources[layer_id]
+        pixel_size = self._pixel_size()
+        self._drawn_pixel_size = pixel_size or self._drawn_pixel_size
+        if self.clip_checkbox.isChecked():
+            source = clip_paths(source, (0, 0, self.width_spin.value(), self.height_spin.value()))
+        paths = simplify_paths(source, max(pixel_size * self.simplify_pixels, tolerance)).to_open()
+        connect = np.ones(paths.n_vertices, dtype=bool)
+        connect[paths.offsets[1:][paths.lengths > 0] - 1] = False
+        
+        item = self._layer_items.get(layer_id)
+        if item is None:
+            item = pg.PlotCurveItem()
+            self.view_box.addItem(item)
+            self._layer_items[layer_id] = item
+        item.setData(paths.coords[:, 0], paths.coords[:, 1], connect=connect,
+                     pen=pg.mkPen(color=color, width=weight))
+        item.setZValue(z)
+    
+    def remove_layer_geometry(self, layer_id):
+        """Remove a layer's geometry from the canvas."""
+        self._layer_sources.pop(layer_id, None)
+        item = self._layer_items.pop(layer_id, None)
+        if item is not None:
+            self.view_box.removeItem(item)
+    
+    def layer_ids(self):
+        """Ids of layers that currently have geometry on the canvas."""
+        return list(self._layer_items.keys())
+    
     def get_view_range(self):
         """Get current view range."""
         return self.view_box.viewRange()
@@ -37,6 +37,15 @@ class MainWindow(QMainWindow):
         # Connect canvas signals
         self.canvas.size_changed.connect(self._on_canvas_size_changed)
         
+        # Draw layer geometry on the canvas as it becomes available
+        self.layer_manager.layers_changed.connect(self._sync_canvas_layers)
+        self.layer_manager.layer_updated.connect(self._render_layer)
+        
+        # Flush coalesced edits and collect background results on the UI thread
+        self._generation_timer = QTimer(self)
+        self._generation_timer.timeout.connect(self.layer_manager.process_pending_updates)
+        self._generation_timer.start(16)
+        
         # Create and setup panels
         self._create_toolbar()
         self._create_layer_panel()
@@ -379,6 +388,38 @@ class MainWindow(QMainWindow):
         # This helps catch any Qt-created internal widgets that appear after initialization
         QTimer.singleShot(100, self._apply_delayed_styling)
     
+    def _render_layer(self, layer):
+        """Draw a layer's current geometry, queueing generation if it is stale."""
+        if layer not in self.layer_manager.layers or not layer.visible:
+            self.canvas.remove_layer_geometry(layer.id)
+            return
+        if layer.needs_update and not self.layer_manager.is_generating(layer):
+            self.layer_manager.request_geometry(layer)
+        self.canvas.set_layer_geometry(
+            layer.id,
+            layer.get_geometry(generate=False),
+            color=layer.line_color,
+            weight=layer.line_weight,
+            z=self.layer_manager.layers.index(layer),
+            tolerance=layer.simplify_tolerance
+        )
+    
+    def _sync_canvas_layers(self):
+        """Match canvas items to the layer stack after adds, removes and moves."""
+        current_ids = {layer.id for layer in self.layer_manager.layers}
+        for layer_id in self.canvas.layer_ids():
+            if layer_id not in current_ids:
+                self.canvas.remove_layer_geometry(layer_id)
+        for layer in self.layer_manager.layers:
+            self._render_layer(layer)
+    
+    def closeEvent(self, event):
+        """Stop background generation before the window closes."""
+        self._generation_timer.stop()
+        self.layer_manager.scheduler.shutdown()
+        self.properties_panel_widget.shutdown()
+        super().closeEvent(event)
+    
     def _on_canvas_size_changed(self, width, height):
         """Handle canvas size changes."""
         self._update_canvas_size_status(width, height)
@@ -26,7 +26,7 @@ class LayerPanel(QWidget):
         # Connect signals from LayerManager
         self.layer_manager.layers_changed.connect(self.refresh_layer_list)
         self.layer_manager.active_layer_changed.connect(self.update_selection)
-        self.layer_manager.layer_updated.connect(self.refresh_layer_list) # Refresh list if name/visibility changes
+        self.layer_manager.layer_updated.connect(self.on_layer_updated) # Refresh item if name/visibility changes
 
         # Initial population
         self.refresh_layer_list()
@@ -133,6 +133,20 @@ class LayerPanel(QWidget):
         print("--- Layer List Refresh Complete ---") # DEBUG
 
 
+    def on_layer_updated(self, layer: Layer):
+        """Refresh only the list item of the updated layer."""
+        for i in range(self.layer_list.count()):
+            item = self.layer_list.item(i)
+            if item and item.data(Qt.ItemDataRole.UserRole) == layer.id:
+                if item.text() != layer.name:
+                    item.setText(layer.name)
+                font = item.font()
+                if font.italic() != (not layer.visible):
+                    font.setItalic(not layer.visible)
+                    item.setFont(font)
+                return
+        self.refresh_layer_list() # Not listed yet
+
     def update_selection(self, active_layer: Layer | None):
         """Update the list selection based on the active layer."""
         if self._is_refreshing: return
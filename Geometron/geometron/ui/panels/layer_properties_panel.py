@@ -5,24 +5,46 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QColor, QPalette
 from functools import partial # For connecting signals with arguments
+from concurrent.futures import Future, ThreadPoolExecutor
 # Assuming LayerManager and Layer are in geometron.core.layer
 from ...core.layer import LayerManager, Layer 
+from ...core.plotting.estimate import MotionProfile, PlotEstimate, estimate_paths
+
+
+def _estimate_placed(geometry, matrix, profile: MotionProfile) -> PlotEstimate:
+    """Worker entry point: estimate algorithm output placed by the layer's transform matrix.
+    
+    Travel starts at the canvas origin, as with ``geometron-render --estimate``.
+    """
+    paths = geometry.to_path_array()
+    if matrix is not None:
+        paths = paths.transformed(matrix)
+    return estimate_paths(paths, profile)
+
 
 class LayerPropertiesPanel(QWidget):
     """UI Panel for editing general properties (Name, Transform, Style) of the active layer."""
 
+    estimate_ready = pyqtSignal(object, object) # Layer id, (source geometry, placement, PlotEstimate); queued from the worker
+
     def __init__(self, layer_manager: LayerManager, parent=None):
         super().__init__(parent)
         self.layer_manager = layer_manager
         
         self._current_layer: Layer | None = None
         self._is_updating_ui = False # Flag to prevent signal loops
+        self.motion_profile = MotionProfile()
+        self._estimates = {}  # Layer id -> (source geometry, placement, PlotEstimate)
+        self._estimating = {}  # Layer id -> (source geometry, placement, Future) of the running estimate
+        self._estimate_executor = ThreadPoolExecutor(max_workers=1) # Keeps estimates off the UI thread
+        self.estimate_ready.connect(self.on_estimate_ready)
 
         self.setup_ui()
         
         # Connect signals from LayerManager
         self.layer_manager.active_layer_changed.connect(self.set_current_layer)
         self.layer_manager.layer_updated.connect(self.on_layer_updated) # Update if current layer changes
+        self.layer_manager.layers_changed.connect(self.update_estimate_ui)
 
         # Initial population based on current active layer
         self.set_current_layer(self.layer_manager.get_active_layer())
@@ -132,8 +154,28 @@ class LayerPropertiesPanel(QWidget):
         self.line_weight.valueChanged.connect(self.on_style_changed)
         style_layout.addRow("Weight:", self.line_weight)
         
+        self.simplify_tolerance = QDoubleSpinBox()
+        self.simplify_tolerance.setRange(0.0, 100.0)
+        self.simplify_tolerance.setDecimals(3)
+        self.simplify_tolerance.setSingleStep(0.05)
+        self.simplify_tolerance.setSpecialValueText("Off")
+        self.simplify_tolerance.setToolTip("Drop vertices closer than this to the simplified path on export")
+        self.simplify_tolerance.valueChanged.connect(self.on_simplify_changed)
+        style_layout.addRow("Simplify:", self.simplify_tolerance)
+        
         main_layout.addWidget(style_group)
         
+        # --- Plot Estimate --- #
+        estimate_group = QGroupBox("Plot Estimate")
+        estimate_layout = QFormLayout(estimate_group)
+        self.layer_estimate_label = QLabel("-")
+        self.layer_estimate_label.setWordWrap(True)
+        estimate_layout.addRow("Layer:", self.layer_estimate_label)
+        self.total_estimate_label = QLabel("-")
+        self.total_estimate_label.setWordWrap(True)
+        estimate_layout.addRow("All visible:", self.total_estimate_label)
+        main_layout.addWidget(estimate_group)
+        
         main_layout.addStretch() # Push everything up
         self.setLayout(main_layout)
         
@@ -147,6 +189,8 @@ class LayerPropertiesPanel(QWidget):
         if self._current_layer and updated_layer.id == self._current_layer.id:
             # print(f"LayerPropertiesPanel: Updating UI for layer {self._current_layer.name}") # DEBUG
             self.update_ui_from_layer()
+        else:
+            self.update_estimate_ui() # Other layers still count towards the total
             
     def update_ui_from_layer(self):
         """Refresh all UI elements from the self._current_layer."""
@@ -169,6 +213,7 @@ class LayerPropertiesPanel(QWidget):
         self.rotation.setEnabled(is_editable)
         self.color_button.setEnabled(is_editable)
         self.line_weight.setEnabled(is_editable)
+        self.simplify_tolerance.setEnabled(is_editable)
         
         if self._current_layer:
             layer = self._current_layer
@@ -188,6 +233,7 @@ class LayerPropertiesPanel(QWidget):
             palette.setColor(QPalette.ColorRole.Window, QColor(*layer.line_color))
             self.color_swatch.setPalette(palette)
             self.line_weight.setValue(layer.line_weight)
+            self.simplify_tolerance.setValue(layer.simplify_tolerance)
             
         else:
             # Clear fields when no layer is selected
@@ -203,8 +249,75 @@ class LayerPropertiesPanel(QWidget):
             palette.setColor(QPalette.ColorRole.Window, QColor("lightgrey"))
             self.color_swatch.setPalette(palette)
             self.line_weight.setValue(1)
+            self.simplify_tolerance.setValue(0)
             
+        self.update_estimate_ui()
         self._is_updating_ui = False
+    
+    def _layer_estimate(self, layer: Layer) -> PlotEstimate | None:
+        """Last estimate of a layer's completed algorithm output, placed by its transform.
+        
+        Streamed partial output is never estimated. When the output or the
+        transform changed, a new estimate is started in the background and
+        the previous one is returned until it arrives.
+        """
+        source = layer.geometry_cache
+        if source is None:
+            return None
+        placement = (layer.position.x, layer.position.y, layer.scale.x, layer.scale.y, layer.rotation)
+        cached = self._estimates.get(layer.id)
+        if cached is not None and cached[0] is source and cached[1] == placement:
+            return cached[2]
+        pending = self._estimating.get(layer.id)
+        if pending is None or pending[0] is not source or pending[1] != placement:
+            if pending is not None:
+                pending[2].cancel() # Superseded before it started
+            matrix = None if placement == (0, 0, 1, 1, 0) else layer.get_transform_matrix()
+            future = self._estimate_executor.submit(_estimate_placed, source, matrix, self.motion_profile)
+            future.add_done_callback(partial(self._deliver_estimate, layer.id, source, placement))
+            self._estimating[layer.id] = (source, placement, future)
+        return cached[2] if cached is not None else None
+    
+    def _deliver_estimate(self, layer_id, source, placement, future: Future):
+        """Runs in the worker thread; the signal queues the result to the UI thread."""
+        if future.cancelled():
+            return
+        try:
+            estimate = future.result()
+        except Exception as e:
+            print(f"Error estimating layer {layer_id}: {e}")
+            return
+        self.estimate_ready.emit(layer_id, (source, placement, estimate))
+    
+    def on_estimate_ready(self, layer_id, entry):
+        """Install a finished estimate unless the layer changed meanwhile."""
+        pending = self._estimating.get(layer_id)
+        if pending is None or pending[0] is not entry[0] or pending[1] != entry[1]:
+            return
+        del self._estimating[layer_id]
+        self._estimates[layer_id] = entry
+        self.update_estimate_ui()
+    
+    def update_estimate_ui(self):
+        """Refresh the plot estimates of the current layer and of all visible layers."""
+        layers = self.layer_manager.layers
+        current_ids = {layer.id for layer in layers}
+        for layer_id in list(self._estimates):
+            if layer_id not in current_ids:
+                del self._estimates[layer_id]
+        for layer_id in list(self._estimating):
+            if layer_id not in current_ids:
+                self._estimating.pop(layer_id)[2].cancel()
+        
+        estimate = self._layer_estimate(self._current_layer) if self._current_layer else None
+        self.layer_estimate_label.setText(estimate.describe() if estimate else "-")
+        estimates = [self._layer_estimate(layer) for layer in layers if layer.visible]
+        estimates = [e for e in estimates if e is not None]
+        self.total_estimate_label.setText(sum(estimates, PlotEstimate()).describe() if estimates else "-")
+    
+    def shutdown(self):
+        """Stop the estimate worker, dropping queued estimates."""
+        self._estimate_executor.shutdown(wait=False, cancel_futures=True)
         
     # --- Signal Handlers for UI changes --- 
 
@@ -247,9 +360,8 @@ class LayerPropertiesPanel(QWidget):
         elif control_name == 'rotation' and layer.rotation != value: layer.rotation = value; changed = True
             
         if changed:
-            # We can notify the manager directly or add specific methods
-            # For now, let's just emit the generic update signal after changing the layer object
-            layer.needs_update = True # Geometry likely needs update
+            # Transforms don't invalidate the algorithm output; Layer.get_geometry
+            # re-places the cached geometry with the new matrix on demand.
             self.layer_manager.layer_updated.emit(layer) 
             print(f"DEBUG: Transform changed: {control_name} = {value}") # DEBUG
             
@@ -284,4 +396,12 @@ class LayerPropertiesPanel(QWidget):
             layer.line_weight = new_weight
             layer.needs_update = True # May affect rendering
             self.layer_manager.layer_updated.emit(layer)
-            print(f"DEBUG: Weight changed: {new_weight}") # DEBUG 
\ No newline at end of file
+            print(f"DEBUG: Weight changed: {new_weight}") # DEBUG
+
+    def on_simplify_changed(self, value: float):
+        if self._is_updating_ui or not self._current_layer: return
+        layer = self._current_layer
+        if layer.simplify_tolerance != value:
+            # Only affects drawing and export, not the algorithm output
+            layer.simplify_tolerance = value
+            self.layer_manager.layer_updated.emit(layer)
@@ -57,9 +57,36 @@ class ParameterPanel(QWidget):
         """Handle updates if the currently displayed layer changed, potentially parameter values."""
         if self._current_layer and updated_layer.id == self._current_layer.id:
             # print(f"ParameterPanel: Updating UI for layer {self._current_layer.name}") # DEBUG
-            # Re-populate UI in case parameters were changed externally (less efficient but safer)
-            # A more optimized way would be to only update specific widgets if needed.
-            self.update_parameter_ui()
+            # layer_updated fires for every intermediate value while a spin box is
+            # dragged, so only sync values unless the set of widgets must change.
+            param_names = [p.name for p in self._current_layer.algorithm.get_parameters()] \
+                if self._current_layer.algorithm else []
+            if self._current_layer.locked == (not self.isEnabled()) and param_names == list(self._param_widgets):
+                self.sync_parameter_values()
+            else:
+                self.update_parameter_ui()
+    
+    def sync_parameter_values(self):
+        """Update existing widgets from the layer's parameters without rebuilding them."""
+        self._is_updating_ui = True
+        params = self._current_layer.parameters
+        for param_name, widget in self._param_widgets.items():
+            value = params.get(param_name)
+            if value is None:
+                continue
+            if isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                if widget.value() != value:
+                    widget.setValue(value)
+            elif isinstance(widget, QCheckBox):
+                if widget.isChecked() != value:
+                    widget.setChecked(value)
+            elif isinstance(widget, QLineEdit):
+                if widget.text() != value:
+                    widget.setText(value)
+            elif isinstance(widget, QComboBox):
+                if widget.currentText() != str(value):
+                    widget.setCurrentText(str(value))
+        self._is_updating_ui = False
             
     def update_parameter_ui(self):
         """Clear and repopulate the algorithm parameter UI."""
@@ -19,6 +19,7 @@ setup(
     entry_points={
         'console_scripts': [
             'geometron=geometron.main:main',
+            'geometron-render=geometron.render:main',
         ],
     },
     python_requires=">=3.8",